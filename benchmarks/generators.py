@@ -0,0 +1,131 @@
+import json
+import random
+from typing import Optional
+
+_HEADER_SIZE = 512
+
+def write_junit_xml(path: str, cases: int, failure_ratio: float = 0.05, error_ratio: float = 0.01,
+                    skipped_ratio: float = 0.02, message_size: int = 200, suites: Optional[int] = None,
+                    depth: int = 2, seed: int = 42) -> str:
+    """
+    Ecrit un rapport JUnit XML synthetique et deterministe
+
+    Args:
+        path (str): Fichier de sortie
+        cases (int): Nombre total de testcases
+        failure_ratio, error_ratio, skipped_ratio (float): Proportions de chaque statut
+        message_size (int): Taille des messages d'echec (et du contenu <system-out>)
+        suites (int, optional): Nombre de <testsuite> de premier niveau (par defaut ~1000 cas par suite)
+        depth (int): Profondeur d'imbrication des <testsuite>
+        seed (int): Graine du generateur pseudo-aleatoire
+
+    Returns:
+        str: Chemin du fichier genere
+    """
+    rng = random.Random(seed)
+    suites = suites or max(1, cases // 1000)
+    per_suite = [cases // suites + (1 if i < cases % suites else 0) for i in range(suites)]
+    padding = "x" * max(0, message_size - 40)
+
+    counts = {"failures": 0, "errors": 0, "skipped": 0}
+    total_time = 0.0
+    index = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        header_offset = f.tell()
+        # Place reservee pour l'en-tete <testsuites>, reecrit une fois les compteurs connus
+        f.write(" " * _HEADER_SIZE + "\n")
+        for suite, size in enumerate(per_suite):
+            lines = ["".join(f'<testsuite name="suite{suite}.level{level}">' for level in range(depth))]
+            classname = f"pkg.module{suite % 97}.Class{suite}"
+            for _ in range(size):
+                duration = round(rng.expovariate(10), 3)
+                total_time += duration
+                draw = rng.random()
+                line = f'<testcase name="test_{index}" classname="{classname}" time="{duration}"'
+                if draw < failure_ratio:
+                    counts["failures"] += 1
+                    line += (f'><failure message="expected {rng.randrange(1000)} but got {rng.randrange(1000)} '
+                             f'{padding}" type="AssertionError">trace {padding}</failure></testcase>')
+                elif draw < failure_ratio + error_ratio:
+                    counts["errors"] += 1
+                    line += f'><error message="Connection refused to host-{rng.randrange(50)}:5432 {padding}"/></testcase>'
+                elif draw < failure_ratio + error_ratio + skipped_ratio:
+                    counts["skipped"] += 1
+                    line += '><skipped/></testcase>'
+                else:
+                    line += '/>'
+                lines.append(line)
+                index += 1
+            lines.append("</testsuite>" * depth)
+            f.write("\n".join(lines) + "\n")
+        f.write("</testsuites>\n")
+
+        header = (f'<testsuites name="synthetic" tests="{cases}" failures="{counts["failures"]}" '
+                  f'errors="{counts["errors"]}" skipped="{counts["skipped"]}" time="{total_time:.3f}">')
+        f.seek(header_offset)
+        f.write(header.ljust(_HEADER_SIZE))
+    return path
+
+def write_newman_json(path: str, executions: int, failure_ratio: float = 0.05, error_ratio: float = 0.01,
+                      body_size: int = 256, seed: int = 42) -> str:
+    """
+    Ecrit un export Newman (reporter JSON) synthetique et deterministe
+
+    Args:
+        path (str): Fichier de sortie
+        executions (int): Nombre de requetes executees (run.executions)
+        failure_ratio (float): Proportion d'executions avec une assertion en echec
+        error_ratio (float): Proportion d'executions en erreur reseau (requestError)
+        body_size (int): Taille du corps de reponse (run.executions[].response.stream)
+        seed (int): Graine du generateur pseudo-aleatoire
+
+    Returns:
+        str: Chemin du fichier genere
+    """
+    rng = random.Random(seed)
+    stream = {"type": "Buffer", "data": [rng.randrange(256) for _ in range(body_size)]}
+    failed = errors = 0
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"collection":{"info":{"name":"Synthetic API"},"item":[]},"run":{')
+        stats_offset = f.tell()
+        # Place reservee pour run.stats et run.timings, reecrits une fois les compteurs connus
+        f.write(" " * _HEADER_SIZE)
+        f.write('"executions":[')
+        elapsed = 0
+        for index in range(executions):
+            if index:
+                f.write(",")
+            response_time = round(rng.lognormvariate(3.5, 0.6))
+            elapsed += response_time
+            execution = {
+                "cursor": {"position": index},
+                "item": {"id": str(index), "name": f"GET /resource/{index % 500}"},
+                "request": {"method": "GET", "url": {"raw": f"https://api.example.com/resource/{index % 500}"}},
+                "response": {"code": 200, "status": "OK", "responseTime": response_time,
+                             "responseSize": body_size, "stream": stream},
+                "assertions": [{"assertion": "Status code is 200", "skipped": False}]
+            }
+            draw = rng.random()
+            if draw < failure_ratio:
+                failed += 1
+                execution["assertions"].append({
+                    "assertion": "Body matches schema", "skipped": False,
+                    "error": {"name": "AssertionError", "message": f"expected {rng.randrange(100)} to equal 1"}})
+            elif draw < failure_ratio + error_ratio:
+                errors += 1
+                execution["requestError"] = {"code": "ECONNRESET", "message": "socket hang up"}
+                del execution["response"]
+            json.dump(execution, f, separators=(",", ":"))
+        f.write('],"failures":[],"error":null}}')
+
+        stats = json.dumps({
+            "requests": {"total": executions, "failed": errors},
+            "tests": {"total": executions, "failed": failed, "pending": 0},
+            "assertions": {"total": executions + failed, "failed": failed, "pending": 0}
+        }, separators=(",", ":"))
+        timings = json.dumps({"started": 0, "completed": elapsed})
+        f.seek(stats_offset)
+        f.write(f'"stats":{stats},"timings":{timings},'.ljust(_HEADER_SIZE))
+    return path
@@ -0,0 +1,184 @@
+import argparse
+import json
+import multiprocessing
+import queue as queue_module
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.generators import write_junit_xml, write_newman_json
+
+DEFAULT_SIZES = (1000, 100000, 1000000)
+
+# Ecarts absolus en dessous desquels une variation est consideree comme du bruit
+_NOISE_FLOOR = {"wall_s": 0.05, "peak_rss_mb": 5.0}
+
+# Scenario -> (format du rapport, parsing prealable hors chronometre)
+SCENARIOS = {
+    "analyze_junit_xml": ("junit", False),
+    "analyze_junit_xml[streaming]": ("junit", False),
+    "analyze_json_report": ("newman", False),
+    "analyze_json_report[streaming]": ("newman", False),
+    "detect_anomalies": ("junit", True),
+    "cluster_failures": ("junit", True),
+    "generate_summary": ("junit", True),
+    "generate_html_report": ("junit", True),
+    "generate_text_report": ("junit", True),
+}
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss est en kilo-octets sous Linux, en octets sous macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def _run_scenario(scenario: str, report_path: str, output_dir: str, queue) -> None:
+    """
+    Execute un scenario dans un processus dedie pour mesurer son pic de RSS isolement
+    """
+    from modules.analyzer import analyze_junit_xml, analyze_json_report, detect_anomalies, generate_summary
+    from modules.clustering import cluster_failures
+    from modules.reporter import generate_html_report, generate_text_report
+
+    stats = None
+    if SCENARIOS[scenario][1]:
+        stats = analyze_junit_xml(report_path, streaming=True)
+
+    calls = {
+        "analyze_junit_xml": lambda: analyze_junit_xml(report_path),
+        "analyze_junit_xml[streaming]": lambda: analyze_junit_xml(report_path, streaming=True),
+        "analyze_json_report": lambda: analyze_json_report(report_path),
+        "analyze_json_report[streaming]": lambda: analyze_json_report(report_path, streaming=True),
+        "detect_anomalies": lambda: detect_anomalies(stats),
+        "cluster_failures": lambda: cluster_failures(stats["test_cases"]),
+        "generate_summary": lambda: generate_summary(stats),
+        "generate_html_report": lambda: generate_html_report(stats, os.path.join(output_dir, "bench.html")),
+        "generate_text_report": lambda: generate_text_report(stats, os.path.join(output_dir, "bench.txt")),
+    }
+
+    rss_before = _peak_rss_mb()
+    start = time.perf_counter()
+    result = calls[scenario]()
+    wall = time.perf_counter() - start
+    peak = _peak_rss_mb()
+
+    if isinstance(result, dict) and "error" in result and isinstance(result["error"], str):
+        queue.put({"error": result["error"]})
+    else:
+        queue.put({"wall_s": round(wall, 4), "peak_rss_mb": round(peak, 1),
+                   "delta_rss_mb": round(peak - rss_before, 1)})
+
+def _report_path(data_dir: str, fmt: str, size: int) -> str:
+    """
+    Genere (une seule fois) le rapport synthetique pour ce format et cette taille
+    """
+    path = os.path.join(data_dir, f"synthetic_{fmt}_{size}.{'xml' if fmt == 'junit' else 'json'}")
+    if not os.path.exists(path):
+        print(f"  Generation de {path}...")
+        if fmt == "junit":
+            write_junit_xml(path, size)
+        else:
+            write_newman_json(path, size)
+    return path
+
+def run_benchmarks(sizes=DEFAULT_SIZES, scenarios=None, data_dir=None) -> dict:
+    """
+    Lance chaque scenario a chaque taille et retourne les mesures (temps, pic RSS)
+    """
+    data_dir = data_dir or os.path.join(tempfile.gettempdir(), "agent-mcp-qa-bench")
+    os.makedirs(data_dir, exist_ok=True)
+    results = {}
+
+    for size in sizes:
+        for scenario in scenarios or SCENARIOS:
+            report_path = _report_path(data_dir, SCENARIOS[scenario][0], size)
+            queue = multiprocessing.Queue()
+            process = multiprocessing.Process(target=_run_scenario, args=(scenario, report_path, data_dir, queue))
+            process.start()
+            measure = None
+            while measure is None:
+                try:
+                    measure = queue.get(timeout=1)
+                except queue_module.Empty:
+                    if not process.is_alive():
+                        measure = {"error": f"processus termine (code {process.exitcode})"}
+            process.join()
+
+            key = f"{scenario}@{size}"
+            results[key] = measure
+            if "error" in measure:
+                print(f"  ❌ {key}: {measure['error']}")
+            else:
+                print(f"  {key:<45} {measure['wall_s']:>9.3f}s  {measure['peak_rss_mb']:>8.1f} MB")
+
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results
+    }
+
+def compare_to_baseline(current: dict, baseline: dict, tolerance: float = 0.2) -> list:
+    """
+    Liste les scenarios dont le temps ou le pic RSS depasse la reference de plus de
+    `tolerance` (en relatif) et du plancher de bruit _NOISE_FLOOR (en absolu)
+    """
+    regressions = []
+    for key, measure in current["results"].items():
+        reference = baseline.get("results", {}).get(key)
+        if not reference or "error" in measure or "error" in reference:
+            continue
+        for metric, noise in _NOISE_FLOOR.items():
+            if measure[metric] > reference[metric] * (1 + tolerance) + noise:
+                regressions.append(f"{key} {metric}: {reference[metric]} -> {measure[metric]}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de l'analyseur et des generateurs de rapports")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Nombre de cas de test, separes par des virgules")
+    parser.add_argument("--scenarios", default=None, help="Sous-ensemble de scenarios, separes par des virgules")
+    parser.add_argument("--data-dir", default=None, help="Repertoire des rapports synthetiques generes")
+    parser.add_argument("--output", default="benchmarks/baseline.json", help="Fichier JSON des resultats")
+    parser.add_argument("--compare", default=None, help="Reference JSON a comparer")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Ecart relatif tolere (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    scenarios = args.scenarios.split(",") if args.scenarios else None
+
+    # La reference est lue avant d'ecrire les resultats (--compare et --output peuvent coincider)
+    baseline = None
+    if args.compare and os.path.exists(args.compare):
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print("=" * 60)
+    print("    BENCHMARKS AGENT MCP QA")
+    print("=" * 60)
+    current = run_benchmarks(sizes, scenarios, args.data_dir)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(current, f, indent=2)
+    print(f"\nResultats sauvegardes: {args.output}")
+
+    if baseline is not None:
+        regressions = compare_to_baseline(current, baseline, args.tolerance)
+        if regressions:
+            print("\n⚠️ Regressions detectees:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print("\n✅ Aucune regression par rapport a la reference")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
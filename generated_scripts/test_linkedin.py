@@ -0,0 +1 @@
+# Erreur: Clé API OpenAI manquante. Définissez OPENAI_API_KEY dans vos variables d'environnement.
\ No newline at end of file
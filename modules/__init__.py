@@ -1,19 +1,56 @@
-from .generator import generate_selenium_script, generate_appium_script, generate_postman_collection
-from .analyzer import parse_junit_xml, parse_json_report, detect_anomalies
-from .reporter import generate_html_report, generate_text_report
-from .ci_cd_connector import JenkinsConnector, GitLabConnector
+from .generator import generate_selenium_test, generate_appium_test, generate_postman_test, save_test_script
+from .analyzer import analyze_junit_xml, analyze_json_report, analyze_report, detect_anomalies, generate_summary
+from .analyzer import analyze_reports, merge_stats
+from .analyzer import analyze_report_stream, analyze_artifact_stream
+from .reporter import generate_html_report, generate_text_report, generate_json_summary, generate_junit_summary, render_reports
+from .reporter import TrendAggregates, generate_trend_report
+from .ci_cd_connector import JenkinsConnector, GitLabConnector, StatusCache
+from .ci_cd_async import AsyncJenkinsConnector, AsyncGitLabConnector, fetch_statuses
+from .build_watcher import BuildWatcher, estimate_build_duration
 from .jira_connector import JiraConnector
+from .case_table import TestCaseTable
+from .report_cache import ReportCache
+from .history import RunHistory
+from .clustering import cluster_failures
+from .shard_planner import durations_from_stats, plan_shards
+from .sketches import DurationStats, QuantileSketch
 
 __all__ = [
-    'generate_selenium_script',
-    'generate_appium_script',
-    'generate_postman_collection',
-    'parse_junit_xml',
-    'parse_json_report',
+    'generate_selenium_test',
+    'generate_appium_test',
+    'generate_postman_test',
+    'save_test_script',
+    'analyze_junit_xml',
+    'analyze_json_report',
+    'analyze_report',
+    'generate_summary',
     'detect_anomalies',
+    'analyze_reports',
+    'merge_stats',
+    'analyze_report_stream',
+    'analyze_artifact_stream',
     'generate_html_report',
     'generate_text_report',
+    'generate_json_summary',
+    'generate_junit_summary',
+    'render_reports',
+    'TrendAggregates',
+    'generate_trend_report',
     'JenkinsConnector',
     'GitLabConnector',
-    'JiraConnector'
+    'StatusCache',
+    'AsyncJenkinsConnector',
+    'AsyncGitLabConnector',
+    'fetch_statuses',
+    'BuildWatcher',
+    'estimate_build_duration',
+    'JiraConnector',
+    'TestCaseTable',
+    'ReportCache',
+    'RunHistory',
+    'cluster_failures',
+    'durations_from_stats',
+    'plan_shards',
+    'DurationStats',
+    'QuantileSketch'
 ]
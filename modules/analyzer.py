@@ -1,95 +1,409 @@
 import xml.etree.ElementTree as ET
 import json
 import os
-from typing import Dict, List
+import bisect
+import glob
+import mmap
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
 
-def analyze_junit_xml(report_path: str) -> Dict:
+import ijson
+
+from .archive_stream import iter_report_members
+from .case_table import STATUS_CODES, TestCaseTable
+from .report_cache import ReportCache
+from .history import RunHistory
+from .clustering import cluster_failures
+
+# A incrementer a chaque changement de la forme des statistiques produites
+# (invalide les entrees du cache de rapports)
+PARSER_VERSION = "4"
+
+# Au-dela de cette taille, analyze_report bascule sur le parseur en flux
+STREAMING_THRESHOLD_BYTES = 64 * 1024 * 1024
+
+# Au-dela de cette taille, un rapport JUnit est decoupe et parse sur plusieurs coeurs
+SHARDING_THRESHOLD_BYTES = 512 * 1024 * 1024
+
+# Nombre de classnames (p99 le plus eleve) conservees dans stats["durations"]
+DURATION_CLASSNAMES = 100
+
+def _new_junit_stats(root_attrib: Dict) -> Dict:
+    """
+    Initialise les statistiques a partir des attributs de l'element racine
+    """
+    return {
+        "total_tests": int(root_attrib.get('tests', 0)),
+        "failures": int(root_attrib.get('failures', 0)),
+        "errors": int(root_attrib.get('errors', 0)),
+        "skipped": int(root_attrib.get('skipped', 0)),
+        "time": float(root_attrib.get('time', 0)),
+        "test_cases": TestCaseTable()
+    }
+
+def _append_testcase(test_cases: TestCaseTable, testcase: ET.Element) -> None:
+    """
+    Ajoute un element <testcase> a la table en un seul parcours de ses enfants
+    """
+    failure = error = skipped = None
+    for child in testcase:
+        if child.tag == 'failure' and failure is None:
+            failure = child
+        elif child.tag == 'error' and error is None:
+            error = child
+        elif child.tag == 'skipped' and skipped is None:
+            skipped = child
+    
+    # Meme priorite que precedemment: skipped > error > failure
+    status = "passed"
+    failure_message = failure_type = error_message = None
+    if failure is not None:
+        status = "failed"
+        failure_message = failure.attrib.get('message', '')
+        failure_type = failure.attrib.get('type', '')
+    
+    if error is not None:
+        status = "error"
+        error_message = error.attrib.get('message', '')
+    
+    if skipped is not None:
+        status = "skipped"
+    
+    attrib = testcase.attrib
+    test_cases.add(attrib.get('name', 'Unknown'), attrib.get('classname', ''), float(attrib.get('time', 0)),
+                   status, failure_message, failure_type, error_message)
+
+def _compute_success_rate(stats: Dict) -> None:
+    if stats["total_tests"] > 0:
+        passed = stats["total_tests"] - stats["failures"] - stats["errors"] - stats["skipped"]
+        stats["success_rate"] = (passed / stats["total_tests"]) * 100
+    else:
+        stats["success_rate"] = 0
+
+def _analyze_junit_xml_streaming(source) -> Dict:
+    """
+    Parcourt le rapport (chemin ou objet fichier) avec iterparse et libere chaque
+    element une fois traite, de sorte que la memoire reste constante quelle que
+    soit la taille du fichier
+    """
+    stats = None
+    stack = []
+    case_depth = 0
+    
+    for event, elem in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            if stats is None:
+                stats = _new_junit_stats(elem.attrib)
+            if elem.tag == 'testcase':
+                case_depth += 1
+            stack.append(elem)
+            continue
+        
+        stack.pop()
+        if elem.tag == 'testcase':
+            case_depth -= 1
+            if case_depth == 0:
+                _append_testcase(stats["test_cases"], elem)
+        
+        # Les enfants d'un testcase doivent survivre jusqu'a la fin du testcase
+        if case_depth == 0 and stack:
+            stack[-1].remove(elem)
+            elem.clear()
+    
+    return stats
+
+# Jetons utiles au decoupage d'un rapport en tranches d'octets: les sections
+# CDATA/commentaires sont consommees pour ignorer les "<testsuite" qu'elles contiennent
+_ATTRS = rb'(?:[^>"\']|"[^"]*"|\'[^\']*\')*'
+# Le sous-ensemble interne d'un DOCTYPE ([...]) peut contenir des declarations <!ENTITY ...>
+_DOCTYPE = rb'<!DOCTYPE(?:[^\[>"\']|"[^"]*"|\'[^\']*\'|\[(?:[^\]"\']|"[^"]*"|\'[^\']*\')*\])*>'
+_ROOT_SCAN = re.compile(rb'<!--.*?-->|<\?.*?\?>|' + _DOCTYPE + rb'|<([A-Za-z_][^\s/>]*)' + _ATTRS + rb'>', re.S)
+_SUITE_SCAN = re.compile(rb'<!\[CDATA\[.*?\]\]>|<!--.*?-->|<(/?)testsuite(?=[\s/>])' + _ATTRS + rb'?(/?)>', re.S)
+
+class _RangeReader:
+    """
+    Objet fichier exposant prefixe + mm[start:end] + suffixe, lu par blocs
+    """
+    
+    def __init__(self, mm: mmap.mmap, start: int, end: int, prefix: bytes, suffix: bytes):
+        self._parts = [(prefix, 0, len(prefix)), (mm, start, end), (suffix, 0, len(suffix))]
+    
+    def read(self, size: int = -1) -> bytes:
+        chunks = []
+        while self._parts and size != 0:
+            data, start, end = self._parts[0]
+            stop = end if size < 0 else min(end, start + size)
+            chunks.append(data[start:stop])
+            if size > 0:
+                size -= stop - start
+            if stop == end:
+                self._parts.pop(0)
+            else:
+                self._parts[0] = (data, stop, end)
+        return b''.join(chunks)
+
+def _parse_junit_range(args) -> TestCaseTable:
+    report_path, start, end, prolog, root_tag, root_end = args
+    # Chaque tranche est enveloppee dans le prologue et la racine d'origine:
+    # memes entites (DOCTYPE), memes declarations d'espaces de noms
+    with open(report_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        reader = _RangeReader(mm, start, end, prolog + root_tag, root_end)
+        return _analyze_junit_xml_streaming(reader)["test_cases"]
+
+def _junit_shard_ranges(mm: mmap.mmap, workers: int):
+    """
+    Retourne (prologue, balise ouvrante de la racine, balise fermante, tranches
+    d'octets) ou None si le fichier ne peut pas etre decoupe. Le prologue est tout
+    ce qui precede la racine (declaration XML, DOCTYPE, commentaires). Les tranches
+    couvrent tout le contenu de la racine et commencent chacune sur un <testsuite>
+    enfant direct de la racine.
+    """
+    for match in _ROOT_SCAN.finditer(mm):
+        if match.group(1):
+            break
+    else:
+        return None
+    if match.group(0).endswith(b'/>'):
+        return None
+    prolog, root_tag, content_start = mm[:match.start()], match.group(0), match.end()
+    root_end = b'</' + match.group(1) + b'>'
+    content_end = mm.rfind(b'</' + match.group(1))
+    if content_end < content_start:
+        return None
+    
+    boundaries = []
+    depth = 0
+    for token in _SUITE_SCAN.finditer(mm, content_start, content_end):
+        if token.group(1) is None:
+            continue
+        if token.group(1) == b'/':
+            depth -= 1
+        else:
+            if depth == 0:
+                boundaries.append(token.start())
+            if not token.group(2):
+                depth += 1
+    
+    # Points de coupe: la frontiere la plus proche de chaque fraction du fichier
+    splits = []
+    target = (content_end - content_start) / workers
+    for k in range(1, workers):
+        wanted = content_start + k * target
+        index = bisect.bisect_left(boundaries, wanted)
+        candidates = [b for b in boundaries[max(0, index - 1):index + 1]
+                      if b > (splits[-1] if splits else content_start)]
+        if candidates:
+            splits.append(min(candidates, key=lambda b: abs(b - wanted)))
+    
+    edges = [content_start] + splits + [content_end]
+    return prolog, root_tag, root_end, list(zip(edges, edges[1:]))
+
+def _analyze_junit_xml_sharded(report_path: str, workers: int) -> Dict:
+    """
+    Decoupe le rapport en tranches alignees sur les <testsuite> (balayage d'octets
+    sur un fichier mappe en memoire), parse les tranches dans un pool de processus
+    puis concatene les cas dans l'ordre du fichier
+    """
+    with open(report_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        layout = _junit_shard_ranges(mm, workers)
+    
+    if layout is None or len(layout[3]) < 2:
+        return _analyze_junit_xml_streaming(report_path)
+    
+    prolog, root_tag, root_end, ranges = layout
+    root = ET.fromstring(prolog + root_tag + root_end)
+    stats = _new_junit_stats(root.attrib)
+    
+    jobs = [(report_path, start, end, prolog, root_tag, root_end) for start, end in ranges]
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+        for test_cases in executor.map(_parse_junit_range, jobs):
+            stats["test_cases"].extend(test_cases)
+    
+    return stats
+
+def analyze_junit_xml(report_path: str, streaming: bool = False, workers: Optional[int] = None) -> Dict:
     """
     Analyse un rapport JUnit XML et extrait les statistiques
     
     Args:
         report_path (str): Chemin vers le fichier XML
+        streaming (bool): Parse le fichier en flux (iterparse) avec une memoire constante
+        workers (int, optional): Si > 1, decoupe le fichier aux frontieres <testsuite>
+            et parse les tranches en parallele (resultat identique au parsing serie)
         
     Returns:
         Dict: Statistiques du rapport (tests, failures, errors, skipped, time)
     """
     try:
-        tree = ET.parse(report_path)
-        root = tree.getroot()
-        
-        stats = {
-            "total_tests": int(root.attrib.get('tests', 0)),
-            "failures": int(root.attrib.get('failures', 0)),
-            "errors": int(root.attrib.get('errors', 0)),
-            "skipped": int(root.attrib.get('skipped', 0)),
-            "time": float(root.attrib.get('time', 0)),
-            "test_cases": []
-        }
-        
-     
-        for testcase in root.findall('.//testcase'):
-            case_info = {
-                "name": testcase.attrib.get('name', 'Unknown'),
-                "classname": testcase.attrib.get('classname', ''),
-                "time": float(testcase.attrib.get('time', 0)),
-                "status": "passed"
-            }
-            
-            
-            if testcase.find('failure') is not None:
-                case_info["status"] = "failed"
-                failure = testcase.find('failure')
-                case_info["failure_message"] = failure.attrib.get('message', '')
-                case_info["failure_type"] = failure.attrib.get('type', '')
-            
-            
-            if testcase.find('error') is not None:
-                case_info["status"] = "error"
-                error = testcase.find('error')
-                case_info["error_message"] = error.attrib.get('message', '')
-            
-         
-            if testcase.find('skipped') is not None:
-                case_info["status"] = "skipped"
-            
-            stats["test_cases"].append(case_info)
-        
-        if stats["total_tests"] > 0:
-            passed = stats["total_tests"] - stats["failures"] - stats["errors"] - stats["skipped"]
-            stats["success_rate"] = (passed / stats["total_tests"]) * 100
+        if workers and workers > 1:
+            stats = _analyze_junit_xml_sharded(report_path, workers)
+        elif streaming:
+            stats = _analyze_junit_xml_streaming(report_path)
         else:
-            stats["success_rate"] = 0
+            root = ET.parse(report_path).getroot()
+            stats = _new_junit_stats(root.attrib)
+            for testcase in root.iter('testcase'):
+                _append_testcase(stats["test_cases"], testcase)
+        
+        _compute_success_rate(stats)
         
         return stats
     
     except Exception as e:
         return {"error": f"Erreur lors de l'analyse du rapport JUnit: {str(e)}"}
 
-def analyze_json_report(report_path: str) -> Dict:
+def _add_execution(test_cases: TestCaseTable, classname: str, name: str, response_time_ms: float,
+                   assertions: List[Dict], request_error: Optional[str]) -> None:
+    """
+    Ajoute une execution Newman a la table, sous la meme forme qu'un testcase JUnit
+    """
+    status = "passed"
+    failure_message = failure_type = error_message = None
+    
+    failed = [a for a in assertions if a.get("error") is not None and not a.get("skipped")]
+    if failed:
+        status = "failed"
+        first = failed[0]
+        failure_message = f"{first.get('assertion', '')}: {first['error'].get('message', '')}"
+        failure_type = first["error"].get('name', '')
+    elif assertions and all(a.get("skipped") for a in assertions):
+        status = "skipped"
+    
+    if request_error is not None:
+        status = "error"
+        error_message = request_error
+    
+    test_cases.add(name, classname, response_time_ms / 1000, status, failure_message, failure_type, error_message)
+
+def _latency_stats(times: List[float]) -> Dict:
+    """
+    Statistiques de temps de reponse (en millisecondes) a partir des durees en secondes
+    """
+    if not times:
+        return {"count": 0}
+    
+    ordered = sorted(times)
+    count = len(ordered)
+    
+    def percentile(p):
+        return ordered[min(count - 1, int(p * count))] * 1000
+    
+    return {
+        "count": count,
+        "min_ms": ordered[0] * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "mean_ms": sum(ordered) / count * 1000,
+        "p50_ms": percentile(0.50),
+        "p90_ms": percentile(0.90),
+        "p99_ms": percentile(0.99)
+    }
+
+def _newman_stats(run_stats: Dict, timings: Dict, test_cases: TestCaseTable) -> Dict:
+    stats = {
+        "total_tests": run_stats.get('tests', {}).get('total', 0),
+        "failures": run_stats.get('tests', {}).get('failed', 0),
+        "passed": run_stats.get('tests', {}).get('passed', 0),
+        "skipped": run_stats.get('tests', {}).get('pending', 0),
+        "assertions": run_stats.get('assertions', {}),
+        "requests": run_stats.get('requests', {}),
+        "test_cases": test_cases,
+        "request_timing": _latency_stats([t for t, code in zip(test_cases.times, test_cases.statuses)
+                                          if code != STATUS_CODES["error"]])
+    }
+    if timings.get('started') is not None and timings.get('completed') is not None:
+        stats["time"] = (timings['completed'] - timings['started']) / 1000
+    else:
+        stats["time"] = sum(test_cases.times)
+    return stats
+
+def _add_newman_execution(test_cases: TestCaseTable, classname: str, execution: Dict) -> None:
+    request_error = execution.get('requestError')
+    if isinstance(request_error, dict):
+        request_error = request_error.get('message', '')
+    _add_execution(test_cases, classname, execution.get('item', {}).get('name', 'Unknown'),
+                   (execution.get('response') or {}).get('responseTime', 0),
+                   execution.get('assertions', []), request_error)
+
+def _read_newman_metadata(report_path: str) -> Dict:
+    """
+    Lit le nom de la collection, run.stats et run.timings. Newman les ecrit avant
+    run.executions: la lecture s'arrete donc des le debut des executions.
+    """
+    meta = {"classname": "", "stats": None, "timings": {}, "has_run": False}
+    
+    with open(report_path, 'rb') as f:
+        events = ijson.parse(f, use_float=True)
+        for prefix, event, value in events:
+            if prefix == 'collection.info.name' and event == 'string':
+                meta["classname"] = value
+            elif prefix == 'run' and event == 'start_map':
+                meta["has_run"] = True
+            elif prefix == 'run.stats' and event == 'start_map':
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+                for prefix, event, value in events:
+                    if prefix == 'run.stats' and event == 'end_map':
+                        break
+                    builder.event(event, value)
+                meta["stats"] = builder.value
+            elif prefix in ('run.timings.started', 'run.timings.completed') and event == 'number':
+                meta["timings"][prefix.rsplit('.', 1)[1]] = value
+            elif prefix == 'run.executions' and event == 'start_array' and meta["stats"] is not None:
+                break
+    
+    return meta
+
+def _analyze_newman_streaming(report_path: str) -> Optional[Dict]:
+    """
+    Parcourt run.executions execution par execution avec ijson: seule l'execution
+    courante est en memoire, quelle que soit la taille de l'export
+    """
+    meta = _read_newman_metadata(report_path)
+    if not meta["has_run"]:
+        return None
+    
+    test_cases = TestCaseTable()
+    with open(report_path, 'rb') as f:
+        for execution in ijson.items(f, 'run.executions.item', use_float=True):
+            _add_newman_execution(test_cases, meta["classname"], execution)
+    
+    return _newman_stats(meta["stats"] or {}, meta["timings"], test_cases)
+
+def analyze_json_report(report_path: str, streaming: bool = False) -> Dict:
     """
     Analyse un rapport JSON (format Postman, Newman, etc.)
     
+    Pour un export Newman, chaque execution de run.executions devient un cas de
+    test (nom de la requete, temps de reponse, echec d'assertion) dans
+    stats["test_cases"], et stats["request_timing"] donne les latences.
+    
     Args:
         report_path (str): Chemin vers le fichier JSON
+        streaming (bool): Parse l'export en flux (ijson) avec une memoire bornee
         
     Returns:
         Dict: Statistiques du rapport
     """
     try:
+        if streaming:
+            stats = _analyze_newman_streaming(report_path)
+            if stats is not None:
+                return stats
+        
         with open(report_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
         
+        if not isinstance(data, dict):
+            return {"error": "Rapport JSON non reconnu (pas un export Newman)"}
         
         if 'run' in data:
-            stats = data['run'].get('stats', {})
-            return {
-                "total_tests": stats.get('tests', {}).get('total', 0),
-                "failures": stats.get('tests', {}).get('failed', 0),
-                "passed": stats.get('tests', {}).get('passed', 0),
-                "skipped": stats.get('tests', {}).get('pending', 0),
-                "assertions": stats.get('assertions', {}),
-                "requests": stats.get('requests', {})
-            }
+            run = data['run']
+            classname = data.get('collection', {}).get('info', {}).get('name', '')
+            test_cases = TestCaseTable()
+            for execution in run.get('executions', []):
+                _add_newman_execution(test_cases, classname, execution)
+            return _newman_stats(run.get('stats', {}), run.get('timings', {}), test_cases)
         
        
         return data
@@ -97,6 +411,79 @@ def analyze_json_report(report_path: str) -> Dict:
     except Exception as e:
         return {"error": f"Erreur lors de l'analyse du rapport JSON: {str(e)}"}
 
+def _build_value(events, prefix: str, event: str, value):
+    """
+    Reconstruit la valeur (objet ou tableau) qui commence a l'evenement courant
+    """
+    builder = ijson.ObjectBuilder()
+    builder.event(event, value)
+    end = 'end_map' if event == 'start_map' else 'end_array'
+    for current_prefix, current_event, current_value in events:
+        builder.event(current_event, current_value)
+        if current_prefix == prefix and current_event == end:
+            break
+    return builder.value
+
+def _analyze_json_stream(stream) -> Dict:
+    """
+    Analyse un export Newman en une seule passe sur un flux non relisible
+
+    Seules les metadonnees utiles (collection, run.stats, run.timings) et
+    l'execution courante sont reconstruites: la memoire reste bornee. Un JSON
+    qui n'est pas un export Newman est signale comme erreur.
+    """
+    test_cases = TestCaseTable()
+    classname = ""
+    run_stats: Dict = {}
+    timings: Dict = {}
+    has_run = False
+    events = ijson.parse(stream, use_float=True)
+    
+    for prefix, event, value in events:
+        if prefix == '' and event not in ('start_map', 'map_key', 'end_map'):
+            # Racine tableau ou scalaire
+            return {"error": "Rapport JSON non reconnu (pas un export Newman)"}
+        elif prefix == 'collection.info.name' and event == 'string':
+            classname = value
+        elif prefix == 'run' and event == 'start_map':
+            has_run = True
+        elif prefix == 'run.stats' and event == 'start_map':
+            run_stats = _build_value(events, prefix, event, value)
+        elif prefix in ('run.timings.started', 'run.timings.completed') and event == 'number':
+            timings[prefix.rsplit('.', 1)[1]] = value
+        elif prefix == 'run.executions.item' and event == 'start_map':
+            # Newman ecrit la collection avant le run
+            _add_newman_execution(test_cases, classname, _build_value(events, prefix, event, value))
+    
+    if not has_run:
+        return {"error": "Rapport JSON non reconnu (pas un export Newman)"}
+    return _newman_stats(run_stats, timings, test_cases)
+
+def analyze_report_stream(stream, name: str) -> Dict:
+    """
+    Analyse un rapport lu depuis un objet fichier (reponse HTTP, membre d'archive)
+    
+    Le flux est parse en une seule passe (iterparse/ijson), sans fichier
+    temporaire ni retour en arriere.
+    
+    Args:
+        stream: Objet fichier binaire
+        name (str): Nom du rapport, dont l'extension (.xml ou .json) choisit le parseur
+        
+    Returns:
+        Dict: Statistiques du rapport
+    """
+    try:
+        if name.endswith('.xml'):
+            stats = _analyze_junit_xml_streaming(stream)
+            _compute_success_rate(stats)
+            return stats
+        if name.endswith('.json'):
+            return _analyze_json_stream(stream)
+        return {"error": "Format de rapport non supporté. Utilisez .xml ou .json"}
+    except Exception as e:
+        return {"error": f"Erreur lors de l'analyse du rapport {name}: {str(e)}"}
+
 def detect_anomalies(stats: Dict) -> List[str]:
     """
     Détecte les anomalies dans les résultats de test
@@ -129,6 +516,16 @@ def detect_anomalies(stats: Dict) -> List[str]:
     if stats.get("time", 0) > 300:  
         anomalies.append(f"⏱️ Temps d'exécution long: {stats['time']:.2f}s")
     
+    
+    clusters = stats.get("failure_clusters", [])
+    clustered = sum(cluster["count"] for cluster in clusters)
+    if clusters and clustered > len(clusters):
+        anomalies.append(f"🔁 {clustered} échec(s) regroupé(s) en {len(clusters)} cause(s) probable(s)")
+    
+    
+    if stats.get("duration_regressions"):
+        anomalies.append(f"🐢 {len(stats['duration_regressions'])} test(s) nettement plus lent(s) que l'historique")
+    
     return anomalies
 
 def generate_summary(stats: Dict) -> str:
@@ -167,34 +564,321 @@ def generate_summary(stats: Dict) -> str:
         for anomaly in anomalies:
             summary.append(f"  {anomaly}")
     
+    clusters = stats.get("failure_clusters", [])
+    if clusters:
+        summary.append("\n" + "="*60)
+        summary.append("CAUSES D'ÉCHEC REGROUPÉES:")
+        summary.append("="*60)
+        for cluster in clusters[:10]:
+            summary.append(f"  [{cluster['count']}x] {cluster['failure_type']}: {cluster['message'][:120]}")
+            summary.append(f"        ex: {cluster['examples'][0]['test']}")
+        if len(clusters) > 10:
+            summary.append(f"  ... et {len(clusters) - 10} autre(s) cause(s)")
+    
+    durations = _duration_summary(stats)
+    if durations and durations["overall"]["count"]:
+        overall = durations["overall"]
+        summary.append("\n" + "="*60)
+        summary.append("DURÉES DES TESTS:")
+        summary.append("="*60)
+        summary.append(f"  Global: p50 {overall['p50']:.3f}s | p90 {overall['p90']:.3f}s | "
+                       f"p99 {overall['p99']:.3f}s | max {overall['max']:.3f}s")
+        summary.append("  Classes les plus lentes (p99):")
+        for row in durations["by_classname"][:10]:
+            summary.append(f"    {row['classname'] or '(sans classe)'}: p50 {row['p50']:.3f}s | "
+                           f"p90 {row['p90']:.3f}s | p99 {row['p99']:.3f}s ({row['count']} tests)")
+        summary.append("  Tests les plus lents:")
+        for row in durations["slowest"][:10]:
+            test = f"{row['classname']}.{row['name']}" if row['classname'] else row['name']
+            summary.append(f"    {test}: {row['time']:.3f}s")
+    
+    regressions = stats.get("duration_regressions", [])
+    if regressions:
+        summary.append("\n" + "="*60)
+        summary.append("RÉGRESSIONS DE DURÉE:")
+        summary.append("="*60)
+        for regression in regressions[:10]:
+            summary.append(f"  {regression['test_key']}: {regression['time']:.2f}s "
+                           f"(moyenne {regression['mean']:.2f}s, x{regression['ratio']:.1f})")
+        if len(regressions) > 10:
+            summary.append(f"  ... et {len(regressions) - 10} autre(s)")
+    
     summary.append("="*60 + "\n")
     
     return "\n".join(summary)
 
-def analyze_report(report_path: str) -> Dict:
+def _duration_summary(stats: Dict) -> Optional[Dict]:
     """
-    Fonction principale pour analyser un rapport (détecte le format automatiquement)
+    Percentiles de durée par classname et tests les plus lents, calculés pendant le parsing
+    """
+    if "durations" in stats:
+        return stats["durations"]
+    test_cases = stats.get("test_cases")
+    if isinstance(test_cases, TestCaseTable):
+        return test_cases.durations.summary(limit=DURATION_CLASSNAMES)
+    return None
+
+_MERGED_COUNTERS = ("total_tests", "failures", "errors", "skipped")
+_MERGED_SECTIONS = ("assertions", "requests")
+
+_report_cache = None
+
+def _get_report_cache() -> ReportCache:
+    # Une instance (et une connexion SQLite) par processus
+    global _report_cache
+    if _report_cache is None:
+        _report_cache = ReportCache()
+    return _report_cache
+
+def _parse_file(report_path: str, streaming: Optional[bool], workers: Optional[int] = None) -> Dict:
+    size = os.path.getsize(report_path)
+    if streaming is None:
+        streaming = size > STREAMING_THRESHOLD_BYTES
+    if workers is None:
+        workers = os.cpu_count() if size > SHARDING_THRESHOLD_BYTES else 1
+    
+    if report_path.endswith('.xml'):
+        return analyze_junit_xml(report_path, streaming=streaming, workers=workers)
+    return analyze_json_report(report_path, streaming=streaming)
+
+def _analyze_file(report_path: str, streaming: Optional[bool] = None, use_cache: bool = False,
+                  workers: Optional[int] = None) -> Dict:
+    """
+    Analyse un fichier unique en choisissant le parseur selon l'extension
+    """
+    if not os.path.exists(report_path):
+        return {"error": f"Fichier introuvable: {report_path}"}
+    
+    if not report_path.endswith(('.xml', '.json')):
+        return {"error": "Format de rapport non supporté. Utilisez .xml ou .json"}
+    
+    if not use_cache:
+        return _parse_file(report_path, streaming, workers)
+    
+    cache = _get_report_cache()
+    stats = cache.get(report_path, PARSER_VERSION)
+    if stats is None:
+        stats = _parse_file(report_path, streaming, workers)
+        if "error" not in stats:
+            # Les clusters d'echecs font partie de l'entree: pas de regroupement sur un cache valide
+            _add_failure_clusters(stats)
+            cache.put(report_path, PARSER_VERSION, stats)
+    return stats
+
+def _is_parsed_report(stats) -> bool:
+    """
+    Vrai pour des statistiques produites par le parseur JUnit ou Newman (ou deja fusionnees)
+    """
+    return isinstance(stats, dict) and "error" not in stats and isinstance(stats.get("test_cases"), TestCaseTable)
+
+def _analyze_shard(args) -> Dict:
+    report_path, streaming, use_cache = args
+    try:
+        # Deja dans un pool de processus: pas de decoupage supplementaire du fichier
+        stats = _analyze_file(report_path, streaming, use_cache, workers=1)
+    except Exception as e:
+        return {"error": f"{report_path}: {str(e)}"}
+    if isinstance(stats, dict) and "error" in stats:
+        stats["error"] = f"{report_path}: {stats['error']}"
+    elif not _is_parsed_report(stats):
+        # JSON quelconque (package.json, couverture...) ramasse par un repertoire ou un glob
+        return {"error": f"{report_path}: Rapport non reconnu (ni JUnit ni Newman)"}
+    return stats
+
+def _expand_report_paths(target: str) -> List[str]:
+    """
+    Resout un repertoire ou un motif glob en liste triee de rapports .xml/.json
+    """
+    if os.path.isdir(target):
+        paths = []
+        for dirpath, _, filenames in os.walk(target):
+            paths.extend(os.path.join(dirpath, f) for f in filenames if f.endswith(('.xml', '.json')))
+    else:
+        paths = [p for p in glob.glob(target, recursive=True) if p.endswith(('.xml', '.json'))]
+    return sorted(paths)
+
+def merge_stats(stats_list: List[Dict]) -> Dict:
+    """
+    Fusionne les statistiques de plusieurs rapports en un resultat combine
+    
+    Les compteurs sont sommes en entiers et le temps en nanosecondes entieres, la
+    reduction est donc exacte et associative: fusionner des resultats deja fusionnes
+    donne le meme resultat que tout fusionner d'un coup. Le taux de reussite est
+    recalcule a partir des compteurs fusionnes.
+    
+    Seules les statistiques des parseurs JUnit/Newman sont fusionnees; les
+    erreurs et tout autre document sont reportes dans shard_errors.
     
     Args:
-        report_path (str): Chemin vers le fichier de rapport
+        stats_list (List[Dict]): Statistiques issues de analyze_junit_xml/analyze_json_report
         
     Returns:
-        Dict: Statistiques et résumé
+        Dict: Statistiques combinees
     """
-    if not os.path.exists(report_path):
-        return {"error": f"Fichier introuvable: {report_path}"}
+    merged = {
+        "total_tests": 0,
+        "failures": 0,
+        "errors": 0,
+        "skipped": 0,
+        "time": 0.0,
+        "test_cases": TestCaseTable(),
+        "reports": 0
+    }
+    time_ns = 0
+    shard_errors = []
     
-  
-    if report_path.endswith('.xml'):
-        stats = analyze_junit_xml(report_path)
-    elif report_path.endswith('.json'):
-        stats = analyze_json_report(report_path)
+    for stats in stats_list:
+        if isinstance(stats, dict) and "error" in stats:
+            shard_errors.append(stats["error"])
+            continue
+        if not _is_parsed_report(stats):
+            shard_errors.append("Rapport non reconnu (ni JUnit ni Newman)")
+            continue
+        
+        merged["reports"] += stats.get("reports", 1)
+        shard_errors.extend(stats.get("shard_errors", []))
+        for key in _MERGED_COUNTERS:
+            if key in stats:
+                merged[key] = merged.get(key, 0) + int(stats[key])
+        time_ns += round(float(stats.get("time", 0)) * 1e9)
+        merged["test_cases"].extend(stats.get("test_cases", []))
+        
+        for section in _MERGED_SECTIONS:
+            for key, value in stats.get(section, {}).items():
+                if isinstance(value, (int, float)):
+                    bucket = merged.setdefault(section, {})
+                    bucket[key] = bucket.get(key, 0) + value
+    
+    merged["time"] = time_ns / 1e9
+    _compute_success_rate(merged)
+    if shard_errors:
+        merged["shard_errors"] = shard_errors
+    
+    return merged
+
+def _analyze_many(target: str, max_workers: Optional[int] = None, streaming: Optional[bool] = None,
+                  use_cache: bool = False) -> Dict:
+    paths = _expand_report_paths(target)
+    if not paths:
+        return {"error": f"Aucun rapport .xml/.json trouvé: {target}"}
+    
+    jobs = [(path, streaming, use_cache) for path in paths]
+    if max_workers == 1 or len(paths) == 1:
+        results = [_analyze_shard(job) for job in jobs]
     else:
-        return {"error": "Format de rapport non supporté. Utilisez .xml ou .json"}
+        workers = min(max_workers or os.cpu_count() or 1, len(paths))
+        results = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_analyze_shard, job) for job in jobs]
+            for path, future in zip(paths, futures):
+                # Un processus mort ou un resultat non transmissible ne compte que pour son fichier
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append({"error": f"{path}: {str(e)}"})
     
+    stats = merge_stats(results)
+    if stats["reports"] == 0:
+        return {"error": "Aucun rapport n'a pu être analysé", "shard_errors": stats.get("shard_errors", [])}
     
+    return stats
+
+def _add_failure_clusters(stats: Dict) -> None:
+    if stats.get("test_cases") and "failure_clusters" not in stats:
+        stats["failure_clusters"] = cluster_failures(stats["test_cases"])
+
+def _finalize(stats: Dict) -> Dict:
     if "error" not in stats:
+        _add_failure_clusters(stats)
+        durations = _duration_summary(stats)
+        if durations is not None:
+            stats["durations"] = durations
         stats["summary"] = generate_summary(stats)
         stats["anomalies"] = detect_anomalies(stats)
-    
     return stats
+
+def analyze_artifact_stream(stream, name: Optional[str] = None) -> Dict:
+    """
+    Analyse un artifact CI lu en flux: archive zip/tar(.gz) ou rapport seul
+    
+    Chaque rapport .xml/.json de l'archive est decompresse et parse au fil de la
+    lecture, sans rien ecrire sur disque; plusieurs rapports sont fusionnes avec
+    merge_stats comme pour analyze_reports.
+    
+    Args:
+        stream: Objet fichier binaire lu en avant (ex. requests Response.raw)
+        name (str, optional): Nom de l'artifact (format d'un rapport seul)
+        
+    Returns:
+        Dict: Statistiques combinees et résumé
+    """
+    results = []
+    try:
+        for member_name, member in iter_report_members(stream, name):
+            stats = analyze_report_stream(member, member_name)
+            if "error" in stats:
+                stats["error"] = f"{member_name}: {stats['error']}"
+            results.append(stats)
+    except Exception as e:
+        return {"error": f"Erreur lors de la lecture de l'artifact: {str(e)}"}
+    
+    if not results:
+        return {"error": f"Aucun rapport .xml/.json dans l'artifact: {name or ''}"}
+    if len(results) == 1:
+        return _finalize(results[0])
+    
+    stats = merge_stats(results)
+    if stats["reports"] == 0:
+        return {"error": "Aucun rapport n'a pu être analysé", "shard_errors": stats.get("shard_errors", [])}
+    return _finalize(stats)
+
+def analyze_reports(target: str, max_workers: Optional[int] = None, streaming: Optional[bool] = None,
+                    use_cache: bool = False) -> Dict:
+    """
+    Analyse tous les rapports d'un repertoire ou d'un motif glob en parallele
+    
+    Chaque rapport est parse dans un pool de processus, puis les resultats sont
+    fusionnes avec merge_stats.
+    
+    Args:
+        target (str): Repertoire ou motif glob (ex: "results/**/*.xml")
+        max_workers (int, optional): Nombre de processus (par defaut: nombre de coeurs)
+        streaming (bool, optional): Transmis a chaque parseur
+        use_cache (bool): Reutilise le cache disque des rapports deja analyses
+        
+    Returns:
+        Dict: Statistiques combinees et résumé
+    """
+    return _finalize(_analyze_many(target, max_workers, streaming, use_cache))
+
+def analyze_report(report_path: str, streaming: Optional[bool] = None, use_cache: bool = False,
+                   history: Optional[RunHistory] = None, workers: Optional[int] = None) -> Dict:
+    """
+    Fonction principale pour analyser un rapport (détecte le format automatiquement)
+    
+    Args:
+        report_path (str): Chemin vers le fichier de rapport, un repertoire ou un
+            motif glob (voir analyze_reports)
+        streaming (bool, optional): Force ou désactive le parsing en flux. Par défaut,
+            il est activé au-delà de STREAMING_THRESHOLD_BYTES
+        use_cache (bool): Réutilise les statistiques en cache si le contenu du fichier
+            est inchangé (voir ReportCache, répertoire AGENT_QA_CACHE_DIR)
+        history (RunHistory, optional): Historique auquel ajouter cette exécution;
+            stats["run_id"] contient alors son identifiant et stats["duration_regressions"]
+            les tests nettement plus lents que sur les exécutions précédentes
+        workers (int, optional): Processus utilisés pour découper un gros rapport JUnit.
+            Par défaut, tous les cœurs au-delà de SHARDING_THRESHOLD_BYTES
+        
+    Returns:
+        Dict: Statistiques et résumé
+    """
+    if os.path.isdir(report_path) or glob.has_magic(report_path):
+        stats = _analyze_many(report_path, streaming=streaming, use_cache=use_cache)
+    else:
+        stats = _analyze_file(report_path, streaming, use_cache, workers)
+    
+    if history is not None and "error" not in stats:
+        stats["run_id"] = history.append_run(stats, source=report_path)
+        stats["duration_regressions"] = history.duration_regressions(stats["run_id"])
+    
+    return _finalize(stats)
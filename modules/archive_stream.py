@@ -0,0 +1,221 @@
+import gzip
+import io
+import struct
+import tarfile
+import zlib
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+# Taille des lectures sur le flux source et borne de sortie de chaque decompression
+READ_SIZE = 64 * 1024
+REPORT_EXTENSIONS = ('.xml', '.json')
+
+# Methodes zip supportees (zipfile.ZIP_STORED / ZIP_DEFLATED): zipfile exige un flux positionnable
+_ZIP_STORED = 0
+_ZIP_DEFLATED = 8
+_ZIP_LOCAL = b'PK\x03\x04'
+_ZIP_DESCRIPTOR = b'PK\x07\x08'
+_ZIP_LOCAL_HEADER = struct.Struct('<4sHHHHHIIIHH')
+_ZIP64_EXTRA_ID = 0x0001
+_ZIP64_MARKER = 0xFFFFFFFF
+_GZIP_MAGIC = b'\x1f\x8b'
+
+class _Source:
+    """
+    Flux lu strictement en avant (reponse HTTP brute), avec remise en tete des
+    octets lus en trop (fin d'un membre deflate, detection du format)
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+        self._buffer = b""
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+            return data + self._stream.read()
+        if self._buffer:
+            data = self._buffer[:size]
+            self._buffer = self._buffer[size:]
+            return data
+        return self._stream.read(size)
+
+    def read_exact(self, size: int) -> bytes:
+        chunks = []
+        while size > 0:
+            data = self.read(size)
+            if not data:
+                raise EOFError("Archive tronquee")
+            chunks.append(data)
+            size -= len(data)
+        return b"".join(chunks)
+
+    def peek(self, size: int) -> bytes:
+        while len(self._buffer) < size:
+            data = self._stream.read(size - len(self._buffer))
+            if not data:
+                break
+            self._buffer += data
+        return self._buffer[:size]
+
+    def unread(self, data: bytes) -> None:
+        self._buffer = data + self._buffer
+
+class _ZipMember(io.RawIOBase):
+    """
+    Contenu d'une entree zip decompresse a la volee depuis l'en-tete local
+
+    Ne depend pas du repertoire central (en fin d'archive): une entree deflate se
+    termine d'elle-meme, ce qui couvre aussi les archives ecrites en flux (tailles
+    dans un descripteur place apres les donnees).
+    """
+
+    def __init__(self, source: _Source, method: int, compressed_size: int, expected_crc: int,
+                 has_descriptor: bool, zip64: bool):
+        if method not in (_ZIP_STORED, _ZIP_DEFLATED):
+            raise ValueError(f"Methode de compression zip non supportee: {method}")
+        if method == _ZIP_STORED and has_descriptor:
+            raise ValueError("Entree zip non compressee sans taille connue")
+        self._source = source
+        self._method = method
+        self._remaining = compressed_size
+        self._expected_crc = expected_crc
+        self._has_descriptor = has_descriptor
+        self._zip64 = zip64
+        self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS) if method == _ZIP_DEFLATED else None
+        self._pending = b""
+        self._crc = 0
+        self._eof = method == _ZIP_STORED and compressed_size == 0
+
+    def readable(self) -> bool:
+        return True
+
+    def _fill(self) -> None:
+        while not self._pending and not self._eof:
+            if self._decompressor is None:
+                data = self._source.read(min(READ_SIZE, self._remaining))
+                if not data:
+                    raise EOFError("Archive tronquee")
+                self._remaining -= len(data)
+                self._eof = self._remaining == 0
+                out = data
+            else:
+                data = self._decompressor.unconsumed_tail
+                if not data:
+                    size = READ_SIZE if self._has_descriptor else min(READ_SIZE, self._remaining)
+                    data = self._source.read(size)
+                    if not data:
+                        raise EOFError("Archive tronquee")
+                    self._remaining -= len(data)
+                out = self._decompressor.decompress(data, READ_SIZE)
+                if self._decompressor.eof:
+                    # Octets lus au-dela du flux deflate: descripteur ou entree suivante
+                    self._source.unread(self._decompressor.unused_data)
+                    self._eof = True
+            self._crc = zlib.crc32(out, self._crc)
+            self._pending = out
+
+    def readinto(self, buffer) -> int:
+        self._fill()
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def finish(self) -> None:
+        """
+        Consomme la fin de l'entree (meme non lue) et verifie son CRC
+        """
+        while not self._eof or self._pending:
+            self._pending = b""
+            self._fill()
+        if self._has_descriptor:
+            signature = self._source.read_exact(4)
+            crc_bytes = self._source.read_exact(4) if signature == _ZIP_DESCRIPTOR else signature
+            self._expected_crc = struct.unpack('<I', crc_bytes)[0]
+            self._source.read_exact(16 if self._zip64 else 8)
+        if self._crc != self._expected_crc:
+            raise ValueError("CRC invalide dans l'archive zip")
+
+def _iter_zip_members(source: _Source) -> Iterator[Tuple[str, _ZipMember]]:
+    while True:
+        signature = source.peek(4)
+        if signature != _ZIP_LOCAL:
+            # Repertoire central (ou fin du flux): plus d'entree a lire
+            return
+        (_, _, flags, method, _, _, crc, compressed_size, size,
+         name_length, extra_length) = _ZIP_LOCAL_HEADER.unpack(source.read_exact(_ZIP_LOCAL_HEADER.size))
+        raw_name = source.read_exact(name_length)
+        extra = source.read_exact(extra_length)
+        name = raw_name.decode('utf-8' if flags & 0x800 else 'cp437')
+        if flags & 0x1:
+            raise ValueError(f"Entree zip chiffree non supportee: {name}")
+
+        zip64 = False
+        offset = 0
+        while offset + 4 <= len(extra):
+            block_id, block_size = struct.unpack_from('<HH', extra, offset)
+            if block_id == _ZIP64_EXTRA_ID:
+                zip64 = True
+                fields = extra[offset + 4:offset + 4 + block_size]
+                values = [struct.unpack_from('<Q', fields, i)[0] for i in range(0, len(fields) - 7, 8)]
+                if size == _ZIP64_MARKER and values:
+                    values.pop(0)
+                if compressed_size == _ZIP64_MARKER and values:
+                    compressed_size = values.pop(0)
+            offset += 4 + block_size
+
+        member = _ZipMember(source, method, compressed_size, crc, bool(flags & 0x8), zip64)
+        yield name, member
+        member.finish()
+
+def _is_report(name: str) -> bool:
+    return name.endswith(REPORT_EXTENSIONS) and not name.startswith('__MACOSX/')
+
+def iter_report_members(stream: BinaryIO, name: Optional[str] = None) -> Iterator[Tuple[str, BinaryIO]]:
+    """
+    Parcourt les rapports .xml/.json d'un artifact lu en flux, sans fichier temporaire
+
+    Le format est reconnu a sa signature: archive zip, archive tar (compressee ou
+    non), rapport unique gzip, ou rapport brut. Chaque membre est decompresse a la
+    volee et doit etre lu avant de passer au suivant.
+
+    Args:
+        stream: Objet fichier lu en avant uniquement (ex. requests Response.raw)
+        name (str): Nom de l'artifact, utilise pour un rapport unique (extension)
+
+    Yields:
+        Tuple[str, BinaryIO]: Nom du membre et flux de son contenu
+    """
+    source = _Source(stream)
+    name = name or ""
+    magic = source.peek(262)
+
+    if magic.startswith(_ZIP_LOCAL):
+        for member_name, member in _iter_zip_members(source):
+            if _is_report(member_name):
+                yield member_name, io.BufferedReader(member, READ_SIZE)
+        return
+
+    single_gzip = magic.startswith(_GZIP_MAGIC) and name.endswith(tuple(ext + '.gz' for ext in REPORT_EXTENSIONS))
+    if single_gzip:
+        yield name[:-3], gzip.GzipFile(fileobj=source, mode='rb')
+        return
+
+    # Signature "ustar" a l'octet 257 d'une archive tar non compressee
+    if magic.startswith((_GZIP_MAGIC, b'BZh', b'\xfd7zXZ')) or magic[257:262] == b'ustar':
+        with tarfile.open(fileobj=source, mode='r|*') as archive:
+            for member in archive:
+                if member.isfile() and _is_report(member.name):
+                    yield member.name, archive.extractfile(member)
+        return
+
+    if _is_report(name):
+        yield name, source
+        return
+
+    # Rapport brut sans extension: le premier caractere significatif donne le format
+    head = magic.lstrip()
+    if head.startswith(b'<'):
+        yield name + '.xml', source
+    elif head.startswith((b'{', b'[')):
+        yield name + '.json', source
@@ -0,0 +1,231 @@
+import asyncio
+import inspect
+import statistics
+import time
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from .ci_cd_async import AsyncBaseConnector, AsyncGitLabConnector, AsyncJenkinsConnector
+from .ci_cd_connector import GITLAB_TERMINAL_STATUSES, JenkinsConnector
+
+# Intervalles de polling (secondes): au plus pres de la fin attendue, et au plus lache
+DEFAULT_MIN_INTERVAL = 2.0
+DEFAULT_MAX_INTERVAL = 60.0
+# Facteur de croissance de l'intervalle a chaque poll sans resultat apres la fin attendue
+DEFAULT_BACKOFF = 1.5
+# Apres la fin attendue, l'intervalle ne depasse pas cette fraction de la duree attendue
+OVERRUN_INTERVAL_RATIO = 0.1
+# Erreurs consecutives apres lesquelles un build est rendu avec son statut d'erreur
+DEFAULT_MAX_ERRORS = 5
+# Builds utilises pour estimer la duree attendue d'un job
+DEFAULT_HISTORY_WINDOW = 20
+
+WatchKey = Tuple[str, str, int]
+
+def estimate_build_duration(connector: JenkinsConnector, job_name: str,
+                            window: int = DEFAULT_HISTORY_WINDOW) -> Optional[float]:
+    """
+    Duree attendue d'un build (secondes): mediane des derniers builds termines du job
+
+    Returns:
+        Optional[float]: None si le job n'a pas d'historique exploitable
+    """
+    try:
+        durations = [build["duration"] / 1000 for build in connector.iter_build_history(job_name, limit=window)
+                     if not build["building"] and build["duration"]]
+    except Exception:
+        return None
+    return statistics.median(durations) if durations else None
+
+class _Watch:
+    __slots__ = ("key", "connector", "expected", "started", "next_poll", "misses", "errors", "callback")
+
+    def __init__(self, key: WatchKey, connector: AsyncBaseConnector, expected: Optional[float],
+                 started: float, callback: Optional[Callable]):
+        self.key = key
+        self.connector = connector
+        self.expected = expected
+        self.started = started
+        self.next_poll = started
+        self.misses = 0
+        self.errors = 0
+        self.callback = callback
+
+class BuildWatcher:
+    """
+    Attend la fin de nombreux builds Jenkins et pipelines GitLab
+
+    Chaque cible est interrogee selon sa duree attendue: tant que la fin est
+    lointaine, l'attente est la moitie du temps restant, puis l'intervalle part
+    de min_interval et croit de `backoff` a chaque poll sans resultat (jusqu'a
+    max_interval, ou 10% de la duree attendue). Les cibles d'un meme serveur dues dans la meme fenetre sont
+    interrogees ensemble, en parallele sur le connecteur asynchrone.
+
+    Les fins de build sont livrees aux callbacks (fonctions ou coroutines,
+    appelees avec (cle, statut)) et par iteration asynchrone:
+
+        async for key, status in watcher:
+            ...
+    """
+
+    def __init__(self, jenkins: Optional[AsyncJenkinsConnector] = None, gitlab: Optional[AsyncGitLabConnector] = None,
+                 min_interval: float = DEFAULT_MIN_INTERVAL, max_interval: float = DEFAULT_MAX_INTERVAL,
+                 backoff: float = DEFAULT_BACKOFF, batch_window: Optional[float] = None,
+                 max_errors: int = DEFAULT_MAX_ERRORS):
+        self.jenkins = jenkins
+        self.gitlab = gitlab
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        # Une cible due un peu plus tard part avec le lot courant plutot que seule
+        self.batch_window = min_interval / 2 if batch_window is None else min(batch_window, min_interval / 2)
+        self.max_errors = max_errors
+        self._watches: Dict[WatchKey, _Watch] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.metrics = {"polls": 0, "completed": 0}
+
+    def _register(self, key: WatchKey, connector: Optional[AsyncBaseConnector], expected_duration: Optional[float],
+                  started_at: Optional[float], callback: Optional[Callable]) -> WatchKey:
+        if connector is None:
+            raise ValueError(f"Aucun connecteur {key[0]} configure")
+        # started_at (epoch) converti en horloge monotone
+        started = time.monotonic() - (time.time() - started_at if started_at is not None else 0.0)
+        self._watches[key] = _Watch(key, connector, expected_duration, started, callback)
+        self._watches[key].next_poll = started + self._interval(self._watches[key], started)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return key
+
+    def watch_build(self, job_name: str, build_number: int, expected_duration: Optional[float] = None,
+                    started_at: Optional[float] = None, callback: Optional[Callable] = None) -> WatchKey:
+        """
+        Surveille un build Jenkins
+
+        Args:
+            expected_duration (float): Duree attendue en secondes (voir estimate_build_duration)
+            started_at (float): Debut du build (epoch, secondes); par defaut maintenant
+            callback: Appele avec (cle, statut) quand le build est termine
+
+        Returns:
+            Tuple: Cle ("jenkins", job_name, build_number) des evenements
+        """
+        return self._register(("jenkins", job_name, build_number), self.jenkins, expected_duration,
+                              started_at, callback)
+
+    def watch_pipeline(self, project_id: str, pipeline_id: int, expected_duration: Optional[float] = None,
+                       started_at: Optional[float] = None, callback: Optional[Callable] = None) -> WatchKey:
+        """
+        Surveille un pipeline GitLab (memes arguments que watch_build)
+
+        Returns:
+            Tuple: Cle ("gitlab", project_id, pipeline_id) des evenements
+        """
+        return self._register(("gitlab", project_id, pipeline_id), self.gitlab, expected_duration,
+                              started_at, callback)
+
+    def unwatch(self, key: WatchKey) -> None:
+        self._watches.pop(key, None)
+
+    def _interval(self, watch: _Watch, now: float) -> float:
+        ceiling = self.max_interval
+        if watch.expected is not None:
+            remaining = watch.started + watch.expected - now
+            if remaining > self.min_interval:
+                return min(max(remaining / 2, self.min_interval), self.max_interval)
+            # En retard sur la duree attendue: la fin reste probablement proche
+            ceiling = min(ceiling, max(self.min_interval, watch.expected * OVERRUN_INTERVAL_RATIO))
+        return min(self.min_interval * self.backoff ** watch.misses, ceiling)
+
+    @staticmethod
+    def _finished(key: WatchKey, status: Dict) -> bool:
+        if status.get("status") != "success":
+            return False
+        if key[0] == "jenkins":
+            return not status.get("building") and status.get("result") is not None
+        return status.get("pipeline_status") in GITLAB_TERMINAL_STATUSES
+
+    async def _poll(self, connector: AsyncBaseConnector, watches: List[_Watch]) -> None:
+        keys = [watch.key[1:] for watch in watches]
+        if isinstance(connector, AsyncJenkinsConnector):
+            statuses = await connector.get_build_statuses(keys)
+        else:
+            statuses = await connector.get_pipeline_statuses(keys)
+        self.metrics["polls"] += len(watches)
+
+        now = time.monotonic()
+        for watch, status in zip(watches, statuses):
+            if self._watches.get(watch.key) is not watch:
+                continue
+            if status.get("status") != "success":
+                watch.errors += 1
+                if watch.errors < self.max_errors:
+                    watch.misses += 1
+                    watch.next_poll = now + self._interval(watch, now)
+                    continue
+            elif not self._finished(watch.key, status):
+                watch.errors = 0
+                if watch.expected is None or now >= watch.started + watch.expected:
+                    watch.misses += 1
+                watch.next_poll = now + self._interval(watch, now)
+                continue
+
+            del self._watches[watch.key]
+            self.metrics["completed"] += 1
+            if watch.callback is not None:
+                result = watch.callback(watch.key, status)
+                if inspect.isawaitable(result):
+                    await result
+            if self._queue is not None:
+                self._queue.put_nowait((watch.key, status))
+
+    async def run(self) -> None:
+        """
+        Interroge les cibles jusqu'a ce qu'elles soient toutes terminees
+        """
+        self._wakeup = asyncio.Event()
+        try:
+            while self._watches:
+                now = time.monotonic()
+                due: Dict[AsyncBaseConnector, List[_Watch]] = {}
+                for watch in self._watches.values():
+                    if watch.next_poll <= now + self.batch_window:
+                        due.setdefault(watch.connector, []).append(watch)
+
+                if due:
+                    await asyncio.gather(*(self._poll(connector, watches) for connector, watches in due.items()))
+                    continue
+
+                self._wakeup.clear()
+                delay = min(watch.next_poll for watch in self._watches.values()) - now
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._wakeup = None
+
+    async def _iterate(self) -> AsyncIterator[Tuple[WatchKey, Dict]]:
+        self._queue = asyncio.Queue()
+        runner = asyncio.ensure_future(self.run())
+        try:
+            while not (runner.done() and self._queue.empty()):
+                getter = asyncio.ensure_future(self._queue.get())
+                await asyncio.wait({getter, runner}, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield getter.result()
+                else:
+                    getter.cancel()
+            # Remonte une eventuelle exception de la boucle de polling
+            runner.result()
+        finally:
+            runner.cancel()
+            self._queue = None
+
+    def __aiter__(self) -> AsyncIterator[Tuple[WatchKey, Dict]]:
+        return self._iterate()
+
+    def get_metrics(self) -> Dict:
+        """
+        Cibles encore surveillees, requetes de statut envoyees et fins de build livrees
+        """
+        return dict(self.metrics, watching=len(self._watches))
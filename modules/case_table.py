@@ -0,0 +1,210 @@
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from .sketches import DurationStats
+
+# Codes entiers des statuts (stockes sur un octet)
+STATUSES = ("passed", "failed", "error", "skipped")
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+_OPTIONAL_FIELDS = ("failure_message", "failure_type", "error_message")
+
+# Les durees sont versees dans les esquisses par lots de cette taille pendant le parsing
+_FOLD_ROWS = 65536
+
+class TestCaseRecord(Mapping):
+    """
+    Vue en lecture seule sur une ligne de TestCaseTable
+
+    Se comporte comme le dictionnaire d'origine (record["status"], record.get(...),
+    comparaison avec un dict) sans materialiser de dictionnaire par cas de test.
+    """
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "TestCaseTable", index: int):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, key: str):
+        table, i = self._table, self._index
+        if key == "name":
+            return table.names[i]
+        if key == "classname":
+            return table.classnames[table.classname_ids[i]]
+        if key == "time":
+            return table.times[i]
+        if key == "status":
+            return STATUSES[table.statuses[i]]
+        if key == "failure_message" and i in table.failure_messages:
+            return table.failure_messages[i]
+        if key == "failure_type" and i in table.failure_type_ids:
+            return table.failure_types[table.failure_type_ids[i]]
+        if key == "error_message" and i in table.error_messages:
+            return table.error_messages[i]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        table, i = self._table, self._index
+        yield from ("name", "classname", "time", "status")
+        if i in table.failure_messages:
+            yield "failure_message"
+        if i in table.failure_type_ids:
+            yield "failure_type"
+        if i in table.error_messages:
+            yield "error_message"
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+class TestCaseTable:
+    """
+    Stockage colonne des cas de test analyses
+
+    Les statuts sont des codes sur un octet, les durees un tableau de flottants,
+    les classnames et types d'echec sont internes dans un dictionnaire. Les
+    messages, rares, sont stockes de maniere creuse par indice de ligne.
+    La table s'itere et s'indexe comme l'ancienne liste de dictionnaires.
+    """
+
+    def __init__(self, cases: Optional[Iterable[Mapping]] = None):
+        self.names: List[str] = []
+        self.classname_ids = array('I')
+        self.classnames: List[str] = []
+        self._classname_index: Dict[str, int] = {}
+        self.times = array('d')
+        self.statuses = array('B')
+        self.failure_messages: Dict[int, str] = {}
+        self.failure_type_ids: Dict[int, int] = {}
+        self.failure_types: List[str] = []
+        self._failure_type_index: Dict[str, int] = {}
+        self.error_messages: Dict[int, str] = {}
+        self._messages: Dict[str, str] = {}
+        # Percentiles et tests les plus lents (hors tests ignores), alimentes par lots
+        self._durations = DurationStats()
+        self._folded = 0
+        if cases is not None:
+            self.extend(cases)
+
+    def _intern_classname(self, classname: str) -> int:
+        cid = self._classname_index.get(classname)
+        if cid is None:
+            cid = self._classname_index[classname] = len(self.classnames)
+            self.classnames.append(classname)
+        return cid
+
+    def _intern_failure_type(self, failure_type: str) -> int:
+        tid = self._failure_type_index.get(failure_type)
+        if tid is None:
+            tid = self._failure_type_index[failure_type] = len(self.failure_types)
+            self.failure_types.append(failure_type)
+        return tid
+
+    def _intern_message(self, message: str) -> str:
+        # Les messages identiques (environnement casse...) partagent le meme objet
+        return self._messages.setdefault(message, message)
+
+    def add(self, name: str, classname: str, time: float, status: str,
+            failure_message: Optional[str] = None, failure_type: Optional[str] = None,
+            error_message: Optional[str] = None) -> None:
+        """
+        Ajoute un cas de test sans creer de dictionnaire intermediaire
+        """
+        row = len(self.names)
+        self.names.append(name)
+        self.classname_ids.append(self._intern_classname(classname))
+        self.times.append(time)
+        self.statuses.append(STATUS_CODES[status])
+        if failure_message is not None:
+            self.failure_messages[row] = self._intern_message(failure_message)
+        if failure_type is not None:
+            self.failure_type_ids[row] = self._intern_failure_type(failure_type)
+        if error_message is not None:
+            self.error_messages[row] = self._intern_message(error_message)
+        if row + 1 - self._folded >= _FOLD_ROWS:
+            self._fold()
+
+    def _fold(self) -> None:
+        """
+        Verse les lignes pas encore comptees dans les esquisses de duree
+        """
+        start, end = self._folded, len(self.names)
+        if start == end:
+            return
+        # Copies des tranches: une vue sur les tableaux en empecherait l'agrandissement
+        statuses = np.frombuffer(self.statuses[start:end], dtype=np.uint8)
+        rows = np.flatnonzero(statuses != STATUS_CODES["skipped"])
+        self._durations.add_batch(self.classnames, np.frombuffer(self.classname_ids[start:end], dtype=np.uint32)[rows],
+                                  np.frombuffer(self.times[start:end], dtype=np.float64)[rows], self.names, rows + start)
+        self._folded = end
+
+    @property
+    def durations(self) -> DurationStats:
+        """
+        Percentiles de duree par classname et tests les plus lents
+        """
+        self._fold()
+        return self._durations
+
+    def append(self, case: Mapping) -> None:
+        self.add(case.get("name", "Unknown"), case.get("classname", ""), float(case.get("time", 0)),
+                 case.get("status", "passed"), *(case.get(field) for field in _OPTIONAL_FIELDS))
+
+    def extend(self, cases: Iterable[Mapping]) -> None:
+        if not isinstance(cases, TestCaseTable):
+            for case in cases:
+                self.append(case)
+            return
+
+        self._fold()
+        offset = len(self.names)
+        class_map = array('I', (self._intern_classname(c) for c in cases.classnames))
+        type_map = [self._intern_failure_type(t) for t in cases.failure_types]
+        self.names.extend(cases.names)
+        self.classname_ids.extend(class_map[cid] for cid in cases.classname_ids)
+        self.times.extend(cases.times)
+        self.statuses.extend(cases.statuses)
+        for row, message in cases.failure_messages.items():
+            self.failure_messages[offset + row] = self._intern_message(message)
+        for row, tid in cases.failure_type_ids.items():
+            self.failure_type_ids[offset + row] = type_map[tid]
+        for row, message in cases.error_messages.items():
+            self.error_messages[offset + row] = self._intern_message(message)
+        self._durations.merge(cases.durations)
+        self._folded = len(self.names)
+
+    def status_counts(self) -> Dict[str, int]:
+        return {status: self.statuses.count(code) for status, code in STATUS_CODES.items()}
+
+    def to_list(self) -> List[Dict]:
+        """
+        Materialise la table en liste de dictionnaires (export JSON, compatibilite)
+        """
+        return [dict(record) for record in self]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, index: int) -> TestCaseRecord:
+        if index < 0:
+            index += len(self.names)
+        if not 0 <= index < len(self.names):
+            raise IndexError("test case index out of range")
+        return TestCaseRecord(self, index)
+
+    def __iter__(self) -> Iterator[TestCaseRecord]:
+        for index in range(len(self.names)):
+            yield TestCaseRecord(self, index)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (TestCaseTable, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TestCaseTable({len(self)} cases, {len(self.classnames)} classnames)"
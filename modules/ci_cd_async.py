@@ -0,0 +1,253 @@
+import asyncio
+import time
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .http_client import (DEFAULT_BACKOFF_FACTOR, DEFAULT_MAX_RETRIES, DEFAULT_POOL_SIZE, DEFAULT_TIMEOUT,
+                          IDEMPOTENT_METHODS, RETRY_STATUSES, ConnectorMetrics, backoff_delay)
+
+# Requetes simultanees par connecteur
+DEFAULT_CONCURRENCY = 50
+# Requetes par seconde et par hote (None: pas de limite, seule la concurrence borne le debit)
+DEFAULT_RATE_LIMIT = None
+
+class _TokenBucket:
+    """
+    Seau a jetons: `rate` requetes par seconde en regime etabli, rafales de `burst`
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        # Le verrou sert les demandeurs dans l'ordre d'arrivee
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+def create_session(pool_size: int = DEFAULT_POOL_SIZE, timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+                   **session_options) -> aiohttp.ClientSession:
+    """
+    Session aiohttp a partager entre plusieurs connecteurs asynchrones (un seul pool de connexions)
+
+    pool_size borne les connexions ouvertes par hote. A appeler depuis la boucle
+    d'evenements qui l'utilisera.
+    """
+    connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=0, limit_per_host=pool_size),
+        timeout=aiohttp.ClientTimeout(sock_connect=connect, sock_read=read),
+        **session_options
+    )
+
+class AsyncBaseConnector:
+    """
+    Equivalent asynchrone de BaseConnector (aiohttp)
+
+    Les requetes passent par une session partageable (voir create_session), sont
+    limitees a `concurrency` en vol et, si rate_limit est fixe, a `rate_limit` par
+    seconde et par hote (seau propre a chaque connecteur), et les appels
+    idempotents sont reessayes comme en synchrone (backoff avec jitter,
+    Retry-After). Memes compteurs que BaseConnector (get_metrics).
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, rate_limit: Optional[float] = DEFAULT_RATE_LIMIT,
+                 session: Optional[aiohttp.ClientSession] = None,
+                 timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT, pool_size: int = DEFAULT_POOL_SIZE,
+                 max_retries: int = DEFAULT_MAX_RETRIES, backoff_factor: float = DEFAULT_BACKOFF_FACTOR):
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.rate_limit = rate_limit
+        self._session = session
+        self._owns_session = session is None
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._buckets: Dict[str, _TokenBucket] = {}
+        self.metrics = ConnectorMetrics()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            self._session = create_session(self.pool_size, self.timeout)
+        return self._session
+
+    def _bucket(self, url: str) -> Optional[_TokenBucket]:
+        if not self.rate_limit:
+            return None
+        host = urlsplit(url).netloc
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = _TokenBucket(self.rate_limit)
+        return bucket
+
+    async def _request_json(self, method: str, url: str, **kwargs) -> Tuple[int, Optional[object]]:
+        """
+        Envoie une requete et renvoie (code HTTP, corps JSON ou None si le code n'est pas 2xx)
+        """
+        retry = method.upper() in IDEMPOTENT_METHODS
+        bucket = self._bucket(url)
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                if bucket is not None:
+                    await bucket.acquire()
+                try:
+                    async with self.session.request(method, url, **kwargs) as response:
+                        status = response.status
+                        retry_after = response.headers.get("Retry-After")
+                        data = await response.json(content_type=None) if 200 <= status < 300 else None
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    # Comme en synchrone, un POST n'est reessaye que si la connexion n'a pas abouti
+                    if attempt >= self.max_retries or not retry:
+                        self.metrics.record(time.perf_counter() - start, None, attempt)
+                        raise
+                    status, retry_after = None, None
+                except Exception:
+                    self.metrics.record(time.perf_counter() - start, None, attempt)
+                    raise
+
+            if status is not None and (status not in RETRY_STATUSES or not retry or attempt >= self.max_retries):
+                self.metrics.record(time.perf_counter() - start, status, attempt)
+                return status, data
+
+            attempt += 1
+            delay = backoff_delay(attempt, self.backoff_factor)
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            # Attente hors du semaphore: les autres requetes continuent pendant le backoff
+            await asyncio.sleep(delay)
+
+    def get_metrics(self) -> Dict:
+        """
+        Nombre de requetes, erreurs, reessais et latences en ms du connecteur
+        """
+        return self.metrics.snapshot()
+
+    def reset_metrics(self) -> None:
+        self.metrics.reset()
+
+    async def close(self) -> None:
+        # Une session fournie par l'appelant reste a sa charge
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+class AsyncJenkinsConnector(AsyncBaseConnector):
+    def __init__(self, base_url: str, username: str, api_token: str, **http_options):
+        """
+        Initialise la connexion asynchrone avec Jenkins
+
+        http_options (concurrency, rate_limit, session, timeout, pool_size,
+        max_retries, backoff_factor), voir AsyncBaseConnector
+        """
+        super().__init__(**http_options)
+        self.base_url = base_url.rstrip('/')
+        self.auth = aiohttp.BasicAuth(username, api_token)
+
+    async def get_build_status(self, job_name: str, build_number: int) -> Dict:
+        """
+        Recupere le statut d'un build Jenkins (meme resultat que JenkinsConnector.get_build_status)
+        """
+        url = f"{self.base_url}/job/{job_name}/{build_number}/api/json"
+
+        try:
+            status, data = await self._request_json("GET", url, auth=self.auth)
+            if status == 200:
+                return {
+                    "status": "success",
+                    "building": data.get('building', False),
+                    "result": data.get('result', 'UNKNOWN'),
+                    "duration": data.get('duration', 0)
+                }
+            else:
+                return {"status": "error", "message": f"Failed to get build status: {status}"}
+        except Exception as e:
+            return {"status": "error", "message": str(e) or type(e).__name__}
+
+    async def get_build_statuses(self, builds: Iterable[Tuple[str, int]]) -> List[Dict]:
+        """
+        Statuts de plusieurs builds (job_name, build_number) en parallele, dans l'ordre donne
+        """
+        return await asyncio.gather(*(self.get_build_status(job, number) for job, number in builds))
+
+class AsyncGitLabConnector(AsyncBaseConnector):
+    def __init__(self, base_url: str, private_token: str, **http_options):
+        """
+        Initialise la connexion asynchrone avec GitLab CI
+
+        http_options (concurrency, rate_limit, session, timeout, pool_size,
+        max_retries, backoff_factor), voir AsyncBaseConnector
+        """
+        super().__init__(**http_options)
+        self.base_url = base_url.rstrip('/')
+        self.headers = {"PRIVATE-TOKEN": private_token}
+
+    async def get_pipeline_status(self, project_id: str, pipeline_id: int) -> Dict:
+        """
+        Recupere le statut d'un pipeline GitLab CI (meme resultat que GitLabConnector.get_pipeline_status)
+        """
+        url = f"{self.base_url}/api/v4/projects/{project_id}/pipelines/{pipeline_id}"
+
+        try:
+            status, data = await self._request_json("GET", url, headers=self.headers)
+            if status == 200:
+                return {
+                    "status": "success",
+                    "pipeline_status": data.get('status'),
+                    "ref": data.get('ref'),
+                    "duration": data.get('duration')
+                }
+            else:
+                return {"status": "error", "message": f"Failed to get pipeline status: {status}"}
+        except Exception as e:
+            return {"status": "error", "message": str(e) or type(e).__name__}
+
+    async def get_pipeline_statuses(self, pipelines: Iterable[Tuple[str, int]]) -> List[Dict]:
+        """
+        Statuts de plusieurs pipelines (project_id, pipeline_id) en parallele, dans l'ordre donne
+        """
+        return await asyncio.gather(*(self.get_pipeline_status(project, pipeline) for project, pipeline in pipelines))
+
+async def fetch_statuses(jenkins: Optional[AsyncJenkinsConnector] = None, builds: Iterable[Tuple[str, int]] = (),
+                         gitlab: Optional[AsyncGitLabConnector] = None,
+                         pipelines: Iterable[Tuple[str, int]] = ()) -> Dict:
+    """
+    Interroge tous les builds Jenkins et pipelines GitLab en une seule vague
+
+    Toutes les requetes partent en meme temps (dans les limites de concurrence et
+    de debit de chaque connecteur): la duree totale est de l'ordre d'un aller-retour
+    tant que les limites ne sont pas atteintes.
+
+    Returns:
+        Dict: {"builds": {(job, numero): statut}, "pipelines": {(projet, pipeline): statut}}
+    """
+    builds = list(builds) if jenkins else []
+    pipelines = list(pipelines) if gitlab else []
+    build_statuses, pipeline_statuses = await asyncio.gather(
+        jenkins.get_build_statuses(builds) if builds else asyncio.sleep(0, []),
+        gitlab.get_pipeline_statuses(pipelines) if pipelines else asyncio.sleep(0, [])
+    )
+    return {
+        "builds": dict(zip(builds, build_statuses)),
+        "pipelines": dict(zip(pipelines, pipeline_statuses))
+    }
@@ -1,14 +1,184 @@
 import requests
+import hashlib
 import json
-from typing import Dict, Optional
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-class JenkinsConnector:
-    def __init__(self, base_url: str, username: str, api_token: str):
+from .analyzer import analyze_artifact_stream
+from .http_client import DEFAULT_DOWNLOAD_WORKERS, BaseConnector
+from .report_cache import DEFAULT_CACHE_DIR
+
+# Champs demandes pour l'historique des builds (le document /api/json complet peut peser plusieurs Mo)
+BUILD_HISTORY_FIELDS = ("number", "result", "duration", "timestamp", "building")
+DEFAULT_HISTORY_PAGE_SIZE = 500
+# Pagination GitLab: taille maximale d'une page et pages recuperees en parallele
+GITLAB_PER_PAGE = 100
+DEFAULT_PAGE_WORKERS = 8
+# Duree de validite (secondes) d'un statut de build ou pipeline encore en cours
+DEFAULT_STATUS_TTL = 15.0
+# Precision de last_access (eviction LRU): evite une ecriture a chaque lecture servie par le cache
+_ACCESS_RESOLUTION = 3600.0
+DEFAULT_STATUS_CACHE_ENTRIES = 100000
+GITLAB_TERMINAL_STATUSES = frozenset({"success", "failed", "canceled", "skipped"})
+
+class StatusCache:
+    """
+    Cache disque (SQLite) des reponses JSON de statut des serveurs CI
+
+    Un build ou pipeline termine ne change plus: sa reponse est conservee sans
+    limite de duree. Une reponse en cours est reutilisee pendant `ttl` secondes,
+    puis revalidee avec If-None-Match quand le serveur a fourni un ETag (une
+    reponse 304 ne retransfere pas le document). Les entrees les moins
+    recemment utilisees sont evincees au-dela de max_entries.
+
+    Les reponses sont rangees par identifiants du connecteur (cache_identity):
+    un cache partage entre connecteurs aux jetons differents ne sert jamais a
+    l'un la reponse obtenue par l'autre.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl: float = DEFAULT_STATUS_TTL,
+                 max_entries: int = DEFAULT_STATUS_CACHE_ENTRIES):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.ttl = ttl
+        self.max_entries = max_entries
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.db_path = os.path.join(self.cache_dir, "ci_statuses.sqlite")
+        # Partage entre les threads d'un connecteur (telechargements, pagination)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # Une entree perdue sur coupure de courant est simplement redemandee
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                credential TEXT NOT NULL,
+                url TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                etag TEXT,
+                terminal INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (credential, url)
+            );
+            CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+        """)
+        self._puts = 0
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0}
+
+    def fetch(self, connector: BaseConnector, url: str, is_terminal: Callable[[Dict], bool]) -> Tuple[int, Optional[Dict]]:
+        """
+        GET JSON via le cache
+
+        Returns:
+            Tuple[int, Optional[Dict]]: Code HTTP (200 pour une reponse servie par le
+            cache) et document JSON, ou None si le code n'est pas 200
+        """
+        now = time.time()
+        key = (connector.cache_identity, url)
+        with self._lock:
+            row = self.conn.execute("SELECT payload, etag, terminal, fetched_at, last_access FROM responses "
+                                    "WHERE credential = ? AND url = ?", key).fetchone()
+        if row is not None and (row[2] or now - row[3] < self.ttl):
+            if now - row[4] < _ACCESS_RESOLUTION:
+                with self._lock:
+                    self.stats["hits"] += 1
+            else:
+                self._touch(key, now, "hits")
+            return 200, json.loads(row[0])
+        
+        headers = {"If-None-Match": row[1]} if row is not None and row[1] else {}
+        response = connector._request("GET", url, headers=headers)
+        if response.status_code == 304 and row is not None:
+            self._touch(key, now, "revalidated", fetched_at=now)
+            return 200, json.loads(row[0])
+        if response.status_code != 200:
+            return response.status_code, None
+        
+        data = response.json()
+        self._put(key, data, response.headers.get("ETag"), is_terminal(data), now)
+        return 200, data
+
+    def _touch(self, key: Tuple[str, str], now: float, counter: str, fetched_at: Optional[float] = None) -> None:
+        with self._lock, self.conn:
+            self.stats[counter] += 1
+            if fetched_at is None:
+                self.conn.execute("UPDATE responses SET last_access = ? WHERE credential = ? AND url = ?", (now, *key))
+            else:
+                self.conn.execute("UPDATE responses SET last_access = ?, fetched_at = ? WHERE credential = ? AND url = ?",
+                                  (now, fetched_at, *key))
+
+    def _put(self, key: Tuple[str, str], data: Dict, etag: Optional[str], terminal: bool, now: float) -> None:
+        with self._lock:
+            self.stats["misses"] += 1
+            with self.conn:
+                self.conn.execute("INSERT OR REPLACE INTO responses "
+                                  "(credential, url, payload, etag, terminal, fetched_at, last_access) "
+                                  "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                  (*key, json.dumps(data), etag, int(terminal), now, now))
+            self._puts += 1
+            # Comptage de la table seulement de temps en temps
+            if self._puts % 1000 == 0:
+                self._evict()
+
+    def _evict(self) -> None:
+        excess = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+        if excess > 0:
+            with self.conn:
+                self.conn.execute("DELETE FROM responses WHERE rowid IN "
+                                  "(SELECT rowid FROM responses ORDER BY last_access LIMIT ?)", (excess,))
+
+    def get_stats(self) -> Dict:
+        """
+        Reponses servies par le cache (hits), revalidees par un 304, ou telechargees (misses)
+        """
+        with self._lock:
+            return dict(self.stats)
+
+    def clear(self) -> None:
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        self.conn.close()
+
+def _credential_id(*credentials: str) -> str:
+    """
+    Empreinte des identifiants d'un connecteur (cle du StatusCache, sans stocker le jeton)
+    """
+    return hashlib.sha256("\0".join(credentials).encode()).hexdigest()
+
+def _get_status_json(connector: BaseConnector, url: str, is_terminal: Callable[[Dict], bool]) -> Tuple[int, Optional[Dict]]:
+    if connector.cache is not None:
+        return connector.cache.fetch(connector, url, is_terminal)
+    response = connector._request("GET", url)
+    return response.status_code, response.json() if response.status_code == 200 else None
+
+def _jenkins_build_finished(data: Dict) -> bool:
+    return not data.get('building', False) and data.get('result') is not None
+
+def _gitlab_pipeline_finished(data: Dict) -> bool:
+    return data.get('status') in GITLAB_TERMINAL_STATUSES
+
+class JenkinsConnector(BaseConnector):
+    def __init__(self, base_url: str, username: str, api_token: str, cache: Optional[StatusCache] = None,
+                 **http_options):
         """
         Initialise la connexion avec Jenkins
+        
+        cache (StatusCache, optionnel) evite de redemander les statuts deja connus.
+        http_options (timeout, pool_size, max_retries, backoff_factor) configurent
+        la session partagee, voir BaseConnector
         """
+        super().__init__(**http_options)
+        self.cache = cache
         self.base_url = base_url.rstrip('/')
         self.auth = (username, api_token)
+        self.session.auth = self.auth
+        self.cache_identity = _credential_id("jenkins", username, api_token)
     
     def trigger_build(self, job_name: str, parameters: Optional[Dict] = None) -> Dict:
         """
@@ -17,7 +187,7 @@ class JenkinsConnector:
         url = f"{self.base_url}/job/{job_name}/buildWithParameters" if parameters else f"{self.base_url}/job/{job_name}/build"
         
         try:
-            response = requests.post(url, auth=self.auth, data=parameters or {})
+            response = self._request("POST", url, data=parameters or {})
             if response.status_code in [200, 201]:
                 return {"status": "success", "message": f"Build triggered for {job_name}"}
             else:
@@ -32,9 +202,8 @@ class JenkinsConnector:
         url = f"{self.base_url}/job/{job_name}/{build_number}/api/json"
         
         try:
-            response = requests.get(url, auth=self.auth)
-            if response.status_code == 200:
-                data = response.json()
+            status_code, data = _get_status_json(self, url, _jenkins_build_finished)
+            if status_code == 200:
                 return {
                     "status": "success",
                     "building": data.get('building', False),
@@ -42,34 +211,121 @@ class JenkinsConnector:
                     "duration": data.get('duration', 0)
                 }
             else:
-                return {"status": "error", "message": f"Failed to get build status: {response.status_code}"}
+                return {"status": "error", "message": f"Failed to get build status: {status_code}"}
         except Exception as e:
             return {"status": "error", "message": str(e)}
     
-    def download_artifact(self, job_name: str, build_number: int, artifact_path: str, output_path: str) -> Dict:
+    def analyze_artifact(self, job_name: str, build_number: int, artifact_path: str) -> Dict:
+        """
+        Analyse un artifact (rapport ou archive zip/tar.gz de rapports) directement
+        depuis la reponse HTTP, sans l'ecrire sur disque
+        
+        Returns:
+            Dict: status, et stats (voir analyze_artifact_stream) en cas de succes
+        """
+        url = f"{self.base_url}/job/{job_name}/{build_number}/artifact/{artifact_path}"
+        return _analyze_response(self, url, artifact_path)
+    
+    def iter_build_history(self, job_name: str, limit: Optional[int] = None, since_number: Optional[int] = None,
+                           page_size: int = DEFAULT_HISTORY_PAGE_SIZE) -> Iterator[Dict]:
+        """
+        Parcourt l'historique des builds d'un job, du plus recent au plus ancien
+        
+        Chaque requete ramene page_size builds avec seulement BUILD_HISTORY_FIELDS
+        (filtre tree=allBuilds[...]{debut,fin}); les pages sont demandees au fil de
+        l'iteration, la memoire ne depend donc pas de la longueur de l'historique.
+        
+        Args:
+            limit (int): Nombre maximal de builds
+            since_number (int): S'arrete au premier build de numero <= since_number (reprise incrementale)
+            page_size (int): Builds par requete
+        
+        Yields:
+            Dict: number, result (None si en cours), duration (ms), timestamp (ms epoch), building
+        
+        Raises:
+            requests.RequestException: Si une page ne peut pas etre recuperee
+        """
+        url = f"{self.base_url}/job/{job_name}/api/json"
+        fields = ",".join(BUILD_HISTORY_FIELDS)
+        start = 0
+        
+        while limit is None or start < limit:
+            end = start + page_size if limit is None else min(start + page_size, limit)
+            response = self._request("GET", url, params={"tree": f"allBuilds[{fields}]{{{start},{end}}}"})
+            response.raise_for_status()
+            builds = response.json().get("allBuilds") or []
+            
+            for build in builds:
+                if since_number is not None and build.get("number", 0) <= since_number:
+                    return
+                yield {field: build.get(field) for field in BUILD_HISTORY_FIELDS}
+            
+            if len(builds) < end - start:
+                return
+            start = end
+    
+    def download_artifact(self, job_name: str, build_number: int, artifact_path: str, output_path: str,
+                          **download_options) -> Dict:
         """
         Telecharge un artifact depuis Jenkins
+        
+        Le fichier est ecrit par blocs et reprend apres une coupure. download_options
+        (chunk_size, checksum, expected_size, max_resumes), voir BaseConnector._download
         """
         url = f"{self.base_url}/job/{job_name}/{build_number}/artifact/{artifact_path}"
         
         try:
-            response = requests.get(url, auth=self.auth)
-            if response.status_code == 200:
-                with open(output_path, 'wb') as f:
-                    f.write(response.content)
-                return {"status": "success", "message": f"Artifact downloaded to {output_path}"}
-            else:
-                return {"status": "error", "message": f"Failed to download artifact: {response.status_code}"}
+            return self._download(url, output_path, **download_options)
         except Exception as e:
             return {"status": "error", "message": str(e)}
+    
+    def download_artifacts(self, job_name: str, build_number: int, artifacts: Iterable[Tuple[str, str]],
+                           workers: int = DEFAULT_DOWNLOAD_WORKERS, **download_options) -> Dict:
+        """
+        Telecharge plusieurs artifacts (artifact_path, output_path) d'un build en parallele
+        """
+        downloads = [(f"{self.base_url}/job/{job_name}/{build_number}/artifact/{artifact_path}", output_path)
+                     for artifact_path, output_path in artifacts]
+        
+        try:
+            return self._download_many(downloads, workers, **download_options)
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
+def _analyze_response(connector: BaseConnector, url: str, name: Optional[str]) -> Dict:
+    """
+    Passe le corps de la reponse, decompresse a la volee, directement a l'analyseur
+    """
+    try:
+        with connector._request("GET", url, stream=True) as response:
+            if response.status_code != 200:
+                return {"status": "error", "message": f"Failed to download artifact: {response.status_code}"}
+            response.raw.decode_content = True
+            stats = analyze_artifact_stream(response.raw, name)
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+    
+    if "error" in stats:
+        return {"status": "error", "message": stats["error"]}
+    return {"status": "success", "stats": stats}
 
-class GitLabConnector:
-    def __init__(self, base_url: str, private_token: str):
+class GitLabConnector(BaseConnector):
+    def __init__(self, base_url: str, private_token: str, cache: Optional[StatusCache] = None,
+                 **http_options):
         """
         Initialise la connexion avec GitLab CI
+        
+        cache (StatusCache, optionnel) evite de redemander les statuts deja connus.
+        http_options (timeout, pool_size, max_retries, backoff_factor) configurent
+        la session partagee, voir BaseConnector
         """
+        super().__init__(**http_options)
+        self.cache = cache
         self.base_url = base_url.rstrip('/')
         self.headers = {"PRIVATE-TOKEN": private_token}
+        self.session.headers.update(self.headers)
+        self.cache_identity = _credential_id("gitlab", private_token)
     
     def trigger_pipeline(self, project_id: str, ref: str = "main", variables: Optional[Dict] = None) -> Dict:
         """
@@ -82,7 +338,7 @@ class GitLabConnector:
             payload["variables"] = [{'key': k, 'value': v} for k, v in variables.items()]
         
         try:
-            response = requests.post(url, headers=self.headers, json=payload)
+            response = self._request("POST", url, json=payload)
             if response.status_code == 201:
                 data = response.json()
                 return {"status": "success", "pipeline_id": data.get('id'), "web_url": data.get('web_url')}
@@ -98,9 +354,8 @@ class GitLabConnector:
         url = f"{self.base_url}/api/v4/projects/{project_id}/pipelines/{pipeline_id}"
         
         try:
-            response = requests.get(url, headers=self.headers)
-            if response.status_code == 200:
-                data = response.json()
+            status_code, data = _get_status_json(self, url, _gitlab_pipeline_finished)
+            if status_code == 200:
                 return {
                     "status": "success",
                     "pipeline_status": data.get('status'),
@@ -108,25 +363,139 @@ class GitLabConnector:
                     "duration": data.get('duration')
                 }
             else:
-                return {"status": "error", "message": f"Failed to get pipeline status: {response.status_code}"}
+                return {"status": "error", "message": f"Failed to get pipeline status: {status_code}"}
         except Exception as e:
             return {"status": "error", "message": str(e)}
     
     def get_jobs(self, project_id: str, pipeline_id: int) -> Dict:
         """
-        Recupere la liste des jobs d'un pipeline
+        Recupere la liste complete des jobs d'un pipeline (toutes les pages, voir iter_jobs)
+        """
+        try:
+            jobs = [{"id": j["id"], "name": j["name"], "status": j["status"]}
+                    for j in self.iter_jobs(project_id, pipeline_id, include_bridges=False,
+                                            include_child_pipelines=False)]
+            return {"status": "success", "jobs": jobs}
+        except requests.HTTPError as e:
+            return {"status": "error", "message": f"Failed to get jobs: {e.response.status_code}"}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+    
+    def iter_jobs(self, project_id: str, pipeline_id: int, include_bridges: bool = True,
+                  include_child_pipelines: bool = True, per_page: int = GITLAB_PER_PAGE,
+                  workers: int = DEFAULT_PAGE_WORKERS) -> Iterator[Dict]:
         """
-        url = f"{self.base_url}/api/v4/projects/{project_id}/pipelines/{pipeline_id}/jobs"
+        Parcourt tous les jobs d'un pipeline, page par page
+        
+        La premiere page donne X-Total-Pages: les pages suivantes sont alors demandees
+        en parallele (sinon X-Next-Page est suivi page a page). Les jobs de
+        declenchement (bridges) et les pipelines enfants qu'ils lancent sont listes
+        en meme temps, si bien qu'un listing complet coute environ un aller-retour
+        par niveau de pipeline plus un pour les pages restantes.
+        
+        Yields:
+            Dict: id, name, status, stage, kind ("job" ou "bridge"), project_id, pipeline_id
         
+        Raises:
+            requests.RequestException: Si une page ne peut pas etre recuperee
+        """
+        pool = ThreadPoolExecutor(max_workers=workers)
         try:
-            response = requests.get(url, headers=self.headers)
-            if response.status_code == 200:
-                jobs = response.json()
-                return {
-                    "status": "success",
-                    "jobs": [{"id": j.get('id'), "name": j.get('name'), "status": j.get('status')} for j in jobs]
-                }
-            else:
-                return {"status": "error", "message": f"Failed to get jobs: {response.status_code}"}
+            yield from self._start_pipeline_jobs(pool, project_id, pipeline_id, include_bridges,
+                                                 include_child_pipelines, per_page)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _get_page(self, url: str, page: int, per_page: int) -> requests.Response:
+        response = self._request("GET", url, params={"per_page": per_page, "page": page})
+        response.raise_for_status()
+        return response
+    
+    def _iter_pages(self, pool: ThreadPoolExecutor, url: str, first: Future, per_page: int) -> Iterator[Dict]:
+        response = first.result()
+        yield from response.json()
+        
+        total_pages = response.headers.get("X-Total-Pages")
+        if total_pages and total_pages.isdigit():
+            pages = [pool.submit(self._get_page, url, page, per_page) for page in range(2, int(total_pages) + 1)]
+            for page in pages:
+                yield from page.result().json()
+        else:
+            # GitLab omet X-Total-Pages au-dela de 10 000 elements
+            next_page = response.headers.get("X-Next-Page")
+            while next_page:
+                response = self._get_page(url, int(next_page), per_page)
+                yield from response.json()
+                next_page = response.headers.get("X-Next-Page")
+    
+    def _start_pipeline_jobs(self, pool: ThreadPoolExecutor, project_id: str, pipeline_id: int,
+                             include_bridges: bool, include_child_pipelines: bool,
+                             per_page: int) -> Iterator[Dict]:
+        """
+        Lance immediatement les premieres requetes du pipeline et renvoie l'iterateur de ses jobs
+        """
+        url = f"{self.base_url}/api/v4/projects/{project_id}/pipelines/{pipeline_id}"
+        jobs_first = pool.submit(self._get_page, f"{url}/jobs", 1, per_page)
+        bridges_first = (pool.submit(self._get_page, f"{url}/bridges", 1, per_page)
+                         if include_bridges or include_child_pipelines else None)
+        
+        def summarize(job: Dict, kind: str) -> Dict:
+            return {"id": job.get('id'), "name": job.get('name'), "status": job.get('status'),
+                    "stage": job.get('stage'), "kind": kind, "project_id": project_id, "pipeline_id": pipeline_id}
+        
+        def iterate() -> Iterator[Dict]:
+            bridges: List[Dict] = list(self._iter_pages(pool, f"{url}/bridges", bridges_first, per_page)) if bridges_first else []
+            # Les pipelines enfants demarrent avant de parcourir les jobs du parent
+            children = [self._start_pipeline_jobs(pool, bridge["downstream_pipeline"]["project_id"],
+                                                  bridge["downstream_pipeline"]["id"], include_bridges,
+                                                  include_child_pipelines, per_page)
+                        for bridge in bridges if include_child_pipelines and bridge.get("downstream_pipeline")]
+            
+            for job in self._iter_pages(pool, f"{url}/jobs", jobs_first, per_page):
+                yield summarize(job, "job")
+            if include_bridges:
+                for bridge in bridges:
+                    yield summarize(bridge, "bridge")
+            for child in children:
+                yield from child
+        
+        return iterate()
+    
+    def _job_artifact_url(self, project_id: str, job_id: int, artifact_path: Optional[str] = None) -> str:
+        url = f"{self.base_url}/api/v4/projects/{project_id}/jobs/{job_id}/artifacts"
+        return f"{url}/{artifact_path}" if artifact_path else url
+    
+    def download_job_artifact(self, project_id: str, job_id: int, output_path: str,
+                              artifact_path: Optional[str] = None, **download_options) -> Dict:
+        """
+        Telecharge l'archive des artifacts d'un job (ou un seul fichier si artifact_path est donne)
+        
+        Memes options que JenkinsConnector.download_artifact
+        """
+        try:
+            return self._download(self._job_artifact_url(project_id, job_id, artifact_path), output_path,
+                                  **download_options)
         except Exception as e:
             return {"status": "error", "message": str(e)}
+    
+    def download_job_artifacts(self, project_id: str, downloads: Iterable[Tuple[int, str]],
+                               workers: int = DEFAULT_DOWNLOAD_WORKERS, **download_options) -> Dict:
+        """
+        Telecharge en parallele l'archive des artifacts de plusieurs jobs (job_id, output_path)
+        """
+        urls = [(self._job_artifact_url(project_id, job_id), output_path) for job_id, output_path in downloads]
+        
+        try:
+            return self._download_many(urls, workers, **download_options)
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+    
+    def analyze_job_artifacts(self, project_id: str, job_id: int, artifact_path: Optional[str] = None) -> Dict:
+        """
+        Analyse les artifacts d'un job (archive zip complete, ou un seul fichier)
+        directement depuis la reponse HTTP, sans fichier temporaire
+        
+        Returns:
+            Dict: status, et stats (voir analyze_artifact_stream) en cas de succes
+        """
+        return _analyze_response(self, self._job_artifact_url(project_id, job_id, artifact_path), artifact_path)
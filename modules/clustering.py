@@ -0,0 +1,179 @@
+import hashlib
+import re
+from typing import Dict, Iterable, Iterator, List, Mapping, Tuple
+
+import numpy as np
+
+from .case_table import STATUS_CODES, TestCaseTable
+
+# Masques combines en une seule expression: les alternatives les plus specifiques d'abord
+_MASK = re.compile(
+    r'(?P<UUID>[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})'
+    r'|(?P<URL>\b[a-z][a-z0-9+.-]*://\S+)'
+    r'|(?P<PATH>(?:[A-Za-z]:)?(?:[\\/][\w.@-]+){2,}[\\/]?)'
+    r'|(?P<HEX>\b0x[0-9a-fA-F]+\b|\b(?=[0-9a-fA-F]*\d)[0-9a-fA-F]{8,}\b)'
+    r'|(?P<N>\d+(?:[.,]\d+)*)'
+)
+_WHITESPACE = re.compile(r'\s+')
+_TOKEN = re.compile(r'<\w+>|\w+|[^\w\s]')
+
+_MAX_MESSAGE_LENGTH = 500
+_MAX_EXAMPLES = 3
+_MINHASH_SIZE = 64
+_BAND_ROWS = 4
+_BUCKET_COMPARISONS = 64
+
+def normalize_message(message: str) -> str:
+    """
+    Masque les nombres, identifiants, chemins et URLs d'un message d'echec
+    """
+    normalized = _MASK.sub(lambda m: f"<{m.lastgroup}>", message[:_MAX_MESSAGE_LENGTH])
+    return _WHITESPACE.sub(' ', normalized).strip()
+
+def failure_signature(failure_type: str, normalized: str) -> str:
+    return hashlib.blake2b(f"{failure_type}\x00{normalized}".encode('utf-8'), digest_size=8).hexdigest()
+
+def _minhashes(messages: List[str]) -> np.ndarray:
+    """
+    Signatures MinHash (unigrammes et bigrammes de tokens) de chaque message,
+    calculees en une seule passe NumPy sur l'ensemble des features
+    """
+    feature_hashes = {}
+    hashes, counts = [], []
+    for message in messages:
+        tokens = _TOKEN.findall(message)
+        features = set(tokens + [a + ' ' + b for a, b in zip(tokens, tokens[1:])])
+        for feature in features:
+            h = feature_hashes.get(feature)
+            if h is None:
+                h = feature_hashes[feature] = int.from_bytes(
+                    hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+            hashes.append(h)
+        counts.append(len(features))
+
+    signatures = np.full((len(messages), _MINHASH_SIZE), np.iinfo(np.uint64).max, dtype=np.uint64)
+    counts = np.array(counts)
+    present = np.flatnonzero(counts)
+    if len(present) == 0:
+        return signatures
+
+    # Famille de hachage multiply-shift: une "permutation" par colonne
+    rng = np.random.default_rng(0x5EED)
+    seeds = rng.integers(0, 2**63, size=_MINHASH_SIZE, dtype=np.uint64)
+    multipliers = rng.integers(0, 2**63, size=_MINHASH_SIZE, dtype=np.uint64) | np.uint64(1)
+    permuted = (np.array(hashes, dtype=np.uint64)[:, None] ^ seeds) * multipliers
+
+    # Les features sont contigues par message: minimum par segment
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[present]
+    signatures[present] = np.minimum.reduceat(permuted, starts, axis=0)
+    return signatures
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+def _iter_failures(test_cases: Iterable[Mapping]) -> Iterator[Tuple[str, str, str, str]]:
+    """
+    Retourne (type d'echec, message, classname, nom) de chaque cas en echec ou en erreur
+
+    Sur une TestCaseTable, seules les lignes en echec sont lues, directement
+    dans les colonnes (pas de vue TestCaseRecord par cas de test).
+    """
+    if isinstance(test_cases, TestCaseTable):
+        table = test_cases
+        statuses = np.frombuffer(table.statuses, dtype=np.uint8)
+        rows = np.flatnonzero((statuses == STATUS_CODES["failed"]) | (statuses == STATUS_CODES["error"]))
+        # La vue sur le tableau bloquerait son agrandissement: liberee avant de rendre la main
+        del statuses
+        failed = STATUS_CODES["failed"]
+        for row in rows.tolist():
+            if table.statuses[row] == failed:
+                tid = table.failure_type_ids.get(row)
+                failure_type = (table.failure_types[tid] if tid is not None else None) or "failure"
+                message = table.failure_messages.get(row, "")
+            else:
+                failure_type = "error"
+                message = table.error_messages.get(row, "")
+            yield failure_type, message, table.classnames[table.classname_ids[row]], table.names[row]
+        return
+
+    for case in test_cases:
+        status = case["status"]
+        if status == "failed":
+            yield case.get("failure_type") or "failure", case.get("failure_message", ""), case["classname"], case["name"]
+        elif status == "error":
+            yield "error", case.get("error_message", ""), case["classname"], case["name"]
+
+def cluster_failures(test_cases: Iterable[Mapping], similarity: float = 0.7) -> List[Dict]:
+    """
+    Regroupe les echecs par cause probable
+
+    Chaque message (failure_message ou error_message) est normalise puis hache en
+    signature exacte. Les signatures distinctes dont les messages sont proches
+    (similarite de Jaccard estimee par MinHash >= similarity, meme type d'echec)
+    sont ensuite fusionnees; les candidats sont trouves par bandes LSH, ce qui
+    garde un cout lineaire en nombre d'echecs.
+
+    Args:
+        test_cases: Cas de test (TestCaseTable ou liste de dictionnaires)
+        similarity (float): Similarite minimale pour fusionner deux messages (1.0 desactive)
+
+    Returns:
+        List[Dict]: Clusters tries par nombre d'echecs decroissant
+    """
+    normalized_cache = {}
+    groups = {}
+    for failure_type, message, classname, name in _iter_failures(test_cases):
+        normalized = normalized_cache.get(message)
+        if normalized is None:
+            normalized = normalized_cache[message] = normalize_message(message)
+        signature = failure_signature(failure_type, normalized)
+
+        group = groups.get(signature)
+        if group is None:
+            group = groups[signature] = {"signature": signature, "failure_type": failure_type,
+                                         "message": normalized, "count": 0, "examples": []}
+        group["count"] += 1
+        if len(group["examples"]) < _MAX_EXAMPLES:
+            test = f"{classname}.{name}" if classname else name
+            group["examples"].append({"test": test, "message": message})
+
+    signatures = list(groups.values())
+    parent = list(range(len(signatures)))
+    if len(signatures) > 1 and similarity < 1.0:
+        minhashes = _minhashes([g["message"] for g in signatures])
+        buckets = {}
+        for band in range(_MINHASH_SIZE // _BAND_ROWS):
+            columns = minhashes[:, band * _BAND_ROWS:(band + 1) * _BAND_ROWS]
+            for index, key in enumerate(map(bytes, columns)):
+                buckets.setdefault((band, key, signatures[index]["failure_type"]), []).append(index)
+
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            anchors = members[:_BUCKET_COMPARISONS]
+            for index in members[1:]:
+                for anchor in anchors:
+                    if anchor == index:
+                        break
+                    if np.count_nonzero(minhashes[anchor] == minhashes[index]) >= similarity * _MINHASH_SIZE:
+                        ra, rb = _find(parent, anchor), _find(parent, index)
+                        if ra != rb:
+                            parent[rb] = ra
+                        break
+
+    clusters = {}
+    for index, group in enumerate(signatures):
+        root = _find(parent, index)
+        cluster = clusters.get(root)
+        if cluster is None:
+            cluster = clusters[root] = dict(group, examples=list(group["examples"]), variants=1)
+        else:
+            cluster["count"] += group["count"]
+            cluster["variants"] += 1
+            if len(cluster["examples"]) < _MAX_EXAMPLES:
+                cluster["examples"].extend(group["examples"][:_MAX_EXAMPLES - len(cluster["examples"])])
+
+    return sorted(clusters.values(), key=lambda c: (-c["count"], c["signature"]))
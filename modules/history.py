@@ -0,0 +1,310 @@
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .case_table import STATUS_CODES, TestCaseTable
+
+DEFAULT_HISTORY_DB = os.path.expanduser(os.getenv("AGENT_QA_HISTORY_DB", "~/.local/share/agent-mcp-qa/history.sqlite"))
+
+_PASS, _FAIL = 0, 1
+_FAILED_STATUSES = ("failed", "error")
+
+# Executions de reference par defaut des requetes de duree (duration_regressions, mean_durations)
+DEFAULT_DURATION_WINDOW = 20
+# Executions dont les durees sont conservees: la fenetre par defaut et l'execution evaluee
+DEFAULT_DURATION_RUNS = DEFAULT_DURATION_WINDOW + 1
+
+def case_key(case) -> str:
+    """
+    Identifiant stable d'un cas de test: classname.name
+    """
+    return f"{case['classname']}.{case['name']}" if case["classname"] else case["name"]
+
+def _run_results(test_cases: Iterable[Mapping]) -> Tuple[Dict[str, int], Dict[str, float]]:
+    """
+    Statut (pass/fail) et duree cumulee de chaque test d'une execution, tests ignores exclus
+
+    Un test present plusieurs fois dans l'execution est en echec si une occurrence echoue.
+    """
+    outcomes, durations = {}, {}
+    if isinstance(test_cases, TestCaseTable):
+        # Lecture directe des colonnes (pas de vue TestCaseRecord par cas), comme durations_from_stats
+        prefixes = [f"{classname}." if classname else "" for classname in test_cases.classnames]
+        skipped = STATUS_CODES["skipped"]
+        failed_codes = {STATUS_CODES[status] for status in _FAILED_STATUSES}
+        for name, classname_id, duration, status in zip(test_cases.names, test_cases.classname_ids,
+                                                        test_cases.times, test_cases.statuses):
+            if status == skipped:
+                continue
+            key = prefixes[classname_id] + name
+            failed = _FAIL if status in failed_codes else _PASS
+            outcomes[key] = max(outcomes.get(key, _PASS), failed)
+            durations[key] = durations.get(key, 0.0) + duration
+        return outcomes, durations
+
+    for case in test_cases:
+        if case["status"] == "skipped":
+            continue
+        key = case_key(case)
+        failed = _FAIL if case["status"] in _FAILED_STATUSES else _PASS
+        outcomes[key] = max(outcomes.get(key, _PASS), failed)
+        durations[key] = durations.get(key, 0.0) + case["time"]
+    return outcomes, durations
+
+def _scatter_durations(test_ids: bytes, durations: bytes, size: int) -> np.ndarray:
+    """
+    Durees d'une execution en tableau dense indexe par identifiant de test (NaN pour les tests absents)
+    """
+    dense = np.full(size, np.nan)
+    ids = np.frombuffer(test_ids, dtype=np.uint32)
+    times = np.frombuffer(durations, dtype=np.float32)
+    kept = ids < size
+    dense[ids[kept]] = times[kept]
+    return dense
+
+class RunHistory:
+    """
+    Historique local des executions et index incremental de flakiness
+
+    Chaque appel a append_run met a jour, pour chaque test de l'execution, son
+    dernier statut, son nombre de transitions pass/fail et sa serie d'echecs
+    consecutifs. La mise a jour coute O(cas de l'execution) sans relire
+    l'historique, et les requetes s'appuient sur des colonnes indexees.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, duration_runs: int = DEFAULT_DURATION_RUNS):
+        """
+        Args:
+            db_path (str, optional): Base SQLite (par defaut AGENT_QA_HISTORY_DB)
+            duration_runs (int): Nombre d'executions recentes dont les durees sont
+                conservees; doit couvrir la plus grande fenetre utilisee + 1
+        """
+        self.db_path = db_path or DEFAULT_HISTORY_DB
+        self.duration_runs = duration_runs
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at REAL NOT NULL,
+                source TEXT,
+                total_tests INTEGER,
+                failures INTEGER,
+                errors INTEGER,
+                skipped INTEGER,
+                time REAL,
+                success_rate REAL
+            );
+            CREATE TABLE IF NOT EXISTS tests (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                test_key TEXT NOT NULL UNIQUE,
+                runs INTEGER NOT NULL,
+                failures INTEGER NOT NULL,
+                transitions INTEGER NOT NULL,
+                flakiness REAL NOT NULL,
+                last_status INTEGER NOT NULL,
+                consecutive_failures INTEGER NOT NULL,
+                last_run_id INTEGER NOT NULL,
+                last_passed_run_id INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS tests_flakiness ON tests (flakiness);
+            CREATE INDEX IF NOT EXISTS tests_failing ON tests (last_run_id, consecutive_failures);
+            CREATE TABLE IF NOT EXISTS run_durations (
+                run_id INTEGER PRIMARY KEY,
+                test_ids BLOB NOT NULL,
+                durations BLOB NOT NULL
+            );
+        """)
+
+    def append_run(self, stats: Dict, source: Optional[str] = None) -> int:
+        """
+        Enregistre une execution (resultat de analyze_report) et met a jour l'index
+
+        Args:
+            stats (Dict): Statistiques avec stats["test_cases"]
+            source (str, optional): Origine de l'execution (chemin, job CI...)
+
+        Returns:
+            int: Identifiant de l'execution enregistree
+        """
+        outcomes, durations = _run_results(stats.get("test_cases", []))
+
+        with self.conn:
+            run_id = self.conn.execute(
+                "INSERT INTO runs (created_at, source, total_tests, failures, errors, skipped, time, success_rate) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (time.time(), source, stats.get("total_tests", 0), stats.get("failures", 0), stats.get("errors", 0),
+                 stats.get("skipped", 0), stats.get("time", 0), stats.get("success_rate", 0))).lastrowid
+
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS run_results "
+                              "(test_key TEXT, status INTEGER, duration REAL)")
+            self.conn.execute("DELETE FROM run_results")
+            self.conn.executemany("INSERT INTO run_results VALUES (?, ?, ?)",
+                                  zip(outcomes, outcomes.values(), durations.values()))
+
+            # Tests inconnus: ligne vierge (statut courant comme dernier statut), mise a jour ci-dessous
+            self.conn.execute(
+                "INSERT INTO tests (test_key, runs, failures, transitions, flakiness, last_status, "
+                "consecutive_failures, last_run_id, last_passed_run_id) "
+                "SELECT c.test_key, 0, 0, 0, 0.0, c.status, 0, 0, NULL FROM run_results c "
+                "WHERE NOT EXISTS (SELECT 1 FROM tests t WHERE t.test_key = c.test_key)")
+
+            # Une mise a jour ensembliste par statut: les expressions lisent les valeurs avant mise a jour
+            self.conn.executemany(
+                "UPDATE tests SET runs = runs + 1, failures = failures + :status, "
+                "transitions = transitions + (last_status != :status), "
+                "flakiness = CASE WHEN runs > 0 THEN (transitions + (last_status != :status)) * 1.0 / runs "
+                "ELSE 0.0 END, "
+                f"last_status = :status, consecutive_failures = CASE WHEN :status = {_FAIL} "
+                "THEN consecutive_failures + 1 ELSE 0 END, last_run_id = :run_id, "
+                f"last_passed_run_id = CASE WHEN :status = {_PASS} THEN :run_id ELSE last_passed_run_id END "
+                "WHERE test_key IN (SELECT test_key FROM run_results WHERE status = :status)",
+                [{"status": _PASS, "run_id": run_id}, {"status": _FAIL, "run_id": run_id}])
+
+            # Durees de l'execution en paires creuses (identifiant de test, duree): la
+            # taille suit les tests de l'execution, pas le plus grand identifiant connu
+            rows = np.array(self.conn.execute(
+                "SELECT t.id, c.duration FROM run_results c JOIN tests t ON t.test_key = c.test_key").fetchall(),
+                dtype=np.float64).reshape(-1, 2)
+            ids, times = rows[:, 0], rows[:, 1]
+            self.conn.execute("INSERT INTO run_durations (run_id, durations, test_ids) VALUES (?, ?, ?)",
+                              (run_id, times.astype(np.float32).tobytes(), ids.astype(np.uint32).tobytes()))
+            self.conn.execute("DELETE FROM run_durations WHERE run_id NOT IN "
+                              "(SELECT run_id FROM run_durations ORDER BY run_id DESC LIMIT ?)", (self.duration_runs,))
+            self.conn.execute("DELETE FROM run_results")
+
+        return run_id
+
+    def latest_run_id(self) -> Optional[int]:
+        return self.conn.execute("SELECT MAX(id) FROM runs").fetchone()[0]
+
+    def _test_id_bound(self) -> int:
+        return (self.conn.execute("SELECT MAX(id) FROM tests").fetchone()[0] or 0) + 1
+
+    def _query(self, where: str, params: tuple, order: str, limit: int) -> List[Dict]:
+        cursor = self.conn.execute(
+            "SELECT test_key, runs, failures, transitions, flakiness, consecutive_failures, last_run_id, "
+            f"last_passed_run_id FROM tests WHERE {where} ORDER BY {order} LIMIT ?", params + (limit,))
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def flaky_tests(self, min_score: float = 0.1, min_runs: int = 5, limit: int = 50) -> List[Dict]:
+        """
+        Tests dont le statut alterne souvent (transitions / (executions - 1))
+        """
+        return self._query("flakiness >= ? AND runs >= ?", (min_score, min_runs), "flakiness DESC", limit)
+
+    def newly_failing(self, max_streak: int = 1, limit: int = 100) -> List[Dict]:
+        """
+        Tests en echec dans la derniere execution qui passaient encore recemment,
+        les plus stables (flakiness la plus faible) en premier
+        """
+        run_id = self.latest_run_id()
+        return self._query("last_run_id = ? AND consecutive_failures BETWEEN 1 AND ? AND last_passed_run_id IS NOT NULL",
+                           (run_id, max_streak), "flakiness, test_key", limit)
+
+    def chronically_failing(self, min_streak: int = 5, limit: int = 100) -> List[Dict]:
+        """
+        Tests en echec dans la derniere execution depuis au moins min_streak executions
+        """
+        run_id = self.latest_run_id()
+        return self._query("last_run_id = ? AND consecutive_failures >= ?", (run_id, min_streak),
+                           "consecutive_failures DESC", limit)
+
+    def duration_regressions(self, run_id: Optional[int] = None, window: int = DEFAULT_DURATION_WINDOW,
+                             min_runs: int = 5, z_threshold: float = 4.0, min_ratio: float = 1.5, min_delta: float = 0.5,
+                             limit: int = 100) -> List[Dict]:
+        """
+        Detecte les tests dont la duree sort nettement de leur distribution historique
+
+        Les durees de chaque execution sont reparties dans un tableau dense aligne
+        sur l'identifiant des tests: moyenne et ecart-type des `window` executions
+        precedentes sont calcules colonne par colonne avec NumPy, sans boucle
+        Python par test. Seules les duration_runs dernieres executions sont conservees.
+
+        Args:
+            run_id (int, optional): Execution a evaluer (par defaut la derniere)
+            window (int): Nombre d'executions precedentes servant de reference
+            min_runs (int): Nombre minimal d'observations historiques par test
+            z_threshold (float): Ecart minimal en nombre d'ecarts-types
+            min_ratio (float): Rapport minimal duree actuelle / moyenne historique
+            min_delta (float): Ecart minimal en secondes
+            limit (int): Nombre maximal de regressions retournees
+
+        Returns:
+            List[Dict]: Regressions triees par ecart decroissant
+        """
+        run_id = run_id or self.latest_run_id()
+        row = self.conn.execute("SELECT test_ids, durations FROM run_durations WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            return []
+        size = self._test_id_bound()
+        current = _scatter_durations(row[0], row[1], size)
+
+        total = np.zeros(size)
+        total_sq = np.zeros(size)
+        count = np.zeros(size)
+        for test_ids, blob in self.conn.execute(
+                "SELECT test_ids, durations FROM run_durations WHERE run_id < ? ORDER BY run_id DESC LIMIT ?",
+                (run_id, window)):
+            previous = _scatter_durations(test_ids, blob, size)
+            valid = ~np.isnan(previous)
+            values = np.where(valid, previous, 0.0)
+            total += values
+            total_sq += values * values
+            count += valid
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = total / count
+            std = np.sqrt(np.maximum(total_sq / count - mean * mean, 0.0))
+        # Plancher sur l'ecart-type: evite qu'un test parfaitement stable declenche sur du bruit
+        std = np.maximum(std, 0.1 * mean)
+        delta = current - mean
+
+        with np.errstate(invalid='ignore'):
+            flagged = ((count >= min_runs) & (delta >= min_delta) & (current >= mean * min_ratio)
+                       & (delta >= z_threshold * std))
+        test_ids = np.flatnonzero(flagged)
+        if len(test_ids) == 0:
+            return []
+        test_ids = test_ids[np.argsort(-delta[test_ids], kind='stable')][:limit]
+
+        placeholders = ",".join("?" * len(test_ids))
+        keys = dict(self.conn.execute(f"SELECT id, test_key FROM tests WHERE id IN ({placeholders})",
+                                      [int(i) for i in test_ids]))
+        return [{
+            "test_key": keys[int(i)],
+            "time": float(current[i]),
+            "mean": float(mean[i]),
+            "std": float(std[i]),
+            "runs": int(count[i]),
+            "ratio": float(current[i] / mean[i]) if mean[i] > 0 else float('inf')
+        } for i in test_ids]
+
+    def mean_durations(self, window: int = DEFAULT_DURATION_WINDOW) -> Dict[str, float]:
+        """
+        Duree moyenne par test sur les `window` dernieres executions (planification des shards)
+        """
+        size = self._test_id_bound()
+        total, count = np.zeros(size), np.zeros(size)
+        for test_ids, blob in self.conn.execute(
+                "SELECT test_ids, durations FROM run_durations ORDER BY run_id DESC LIMIT ?", (window,)):
+            durations = _scatter_durations(test_ids, blob, size)
+            valid = ~np.isnan(durations)
+            total += np.where(valid, durations, 0.0)
+            count += valid
+        if not count.any():
+            return {}
+
+        means = {}
+        for test_id, key in self.conn.execute("SELECT id, test_key FROM tests WHERE id < ?", (len(total),)):
+            if count[test_id]:
+                means[key] = float(total[test_id] / count[test_id])
+        return means
+
+    def close(self) -> None:
+        self.conn.close()
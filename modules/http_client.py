@@ -0,0 +1,271 @@
+import hashlib
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .sketches import QuantileSketch
+
+# (connexion, lecture) en secondes
+DEFAULT_TIMEOUT = (5, 30)
+DEFAULT_POOL_SIZE = 20
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+# Telechargements: taille des blocs ecrits, reprises (Range) apres coupure, telechargements simultanes
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_MAX_RESUMES = 5
+DEFAULT_DOWNLOAD_WORKERS = 4
+
+# Reponses reessayees pour les methodes idempotentes (surcharge ou redemarrage du serveur)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+class _JitterRetry(Retry):
+    """
+    Backoff exponentiel avec jitter complet: attente tiree dans [0, backoff]
+    pour eviter que des clients en echec simultane ne reessaient en rafale
+    """
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        return random.uniform(0, backoff) if backoff > 0 else 0
+
+class ConnectorMetrics:
+    """
+    Compteurs d'un connecteur: requetes, erreurs (exceptions et statuts >= 400),
+    reessais et latences en ms (partages entre threads)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def record(self, elapsed: float, status_code: Optional[int], retries: int = 0) -> None:
+        with self._lock:
+            self._latency.add(elapsed)
+            self._counters["requests"] += 1
+            self._counters["retries"] += retries
+            if status_code is None or status_code >= 400:
+                self._counters["errors"] += 1
+            key = str(status_code) if status_code is not None else "exception"
+            self._status_codes[key] = self._status_codes.get(key, 0) + 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            latency = self._latency
+            metrics = dict(self._counters, status_codes=dict(self._status_codes))
+            if latency.count:
+                metrics.update({
+                    "error_rate": self._counters["errors"] / self._counters["requests"],
+                    "mean_ms": latency.sum_ns / latency.count / 1e6,
+                    "p50_ms": latency.quantile(0.50) * 1000,
+                    "p95_ms": latency.quantile(0.95) * 1000,
+                    "max_ms": latency.max * 1000
+                })
+            return metrics
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters = {"requests": 0, "errors": 0, "retries": 0}
+            self._status_codes: Dict[str, int] = {}
+            self._latency = QuantileSketch()
+
+def backoff_delay(attempt: int, backoff_factor: float = DEFAULT_BACKOFF_FACTOR) -> float:
+    """
+    Attente avant le reessai numero `attempt` (1, 2, ...): backoff exponentiel avec jitter complet
+    """
+    return random.uniform(0, backoff_factor * (2 ** (attempt - 1)))
+
+class BaseConnector:
+    """
+    Session HTTP partagee par toutes les methodes d'un connecteur
+
+    La session garde les connexions ouvertes (keep-alive) dans un pool, applique
+    des timeouts de connexion et de lecture, et reessaie les appels idempotents
+    (backoff exponentiel avec jitter, respect de Retry-After). Un POST n'est
+    reessaye que si la connexion n'a pas pu etre etablie. Les latences, erreurs
+    et reessais sont comptes par connecteur (voir get_metrics).
+    """
+
+    def __init__(self, timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+                 pool_size: int = DEFAULT_POOL_SIZE, max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff_factor: float = DEFAULT_BACKOFF_FACTOR):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.session = requests.Session()
+        retry = _JitterRetry(total=max_retries, connect=max_retries, read=max_retries, status=max_retries,
+                             backoff_factor=backoff_factor, status_forcelist=RETRY_STATUSES,
+                             allowed_methods=IDEMPOTENT_METHODS, respect_retry_after_header=True,
+                             raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.metrics = ConnectorMetrics()
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Envoie une requete via la session et met a jour les compteurs du connecteur
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception:
+            self.metrics.record(time.perf_counter() - start, None)
+            raise
+        retries = response.raw.retries if response.raw is not None else None
+        self.metrics.record(time.perf_counter() - start, response.status_code, len(retries.history) if retries else 0)
+        return response
+
+    def _download(self, url: str, output_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  checksum: Optional[str] = None, expected_size: Optional[int] = None,
+                  max_resumes: int = DEFAULT_MAX_RESUMES) -> Dict:
+        """
+        Telecharge `url` vers output_path par blocs, sans charger le fichier en memoire
+
+        Les donnees sont ecrites dans `output_path.part`, renomme une fois le fichier
+        complet et verifie. Apres une coupure (ou si un .part existe deja), le
+        telechargement reprend la ou il s'etait arrete via un en-tete Range; une
+        reponse 206 dont le Content-Range ne commence pas a cet offset fait
+        repartir de zero.
+
+        Args:
+            chunk_size (int): Taille des blocs lus et ecrits (octets)
+            checksum (str): Empreinte attendue, "algo:hex" (ex. "sha256:...") ou hex sha256
+            expected_size (int): Taille attendue en octets (sinon celle annoncee par le serveur)
+            max_resumes (int): Nombre de reprises autorisees apres une coupure
+
+        Returns:
+            Dict: status/message, plus path, bytes, seconds, throughput_mb_s, resumes et checksum
+        """
+        algorithm, _, expected_digest = (checksum or "").rpartition(":")
+        algorithm = algorithm or "sha256"
+        if algorithm not in hashlib.algorithms_available:
+            return {"status": "error", "message": f"Unsupported checksum algorithm: {algorithm}"}
+
+        part_path = output_path + ".part"
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        transferred = 0
+        resumes = 0
+        total = None
+        start = time.perf_counter()
+
+        while True:
+            headers = {"Range": f"bytes={offset}-"} if offset else {}
+            try:
+                with self._request("GET", url, stream=True, headers=headers) as response:
+                    if response.status_code == 416 and offset:
+                        # Rien au-dela de offset: le .part est complet s'il a la taille du fichier distant
+                        size = response.headers.get("Content-Range", "").rpartition("/")[2]
+                        if size.isdigit() and int(size) == offset:
+                            break
+                        offset = 0
+                        continue
+                    if response.status_code == 200:
+                        # Pas de reprise possible (Range ignore): on repart de zero
+                        offset = 0
+                    elif response.status_code == 206:
+                        # La partie recue doit commencer a la fin du .part, sinon on repart de zero
+                        first_byte = response.headers.get("Content-Range", "").partition(" ")[2].partition("-")[0]
+                        if not first_byte.isdigit() or int(first_byte) != offset:
+                            if not offset:
+                                return {"status": "error", "message": "Unexpected partial content: "
+                                        f"{response.headers.get('Content-Range')}"}
+                            offset = 0
+                            continue
+                    else:
+                        return {"status": "error", "message": f"Failed to download artifact: {response.status_code}"}
+
+                    length = response.headers.get("Content-Length")
+                    total = offset + int(length) if length and length.isdigit() else None
+                    with open(part_path, "ab" if offset else "wb") as f:
+                        for chunk in response.iter_content(chunk_size):
+                            f.write(chunk)
+                            offset += len(chunk)
+                            transferred += len(chunk)
+                if total is None or offset >= total:
+                    break
+                error = f"connection closed at {offset}/{total} bytes"
+            except requests.exceptions.RequestException as e:
+                error = str(e)
+            if resumes >= max_resumes:
+                return {"status": "error", "message": f"Download interrupted after {offset} bytes: {error}"}
+            resumes += 1
+
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(part_path)
+        if expected_size is not None and size != expected_size:
+            os.remove(part_path)
+            return {"status": "error", "message": f"Size mismatch: expected {expected_size} bytes, got {size}"}
+
+        # Empreinte calculee en relisant le fichier: valable aussi pour les parties reprises
+        digest = hashlib.new(algorithm)
+        with open(part_path, "rb") as f:
+            for block in iter(lambda: f.read(chunk_size), b""):
+                digest.update(block)
+        if expected_digest and digest.hexdigest() != expected_digest.lower():
+            os.remove(part_path)
+            return {"status": "error", "message": f"Checksum mismatch for {output_path}"}
+
+        os.replace(part_path, output_path)
+        return {
+            "status": "success",
+            "message": f"Artifact downloaded to {output_path}",
+            "path": output_path,
+            "bytes": size,
+            "seconds": elapsed,
+            "throughput_mb_s": transferred / elapsed / 1e6 if elapsed > 0 else None,
+            "resumes": resumes,
+            "checksum": f"{algorithm}:{digest.hexdigest()}"
+        }
+
+    def _download_many(self, downloads: Iterable[Tuple[str, str]], workers: int = DEFAULT_DOWNLOAD_WORKERS,
+                       **options) -> Dict:
+        """
+        Telecharge plusieurs (url, output_path) en parallele sur la session partagee
+
+        Returns:
+            Dict: status ("success" si tous ont reussi), results (dans l'ordre donne),
+            bytes, seconds et throughput_mb_s agreges
+        """
+        downloads = list(downloads)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(downloads)))) as pool:
+            results: List[Dict] = list(pool.map(lambda job: self._download(*job, **options), downloads))
+        elapsed = time.perf_counter() - start
+        failed = sum(result["status"] != "success" for result in results)
+        transferred = sum(result.get("bytes", 0) for result in results)
+        return {
+            "status": "error" if failed else "success",
+            "message": f"{len(results) - failed}/{len(results)} artifacts downloaded",
+            "results": results,
+            "bytes": transferred,
+            "seconds": elapsed,
+            "throughput_mb_s": transferred / elapsed / 1e6 if elapsed > 0 else None
+        }
+
+    def get_metrics(self) -> Dict:
+        """
+        Nombre de requetes, erreurs, reessais et latences en ms du connecteur
+        """
+        return self.metrics.snapshot()
+
+    def reset_metrics(self) -> None:
+        self.metrics.reset()
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -1,15 +1,53 @@
-import requests
-import json
-from typing import Dict, List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List
 
-class JiraConnector:
-    def __init__(self, base_url: str, email: str, api_token: str):
+from .http_client import BaseConnector, backoff_delay
+
+# Nombre maximal de tickets par appel a /rest/api/3/issue/bulk (limite du serveur)
+JIRA_BULK_MAX_ISSUES = 50
+# Lots envoyes simultanement par create_issues_bulk
+DEFAULT_BULK_WORKERS = 4
+
+def _issue_fields(project_key: str, summary: str, description: str,
+                  issue_type: str = "Bug", priority: str = "Medium") -> Dict:
+    return {
+        "project": {"key": project_key},
+        "summary": summary,
+        "description": {
+            "type": "doc",
+            "version": 1,
+            "content": [
+                {
+                    "type": "paragraph",
+                    "content": [{"type": "text", "text": description}]
+                }
+            ]
+        },
+        "issuetype": {"name": issue_type},
+        "priority": {"name": priority}
+    }
+
+def _element_error(error: Dict) -> str:
+    element_errors = error.get('elementErrors', {})
+    messages = list(element_errors.get('errorMessages', []))
+    messages.extend(f"{field}: {message}" for field, message in element_errors.get('errors', {}).items())
+    return "; ".join(messages) or f"Failed to create issue: {error.get('status')}"
+
+class JiraConnector(BaseConnector):
+    def __init__(self, base_url: str, email: str, api_token: str, **http_options):
         """
         Initialise la connexion avec Jira
+        
+        http_options (timeout, pool_size, max_retries, backoff_factor) configurent
+        la session partagee, voir BaseConnector
         """
+        super().__init__(**http_options)
         self.base_url = base_url.rstrip('/')
         self.auth = (email, api_token)
         self.headers = {"Content-Type": "application/json"}
+        self.session.auth = self.auth
+        self.session.headers.update(self.headers)
     
     def create_issue(self, project_key: str, summary: str, description: str, 
                      issue_type: str = "Bug", priority: str = "Medium") -> Dict:
@@ -18,27 +56,10 @@ class JiraConnector:
         """
         url = f"{self.base_url}/rest/api/3/issue"
         
-        payload = {
-            "fields": {
-                "project": {"key": project_key},
-                "summary": summary,
-                "description": {
-                    "type": "doc",
-                    "version": 1,
-                    "content": [
-                        {
-                            "type": "paragraph",
-                            "content": [{"type": "text", "text": description}]
-                        }
-                    ]
-                },
-                "issuetype": {"name": issue_type},
-                "priority": {"name": priority}
-            }
-        }
+        payload = {"fields": _issue_fields(project_key, summary, description, issue_type, priority)}
         
         try:
-            response = requests.post(url, auth=self.auth, headers=self.headers, json=payload)
+            response = self._request("POST", url, json=payload)
             if response.status_code == 201:
                 data = response.json()
                 return {
@@ -52,6 +73,86 @@ class JiraConnector:
         except Exception as e:
             return {"status": "error", "message": str(e)}
     
+    def create_issues_bulk(self, issues: Iterable[Dict], batch_size: int = JIRA_BULK_MAX_ISSUES,
+                           workers: int = DEFAULT_BULK_WORKERS) -> Dict:
+        """
+        Cree de nombreux tickets via /rest/api/3/issue/bulk
+        
+        Les tickets sont envoyes par lots de batch_size (50 au plus, limite de Jira),
+        plusieurs lots en parallele. Un lot refuse pour limite de debit (429) n'a rien
+        cree: il est renvoye apres l'attente demandee (Retry-After) ou un backoff.
+        
+        Args:
+            issues: Tickets, chacun avec les arguments de create_issue (project_key,
+                summary, description, et optionnellement issue_type et priority)
+            batch_size (int): Tickets par appel
+            workers (int): Lots envoyes simultanement
+            
+        Returns:
+            Dict: status ("success" si tous les tickets sont crees), created, failed et
+            results: un resultat par ticket, dans l'ordre des entrees (issue_key,
+            issue_id, self en cas de succes; message sinon)
+        """
+        issues = list(issues)
+        batch_size = max(1, min(batch_size, JIRA_BULK_MAX_ISSUES))
+        batches = [issues[start:start + batch_size] for start in range(0, len(issues), batch_size)]
+        
+        results: List[Dict] = []
+        if batches:
+            with ThreadPoolExecutor(max_workers=max(1, min(workers, len(batches)))) as pool:
+                for batch_results in pool.map(self._create_issue_batch, batches):
+                    results.extend(batch_results)
+        
+        failed = sum(result["status"] != "success" for result in results)
+        return {
+            "status": "error" if failed else "success",
+            "message": f"{len(results) - failed}/{len(results)} issues created",
+            "created": len(results) - failed,
+            "failed": failed,
+            "results": results
+        }
+    
+    def _create_issue_batch(self, batch: List[Dict]) -> List[Dict]:
+        """
+        Envoie un lot et associe chaque ticket cree ou refuse a sa position dans le lot
+        """
+        url = f"{self.base_url}/rest/api/3/issue/bulk"
+        
+        try:
+            payload = {"issueUpdates": [{"fields": _issue_fields(**issue)} for issue in batch]}
+            attempt = 0
+            while True:
+                response = self._request("POST", url, json=payload)
+                if response.status_code != 429 or attempt >= self.max_retries:
+                    break
+                attempt += 1
+                retry_after = response.headers.get("Retry-After", "")
+                time.sleep(float(retry_after) if retry_after.isdigit() else backoff_delay(attempt, self.backoff_factor))
+            
+            # 201: tout est cree; 400: creation partielle, les refus sont dans "errors"
+            data = response.json() if response.status_code in (201, 400) else {}
+            errors = {error.get('failedElementNumber'): error for error in data.get('errors', [])}
+            if response.status_code not in (201, 400) or (not data.get('issues') and not errors):
+                message = f"Failed to create issues: {response.status_code}"
+                return [{"status": "error", "message": message, "details": response.text} for _ in batch]
+        except Exception as e:
+            return [{"status": "error", "message": str(e)} for _ in batch]
+        
+        # Jira renvoie les tickets crees dans l'ordre du lot, sans les elements refuses
+        created = iter(data.get('issues', []))
+        results = []
+        for index in range(len(batch)):
+            if index in errors:
+                results.append({"status": "error", "message": _element_error(errors[index])})
+                continue
+            issue = next(created, None)
+            if issue is None:
+                results.append({"status": "error", "message": "Issue missing from bulk response"})
+            else:
+                results.append({"status": "success", "issue_key": issue.get('key'),
+                                "issue_id": issue.get('id'), "self": issue.get('self')})
+        return results
+    
     def get_issue(self, issue_key: str) -> Dict:
         """
         Recupere les details d'un ticket Jira
@@ -59,7 +160,7 @@ class JiraConnector:
         url = f"{self.base_url}/rest/api/3/issue/{issue_key}"
         
         try:
-            response = requests.get(url, auth=self.auth, headers=self.headers)
+            response = self._request("GET", url)
             if response.status_code == 200:
                 data = response.json()
                 fields = data.get('fields', {})
@@ -85,7 +186,7 @@ class JiraConnector:
         payload = {"fields": fields_to_update}
         
         try:
-            response = requests.put(url, auth=self.auth, headers=self.headers, json=payload)
+            response = self._request("PUT", url, json=payload)
             if response.status_code == 204:
                 return {"status": "success", "message": f"Issue {issue_key} updated successfully"}
             else:
@@ -113,7 +214,7 @@ class JiraConnector:
         }
         
         try:
-            response = requests.post(url, auth=self.auth, headers=self.headers, json=payload)
+            response = self._request("POST", url, json=payload)
             if response.status_code == 201:
                 data = response.json()
                 return {"status": "success", "comment_id": data.get('id')}
@@ -129,7 +230,7 @@ class JiraConnector:
         transitions_url = f"{self.base_url}/rest/api/3/issue/{issue_key}/transitions"
         
         try:
-            response = requests.get(transitions_url, auth=self.auth, headers=self.headers)
+            response = self._request("GET", transitions_url)
             if response.status_code != 200:
                 return {"status": "error", "message": "Failed to get available transitions"}
             
@@ -145,7 +246,7 @@ class JiraConnector:
                 return {"status": "error", "message": f"Transition '{transition_name}' not found"}
             
             payload = {"transition": {"id": transition_id}}
-            response = requests.post(transitions_url, auth=self.auth, headers=self.headers, json=payload)
+            response = self._request("POST", transitions_url, json=payload)
             
             if response.status_code == 204:
                 return {"status": "success", "message": f"Issue {issue_key} transitioned to {transition_name}"}
@@ -167,7 +268,7 @@ class JiraConnector:
         }
         
         try:
-            response = requests.post(url, auth=self.auth, headers=self.headers, json=payload)
+            response = self._request("POST", url, json=payload)
             if response.status_code == 201:
                 return {"status": "success", "message": f"Issues linked successfully"}
             else:
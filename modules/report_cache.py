@@ -0,0 +1,118 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import time
+from typing import Dict, Optional
+
+DEFAULT_CACHE_DIR = os.path.expanduser(os.getenv("AGENT_QA_CACHE_DIR", "~/.cache/agent-mcp-qa"))
+DEFAULT_MAX_BYTES = int(os.getenv("AGENT_QA_CACHE_MAX_BYTES", 1024 * 1024 * 1024))
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+class ReportCache:
+    """
+    Cache disque (SQLite) des statistiques de rapports deja analyses
+
+    Les entrees sont indexees par hash du contenu + version du parseur. Un index
+    (chemin, mtime, taille) evite de re-hasher les fichiers inchanges, et les
+    entrees les moins recemment utilisees sont evincees au-dela de max_bytes.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.db_path = os.path.join(self.cache_dir, "reports.sqlite")
+        self.conn = sqlite3.connect(self.db_path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                digest TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                digest TEXT NOT NULL,
+                parser_version TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                nbytes INTEGER NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (digest, parser_version)
+            );
+            CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+        """)
+
+    def _digest(self, report_path: str) -> str:
+        """
+        Retourne le hash du fichier, recalcule uniquement si mtime ou taille ont change
+        """
+        path = os.path.abspath(report_path)
+        st = os.stat(path)
+        row = self.conn.execute("SELECT mtime_ns, size, digest FROM files WHERE path = ?", (path,)).fetchone()
+        if row and row[0] == st.st_mtime_ns and row[1] == st.st_size:
+            return row[2]
+
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO files (path, mtime_ns, size, digest) VALUES (?, ?, ?, ?)",
+                              (path, st.st_mtime_ns, st.st_size, digest))
+        return digest
+
+    def get(self, report_path: str, parser_version: str) -> Optional[Dict]:
+        """
+        Retourne les statistiques en cache pour ce rapport, ou None
+        """
+        digest = self._digest(report_path)
+        row = self.conn.execute("SELECT payload FROM entries WHERE digest = ? AND parser_version = ?",
+                                (digest, parser_version)).fetchone()
+        if row is None:
+            return None
+
+        with self.conn:
+            self.conn.execute("UPDATE entries SET last_access = ? WHERE digest = ? AND parser_version = ?",
+                              (time.time(), digest, parser_version))
+        return pickle.loads(row[0])
+
+    def put(self, report_path: str, parser_version: str, stats: Dict) -> None:
+        """
+        Enregistre les statistiques d'un rapport puis applique l'eviction LRU
+        """
+        digest = self._digest(report_path)
+        payload = pickle.dumps(stats, protocol=pickle.HIGHEST_PROTOCOL)
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO entries (digest, parser_version, payload, nbytes, last_access) "
+                              "VALUES (?, ?, ?, ?, ?)",
+                              (digest, parser_version, payload, len(payload), time.time()))
+        self._evict()
+
+    def _evict(self) -> None:
+        total = self.conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        to_delete = []
+        for digest, parser_version, nbytes in self.conn.execute(
+                "SELECT digest, parser_version, nbytes FROM entries ORDER BY last_access"):
+            if total <= self.max_bytes:
+                break
+            to_delete.append((digest, parser_version))
+            total -= nbytes
+
+        with self.conn:
+            self.conn.executemany("DELETE FROM entries WHERE digest = ? AND parser_version = ?", to_delete)
+            self.conn.execute("DELETE FROM files WHERE digest NOT IN (SELECT digest FROM entries)")
+
+    def clear(self) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM entries")
+            self.conn.execute("DELETE FROM files")
+
+    def close(self) -> None:
+        self.conn.close()
@@ -1,26 +1,55 @@
+import hashlib
+import heapq
+import html
+import io
+import json
+import multiprocessing
 import os
+import re
+import stat
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from itertools import repeat
 
-def generate_html_report(stats, output_path="reports/test_report.html"):
-    """
-    Genere un rapport HTML a partir des statistiques de test
-    
-    Args:
-        stats: Dictionnaire contenant les statistiques
-        output_path: Chemin du fichier de sortie
-    
-    Returns:
-        str: Chemin du fichier genere
-    """
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    
-    html_content = f"""
+import numpy as np
+
+from .case_table import STATUS_CODES, STATUSES, TestCaseTable
+
+# Nombre de lignes de cas de test par page HTML et par ecriture
+DEFAULT_PAGE_SIZE = 5000
+ROW_CHUNK_SIZE = 1000
+# Nombre de tests les plus lents affiches sur la premiere page
+SLOWEST_CASES = 100
+# Nombre de classes affichees dans le tableau des resultats par classe
+SUITE_ROWS = 200
+# Version du format des fragments HTML: a incrementer quand leur rendu change
+_MANIFEST_VERSION = 2
+# Nombre de causes d'echec regroupees reprises dans le resume JSON
+SUMMARY_CLUSTERS = 50
+# Les messages sont tronques pour garder des pages de taille raisonnable
+MAX_MESSAGE_LENGTH = 300
+# Nombre maximal de points par serie du tableau de bord de tendances
+DEFAULT_TREND_POINTS = 500
+# Series suivies: (cle, libelle, unite)
+TREND_SERIES = (("success_rate", "Taux de reussite", "%"), ("time", "Duree d'execution", "s"),
+                ("failures", "Echecs et erreurs", ""))
+# Caracteres interdits en XML 1.0 (controles hors tabulation/retours, substituts isoles, U+FFFE/U+FFFF)
+_INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
+# Masque de creation du processus, lu une fois (os.umask ne peut que le remplacer)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+# Formats produits par render_reports et extension de fichier associee
+REPORT_FORMATS = {"html": ".html", "text": ".txt", "json": ".json", "junit": ".xml"}
+
+_HTML_HEAD = """
 <!DOCTYPE html>
 <html lang="fr">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Rapport de Tests - {datetime.now().strftime('%Y-%m-%d')}</title>
+    <title>{title}</title>
     <style>
         body {{
             font-family: Arial, sans-serif;
@@ -28,7 +57,7 @@ def generate_html_report(stats, output_path="reports/test_report.html"):
             background-color: #f5f5f5;
         }}
         .container {{
-            max-width: 800px;
+            max-width: 1100px;
             margin: 0 auto;
             background: white;
             padding: 30px;
@@ -66,6 +95,26 @@ def generate_html_report(stats, output_path="reports/test_report.html"):
         .failure {{ border-left-color: #f44336; }}
         .warning {{ border-left-color: #ff9800; }}
         .info {{ border-left-color: #2196F3; }}
+        table {{
+            width: 100%;
+            border-collapse: collapse;
+            margin: 20px 0;
+            font-size: 13px;
+        }}
+        th, td {{
+            text-align: left;
+            padding: 6px 8px;
+            border-bottom: 1px solid #eee;
+            vertical-align: top;
+        }}
+        th {{ background: #f0f0f0; }}
+        td.message {{ font-family: monospace; word-break: break-word; }}
+        .pagination {{ margin: 20px 0; }}
+        .pagination a, .pagination span {{ margin-right: 8px; }}
+        svg.chart {{ width: 100%; height: auto; background: #fafafa; }}
+        .chart-band {{ fill: #bbdefb; stroke: none; }}
+        .chart-line {{ fill: none; stroke: #2196F3; stroke-width: 1.5; }}
+        .chart-label {{ font-size: 11px; fill: #666; }}
         .footer {{
             margin-top: 30px;
             padding-top: 20px;
@@ -77,70 +126,767 @@ def generate_html_report(stats, output_path="reports/test_report.html"):
 </head>
 <body>
     <div class="container">
-        <h1>Rapport de Tests Automatises</h1>
-        <p><strong>Date:</strong> {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}</p>
-        
+        <h1>{heading}</h1>
+        <p><strong>Date:</strong> {date}</p>
+"""
+
+_HTML_FOOT = """
+        <div class="footer">
+            <p>Genere par Agent MCP QA</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+_CASE_TABLE_HEAD = """
+        <table>
+            <tr><th>Classe</th><th>Test</th><th>Statut</th><th>Duree (s)</th><th>Message</th></tr>
+"""
+
+def _page_path(output_path, page):
+    if page == 1:
+        return output_path
+    base, ext = os.path.splitext(output_path)
+    return f"{base}_p{page}{ext}"
+
+def _failing_indices(test_cases):
+    """
+    Indices des cas en echec ou en erreur, dans l'ordre du rapport
+    """
+    if isinstance(test_cases, TestCaseTable):
+        statuses = np.frombuffer(test_cases.statuses, dtype=np.uint8)
+        return np.flatnonzero((statuses == STATUS_CODES["failed"]) | (statuses == STATUS_CODES["error"]))
+    return np.array([i for i, case in enumerate(test_cases) if case.get("status") in ("failed", "error")],
+                    dtype=np.int64)
+
+def _slowest_indices(test_cases, count):
+    if isinstance(test_cases, TestCaseTable):
+        times = np.frombuffer(test_cases.times, dtype=np.float64)
+        if len(times) > count:
+            top = np.argpartition(-times, count - 1)[:count]
+        else:
+            top = np.arange(len(times))
+        return top[np.lexsort((top, -times[top]))].tolist()
+    return heapq.nlargest(count, range(len(test_cases)), key=lambda i: test_cases[i].get("time", 0))
+
+def _suite_stats(test_cases):
+    """
+    Totaux par classname (tests, echecs, erreurs, ignores, duree), les plus en echec d'abord
+    """
+    if isinstance(test_cases, TestCaseTable):
+        ids = np.frombuffer(test_cases.classname_ids, dtype=np.uint32)
+        statuses = np.frombuffer(test_cases.statuses, dtype=np.uint8)
+        size = len(test_cases.classnames)
+        columns = [np.bincount(ids, minlength=size)]
+        columns += [np.bincount(ids[statuses == STATUS_CODES[status]], minlength=size)
+                    for status in ("failed", "error", "skipped")]
+        columns.append(np.bincount(ids, weights=np.frombuffer(test_cases.times, dtype=np.float64), minlength=size))
+        rows = zip(test_cases.classnames, *(column.tolist() for column in columns))
+    else:
+        totals = {}
+        for case in test_cases:
+            row = totals.setdefault(case.get("classname", ""), [0, 0, 0, 0, 0.0])
+            row[0] += 1
+            status = case.get("status")
+            if status in ("failed", "error", "skipped"):
+                row[("failed", "error", "skipped").index(status) + 1] += 1
+            row[4] += case.get("time", 0)
+        rows = ((classname, *row) for classname, row in totals.items())
+    
+    suites = [{"classname": classname, "tests": tests, "failures": failed, "errors": errors, "skipped": skipped,
+               "time": duration} for classname, tests, failed, errors, skipped, duration in rows if tests]
+    suites.sort(key=lambda suite: (-(suite["failures"] + suite["errors"]), -suite["time"], suite["classname"]))
+    return suites
+
+def _escape_markup(text):
+    """
+    Echappe un texte pour HTML/XML en retirant les caracteres qu'un document XML 1.0 ne peut pas contenir
+    """
+    return html.escape(_INVALID_XML_CHARS.sub('', text))
+
+def _case_rows(test_cases, indices):
+    """
+    Champs affiches (classname, name, status, time, message, failure_type) des cas
+    demandes, deja echappes pour HTML/XML et lus directement dans les colonnes de
+    la table. Classnames et messages se repetent: ils ne sont echappes qu'une fois.
+    """
+    escaped = {}
+    
+    def escape(text):
+        value = escaped.get(text)
+        if value is None:
+            value = escaped[text] = _escape_markup(_truncate(text))
+        return value
+    
+    if not isinstance(test_cases, TestCaseTable):
+        for i in indices:
+            case = test_cases[i]
+            yield (escape(case.get("classname", "")), _escape_markup(case.get("name", "Unknown")),
+                   case.get("status", "passed"), case.get("time", 0),
+                   escape(case.get("failure_message") or case.get("error_message") or ""),
+                   escape(case.get("failure_type") or ""))
+        return
+    
+    names, classname_ids, times, statuses = test_cases.names, test_cases.classname_ids, test_cases.times, test_cases.statuses
+    classnames = [_escape_markup(classname) for classname in test_cases.classnames]
+    failure_types = [_escape_markup(failure_type) for failure_type in test_cases.failure_types]
+    failure_messages, error_messages = test_cases.failure_messages, test_cases.error_messages
+    failure_type_ids = test_cases.failure_type_ids
+    for i in indices:
+        type_id = failure_type_ids.get(i)
+        yield (classnames[classname_ids[i]], _escape_markup(names[i]), STATUSES[statuses[i]], times[i],
+               escape(failure_messages.get(i) or error_messages.get(i) or ""),
+               failure_types[type_id] if type_id is not None else "")
+
+def compute_report_metrics(stats):
+    """
+    Calcule une seule fois les valeurs derivees communes a tous les formats
+    
+    Args:
+        stats: Dictionnaire contenant les statistiques
+    
+    Returns:
+        dict: Totaux, nombre de tests reussis, date de generation, indices des cas en echec,
+              totaux par classname, percentiles de duree
+    """
+    test_cases = stats.get('test_cases') or []
+    total = stats.get('total_tests', 0)
+    failures = stats.get('failures', 0)
+    errors = stats.get('errors', 0)
+    skipped = stats.get('skipped', 0)
+    return {
+        "generated_at": datetime.now(),
+        "total_tests": total,
+        "passed": total - failures - errors - skipped,
+        "failures": failures,
+        "errors": errors,
+        "skipped": skipped,
+        "success_rate": stats.get('success_rate', 0),
+        "time": stats.get('time', 0),
+        "test_cases": test_cases,
+        "failing": _failing_indices(test_cases),
+        "suites": _suite_stats(test_cases),
+        "durations": stats.get('durations') or (test_cases.durations.summary(limit=SUITE_ROWS)
+                                                if isinstance(test_cases, TestCaseTable) else None),
+    }
+
+def _atomic_write(output_path, write):
+    """
+    Ecrit dans un fichier temporaire du meme repertoire puis le renomme:
+    un lecteur ne voit jamais de rapport partiellement ecrit. Le rapport garde
+    les droits du fichier remplace, ou ceux d'un open() ordinaire (0666 & ~umask)
+    plutot que le 0600 de mkstemp.
+    """
+    try:
+        mode = stat.S_IMODE(os.stat(output_path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(output_path) or ".", prefix=".tmp-",
+                                    suffix=os.path.splitext(output_path)[1])
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            write(f)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def _render_cards(metrics):
+    return f"""
         <div class="stats">
             <div class="stat-card info">
                 <div class="stat-label">Tests Totaux</div>
-                <div class="stat-value">{stats.get('total_tests', 0)}</div>
+                <div class="stat-value">{metrics['total_tests']}</div>
             </div>
             <div class="stat-card success">
                 <div class="stat-label">Reussis</div>
-                <div class="stat-value">{stats.get('total_tests', 0) - stats.get('failures', 0) - stats.get('errors', 0) - stats.get('skipped', 0)}</div>
+                <div class="stat-value">{metrics['passed']}</div>
             </div>
             <div class="stat-card failure">
                 <div class="stat-label">Echecs</div>
-                <div class="stat-value">{stats.get('failures', 0)}</div>
+                <div class="stat-value">{metrics['failures']}</div>
             </div>
             <div class="stat-card warning">
                 <div class="stat-label">Erreurs</div>
-                <div class="stat-value">{stats.get('errors', 0)}</div>
+                <div class="stat-value">{metrics['errors']}</div>
             </div>
         </div>
         
         <div class="stat-card info" style="margin-top: 20px;">
             <div class="stat-label">Taux de Reussite</div>
-            <div class="stat-value">{stats.get('success_rate', 0):.1f}%</div>
-        </div>
-        
-        <div class="footer">
-            <p>Genere par Agent MCP QA</p>
+            <div class="stat-value">{metrics['success_rate']:.1f}%</div>
         </div>
-    </div>
-</body>
-</html>
+"""
+
+def _render_pagination(output_path, page, pages):
+    """
+    Index de toutes les pages sur la premiere; premiere/precedente/suivante sur les
+    autres, qui ne dependent ainsi pas du nombre total de pages
+    """
+    if pages <= 1:
+        return ""
+    
+    def link(number, label):
+        href = html.escape(os.path.basename(_page_path(output_path, number)))
+        return f'<a href="{href}">{label}</a>'
+    
+    if page == 1:
+        links = ["<span><strong>1</strong></span>"] + [link(number, number) for number in range(2, pages + 1)]
+    else:
+        links = [link(1, "1"), link(page - 1, "&laquo; precedente"), f"<span><strong>{page}</strong></span>"]
+        if page < pages:
+            links.append(link(page + 1, "suivante &raquo;"))
+    return f'\n        <div class="pagination">Pages: {" ".join(links)}</div>\n'
+
+def _truncate(message):
+    if len(message) > MAX_MESSAGE_LENGTH:
+        return message[:MAX_MESSAGE_LENGTH] + "..."
+    return message
+
+def _render_case_row(row):
+    classname, name, status, time, message, _ = row
+    return (f"            <tr><td>{classname}</td><td>{name}</td><td>{status}</td><td>{time:.3f}</td>"
+            f"<td class=\"message\">{message}</td></tr>\n")
+
+def _render_junit_case(row):
+    classname, name, status, time, message, failure_type = row
+    if status == "error":
+        element = f'<error message="{message}"/>'
+    else:
+        element = f'<failure type="{failure_type}" message="{message}"/>'
+    return f'    <testcase classname="{classname}" name="{name}" time="{time:.3f}">{element}</testcase>\n'
+
+def _write_rows(f, rows, render):
+    """
+    Ecrit les lignes par blocs de ROW_CHUNK_SIZE, sans construire le document entier
+    """
+    chunk = []
+    for row in rows:
+        chunk.append(render(row))
+        if len(chunk) >= ROW_CHUNK_SIZE:
+            f.write("".join(chunk))
+            chunk = []
+    f.write("".join(chunk))
+
+def _fingerprint(*parts):
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else repr(part).encode('utf-8'))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+def _rows_fingerprint(test_cases, indices):
+    """
+    Empreinte des champs affiches pour ces cas, calculee sans construire de ligne
+    """
+    if not isinstance(test_cases, TestCaseTable):
+        return _fingerprint([sorted(test_cases[i].items()) for i in indices])
+    
+    rows = indices.tolist() if isinstance(indices, np.ndarray) else list(indices)
+    selected = np.asarray(rows, dtype=np.int64)
+    return _fingerprint(
+        np.frombuffer(test_cases.times, dtype=np.float64)[selected].tobytes(),
+        np.frombuffer(test_cases.statuses, dtype=np.uint8)[selected].tobytes(),
+        "\x00".join(map(test_cases.names.__getitem__, rows)).encode('utf-8'),
+        "\x00".join(map(test_cases.classnames.__getitem__, map(test_cases.classname_ids.__getitem__, rows))).encode('utf-8'),
+        "\x00".join(map(test_cases.failure_messages.get, rows, repeat(""))).encode('utf-8'),
+        "\x00".join(map(test_cases.error_messages.get, rows, repeat(""))).encode('utf-8'),
+        np.fromiter(map(test_cases.failure_type_ids.get, rows, repeat(-1)), dtype=np.int64, count=len(rows)).tobytes(),
+        test_cases.failure_types,
+    )
+
+def _render_anomalies(anomalies):
+    items = "".join(f"            <li>{html.escape(anomaly)}</li>\n" for anomaly in anomalies)
+    return f"\n        <h2>Anomalies ({len(anomalies)})</h2>\n        <ul>\n{items}        </ul>\n"
+
+def _render_suites(suites):
+    rows = "".join(
+        f"            <tr><td>{html.escape(suite['classname'])}</td><td>{suite['tests']}</td><td>{suite['failures']}</td>"
+        f"<td>{suite['errors']}</td><td>{suite['skipped']}</td><td>{suite['time']:.3f}</td></tr>\n"
+        for suite in suites[:SUITE_ROWS])
+    return (f"\n        <h2>Resultats par classe ({min(len(suites), SUITE_ROWS)}/{len(suites)})</h2>\n        <table>\n"
+            "            <tr><th>Classe</th><th>Tests</th><th>Echecs</th><th>Erreurs</th><th>Ignores</th>"
+            f"<th>Duree (s)</th></tr>\n{rows}        </table>\n")
+
+def _render_durations(durations):
+    overall = durations["overall"]
+    rows = "".join(
+        f"            <tr><td>{html.escape(row['classname'])}</td><td>{row['count']}</td><td>{row['p50']:.3f}</td>"
+        f"<td>{row['p90']:.3f}</td><td>{row['p99']:.3f}</td><td>{row['max']:.3f}</td></tr>\n"
+        for row in durations["by_classname"][:SUITE_ROWS])
+    return (f"\n        <h2>Durees des tests</h2>\n"
+            f"        <p><strong>p50:</strong> {overall['p50']:.3f}s &nbsp; <strong>p90:</strong> {overall['p90']:.3f}s "
+            f"&nbsp; <strong>p99:</strong> {overall['p99']:.3f}s &nbsp; <strong>max:</strong> {overall['max']:.3f}s</p>\n"
+            "        <table>\n            <tr><th>Classe</th><th>Tests</th><th>p50 (s)</th><th>p90 (s)</th>"
+            f"<th>p99 (s)</th><th>max (s)</th></tr>\n{rows}        </table>\n")
+
+def _render_case_table(test_cases, indices, title=None):
+    out = io.StringIO()
+    if title:
+        out.write(f"\n        <h2>{title}</h2>\n")
+    out.write(_CASE_TABLE_HEAD)
+    _write_rows(out, _case_rows(test_cases, indices), _render_case_row)
+    out.write("        </table>\n")
+    return out.getvalue()
+
+def generate_html_report(stats, output_path="reports/test_report.html", page_size=DEFAULT_PAGE_SIZE, metrics=None,
+                         incremental=False):
+    """
+    Genere un rapport HTML a partir des statistiques de test
+    
+    La premiere page contient les totaux, les anomalies, les resultats et les
+    percentiles de duree par classe, les tests les plus lents et le debut des
+    cas en echec; au-dela de page_size lignes, les echecs continuent sur des
+    pages liees (test_report_p2.html, ...). Les lignes sont ecrites par blocs
+    directement dans le fichier: la memoire reste bornee quel que soit le
+    nombre de cas.
+    
+    En mode incremental, un manifeste (test_report.manifest.json) conserve
+    l'empreinte des donnees de chaque section et les fragments HTML deja rendus
+    (test_report_fragments/). Seules les sections dont l'empreinte a change
+    sont re-rendues; une page d'echecs inchangee n'est pas reecrite.
+    
+    Args:
+        stats: Dictionnaire contenant les statistiques
+        output_path: Chemin du fichier de sortie (premiere page)
+        page_size: Nombre maximal de cas en echec par page
+        metrics: Valeurs derivees deja calculees (voir compute_report_metrics)
+        incremental: Reutiliser les sections inchangees de la generation precedente
+    
+    Returns:
+        str: Chemin du fichier genere
     """
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    metrics = metrics or compute_report_metrics(stats)
+    
+    now = metrics['generated_at']
+    test_cases = metrics['test_cases']
+    failing = metrics['failing']
+    pages = max(1, -(-len(failing) // page_size))
+    head = _HTML_HEAD.format(title=f"Rapport de Tests - {now.strftime('%Y-%m-%d')}",
+                             heading="Rapport de Tests Automatises", date=now.strftime('%d/%m/%Y %H:%M:%S'))
+    
+    base = os.path.splitext(output_path)[0]
+    manifest_path = base + ".manifest.json"
+    fragment_dir = base + "_fragments"
+    previous = {}
+    previous_pages = 0
+    if incremental and os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            previous = json.load(f)
+        # Lu avant d'ecarter un manifeste incompatible: les pages en trop doivent etre supprimees
+        previous_pages = previous.get("pages", 0)
+        if previous.get("version") != _MANIFEST_VERSION or previous.get("page_size") != page_size:
+            previous = {}
+    previous_sections = previous.get("sections", {})
+    sections = {}
+    
+    def fragment(name, fingerprint, render):
+        """
+        Fragment HTML d'une section, relu depuis le cache si son empreinte n'a pas change
+        """
+        sections[name] = fingerprint
+        path = os.path.join(fragment_dir, name + ".html")
+        if previous_sections.get(name) == fingerprint and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                return f.read()
+        content = render()
+        if incremental:
+            os.makedirs(fragment_dir, exist_ok=True)
+            _atomic_write(path, lambda f: f.write(content))
+        return content
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    def write_page(f, page, failing_fragment):
+        f.write(head)
+        pagination = _render_pagination(output_path, page, pages)
+        
+        if page == 1:
+            cards = (metrics['total_tests'], metrics['passed'], metrics['failures'], metrics['errors'],
+                     metrics['success_rate'])
+            f.write(fragment("cards", _fingerprint(cards), lambda: _render_cards(metrics)))
+            anomalies = stats.get('anomalies') or []
+            if anomalies:
+                f.write(fragment("anomalies", _fingerprint(anomalies), lambda: _render_anomalies(anomalies)))
+            suites = metrics['suites']
+            if suites:
+                f.write(fragment("suites", _fingerprint(suites[:SUITE_ROWS], len(suites)),
+                                 lambda: _render_suites(suites)))
+            durations = metrics['durations']
+            if durations and durations["overall"]["count"]:
+                f.write(fragment("durations", _fingerprint(durations), lambda: _render_durations(durations)))
+            slowest = _slowest_indices(test_cases, SLOWEST_CASES)
+            if slowest:
+                title = f"Tests les plus lents ({len(slowest)})"
+                f.write(fragment("slowest", _rows_fingerprint(test_cases, slowest),
+                                 lambda: _render_case_table(test_cases, slowest, title)))
+        
+        if len(failing):
+            if page == 1:
+                f.write(f"\n        <h2>Tests en echec ({len(failing)}) - page 1/{pages}</h2>\n")
+            else:
+                f.write(f"\n        <h2>Tests en echec - page {page}</h2>\n")
+            f.write(pagination)
+            f.write(failing_fragment)
+            f.write(pagination)
+        
+        f.write(_HTML_FOOT)
+    
+    for page in range(1, pages + 1):
+        page_path = _page_path(output_path, page)
+        page_rows = failing[(page - 1) * page_size:page * page_size].tolist()
+        name = f"failures_p{page}"
+        fingerprint = _rows_fingerprint(test_cases, page_rows)
+        # Au-dela de la premiere, une page ne depend que de ses lignes et du lien vers la suivante
+        if (page > 1 and previous_sections.get(name) == fingerprint
+                and (page < pages) == (page < previous_pages) and os.path.exists(page_path)):
+            sections[name] = fingerprint
+            continue
+        failing_fragment = fragment(name, fingerprint, lambda: _render_case_table(test_cases, page_rows))
+        _atomic_write(page_path, lambda f: write_page(f, page, failing_fragment))
+    
+    if incremental:
+        # Pages et fragments devenus inutiles (moins d'echecs qu'a la generation precedente)
+        for page in range(pages + 1, previous_pages + 1):
+            for path in (_page_path(output_path, page), os.path.join(fragment_dir, f"failures_p{page}.html")):
+                if os.path.exists(path):
+                    os.remove(path)
+        manifest = {"version": _MANIFEST_VERSION, "page_size": page_size, "pages": pages, "sections": sections}
+        _atomic_write(manifest_path, lambda f: json.dump(manifest, f, indent=2))
     
     print(f"Rapport genere: {output_path}")
     return output_path
 
-def generate_text_report(stats, output_path="reports/test_report.txt"):
+def generate_text_report(stats, output_path="reports/test_report.txt", metrics=None):
     """
     Genere un rapport texte simple
     """
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    metrics = metrics or compute_report_metrics(stats)
     
     content = f"""
 RAPPORT DE TESTS AUTOMATISES
-Date: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}
+Date: {metrics['generated_at'].strftime('%d/%m/%Y %H:%M:%S')}
 
 STATISTIQUES:
-- Tests totaux: {stats.get('total_tests', 0)}
-- Reussis: {stats.get('total_tests', 0) - stats.get('failures', 0) - stats.get('errors', 0) - stats.get('skipped', 0)}
-- Echecs: {stats.get('failures', 0)}
-- Erreurs: {stats.get('errors', 0)}
-- Ignores: {stats.get('skipped', 0)}
+- Tests totaux: {metrics['total_tests']}
+- Reussis: {metrics['passed']}
+- Echecs: {metrics['failures']}
+- Erreurs: {metrics['errors']}
+- Ignores: {metrics['skipped']}
+
+Taux de reussite: {metrics['success_rate']:.1f}%
+Temps d'execution: {metrics['time']:.2f}s
+    """
+    
+    _atomic_write(output_path, lambda f: f.write(content))
+    
+    print(f"Rapport genere: {output_path}")
+    return output_path
+
+def generate_json_summary(stats, output_path="reports/test_report.json", metrics=None):
+    """
+    Genere un resume JSON (totaux, resultats par classe, causes d'echec, anomalies) exploitable par la CI
+    """
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    metrics = metrics or compute_report_metrics(stats)
+    
+    summary = {
+        "generated_at": metrics['generated_at'].isoformat(timespec="seconds"),
+        "total_tests": metrics['total_tests'],
+        "passed": metrics['passed'],
+        "failures": metrics['failures'],
+        "errors": metrics['errors'],
+        "skipped": metrics['skipped'],
+        "success_rate": metrics['success_rate'],
+        "time": metrics['time'],
+        "suites": metrics['suites'][:SUITE_ROWS],
+        "durations": metrics['durations'],
+        "failure_clusters": stats.get('failure_clusters', [])[:SUMMARY_CLUSTERS],
+        "anomalies": stats.get('anomalies', []),
+    }
+    _atomic_write(output_path, lambda f: json.dump(summary, f, indent=2, ensure_ascii=False))
+    
+    print(f"Rapport genere: {output_path}")
+    return output_path
+
+def generate_junit_summary(stats, output_path="reports/test_report.xml", metrics=None):
+    """
+    Genere un resume au format JUnit: cas en echec uniquement, totaux de l'execution en proprietes
+    
+    Les attributs de la suite decrivent les testcases ecrits (un outil CI qui les
+    recompte trouve les memes valeurs); les totaux de l'execution complete sont
+    repris dans <properties>.
+    """
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    metrics = metrics or compute_report_metrics(stats)
+    test_cases = metrics['test_cases']
+    failing = metrics['failing']
+    
+    if isinstance(test_cases, TestCaseTable):
+        codes = np.frombuffer(test_cases.statuses, dtype=np.uint8)[failing]
+        errors = int(np.count_nonzero(codes == STATUS_CODES["error"]))
+        duration = float(np.frombuffer(test_cases.times, dtype=np.float64)[failing].sum())
+    else:
+        errors = sum(1 for i in failing if test_cases[i].get("status") == "error")
+        duration = sum(test_cases[i].get("time", 0) for i in failing)
+    totals = (("total_tests", metrics["total_tests"]), ("passed", metrics["passed"]),
+              ("failures", metrics["failures"]), ("errors", metrics["errors"]), ("skipped", metrics["skipped"]),
+              ("success_rate", metrics["success_rate"]), ("time", metrics["time"]))
+    
+    def write(f):
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write(f'<testsuite name="Agent MCP QA" tests="{len(failing)}" failures="{len(failing) - errors}" '
+                f'errors="{errors}" skipped="0" time="{duration:.3f}" '
+                f'timestamp="{metrics["generated_at"].isoformat(timespec="seconds")}">\n')
+        f.write('    <properties>\n')
+        f.write("".join(f'        <property name="{name}" value="{value}"/>\n' for name, value in totals))
+        f.write('    </properties>\n')
+        _write_rows(f, _case_rows(test_cases, failing.tolist()), _render_junit_case)
+        f.write('</testsuite>\n')
+    
+    _atomic_write(output_path, write)
+    
+    print(f"Rapport genere: {output_path}")
+    return output_path
+
+_GENERATORS = {
+    "html": generate_html_report,
+    "text": generate_text_report,
+    "json": generate_json_summary,
+    "junit": generate_junit_summary,
+}
+
+# Statistiques en cours de rendu, heritees par les processus forkes de render_reports;
+# le verrou empeche deux rendus concurrents de forker avec les statistiques de l'autre
+_RENDER_JOB = None
+_RENDER_JOB_LOCK = threading.Lock()
+
+def _render_format(fmt, output_path, options, job=None):
+    stats, metrics = job if job is not None else _RENDER_JOB
+    return _GENERATORS[fmt](stats, output_path, metrics=metrics, **options)
 
-Taux de reussite: {stats.get('success_rate', 0):.1f}%
-Temps d'execution: {stats.get('time', 0):.2f}s
+def render_reports(stats, output_dir="reports", formats=tuple(REPORT_FORMATS), basename="test_report",
+                   incremental=False):
     """
+    Produit plusieurs formats de rapport en une seule passe
+    
+    Les valeurs derivees (reussis, date, cas en echec) sont calculees une fois
+    puis partagees. Chaque format est rendu dans son propre processus, forke
+    apres le calcul: les statistiques sont heritees sans serialisation et les
+    formats lourds (HTML, JUnit) s'executent en parallele malgre le GIL. Sans
+    fork (Windows, macOS), les formats sont rendus dans des threads. Toutes
+    les ecritures sont atomiques (fichier temporaire + renommage).
+    
+    Args:
+        stats: Dictionnaire contenant les statistiques
+        output_dir: Repertoire de sortie
+        formats: Formats a produire parmi REPORT_FORMATS
+        basename: Nom des fichiers sans extension
+        incremental: Regeneration incrementale du rapport HTML (voir generate_html_report)
+    
+    Returns:
+        dict: Chemin genere par format
+    """
+    global _RENDER_JOB
+    unknown = [fmt for fmt in formats if fmt not in REPORT_FORMATS]
+    if unknown:
+        raise ValueError(f"Formats de rapport inconnus: {', '.join(unknown)}")
+    
+    os.makedirs(output_dir, exist_ok=True)
+    job = (stats, compute_report_metrics(stats))
+    jobs = [(fmt, os.path.join(output_dir, basename + REPORT_FORMATS[fmt]),
+             {"incremental": incremental} if fmt == "html" else {}) for fmt in formats]
+    
+    workers = max(len(formats), 1)
+    if workers > 1 and multiprocessing.get_start_method() == "fork":
+        # Les processus sont forkes pendant les submit: _RENDER_JOB n'est visible que d'eux
+        with _RENDER_JOB_LOCK:
+            _RENDER_JOB = job
+            try:
+                executor = ProcessPoolExecutor(max_workers=workers)
+                futures = {fmt: executor.submit(_render_format, fmt, path, options) for fmt, path, options in jobs}
+            finally:
+                _RENDER_JOB = None
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = {fmt: executor.submit(_render_format, fmt, path, options, job) for fmt, path, options in jobs}
+    
+    with executor:
+        return {fmt: future.result() for fmt, future in futures.items()}
+
+class TrendAggregates:
+    """
+    Series de tendances pre-agregees (min/max/moyenne par tranche d'executions)
+    
+    Chaque execution est ajoutee a la derniere tranche; quand le nombre de
+    tranches depasse max_points, les tranches voisines sont fusionnees deux a
+    deux et la taille des tranches double. L'ajout coute O(1) amorti et le
+    fichier reste borne a max_points tranches, quel que soit le nombre
+    d'executions: le rendu ne relit jamais les rapports historiques.
+    """
+    
+    def __init__(self, path="reports/trends.json", max_points=DEFAULT_TREND_POINTS):
+        self.path = path
+        self.max_points = max_points
+        self.bucket_size = 1
+        self.runs = 0
+        self.last_run_id = 0
+        self.source = None
+        self.buckets = []
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            self.bucket_size = data["bucket_size"]
+            self.runs = data["runs"]
+            self.last_run_id = data["last_run_id"]
+            self.source = data.get("source")
+            self.buckets = data["buckets"]
+    
+    @staticmethod
+    def _merge(a, b):
+        merged = {"start": a["start"], "end": b["end"], "count": a["count"] + b["count"]}
+        for key, _, _ in TREND_SERIES:
+            merged[key] = [min(a[key][0], b[key][0]), max(a[key][1], b[key][1]), a[key][2] + b[key][2]]
+        return merged
+    
+    def append(self, stats, timestamp=None):
+        """
+        Ajoute une execution (statistiques de analyze_report ou ligne de RunHistory)
+        """
+        if timestamp is None:
+            timestamp = datetime.now().timestamp()
+        values = {
+            "success_rate": stats.get('success_rate', 0) or 0,
+            "time": stats.get('time', 0) or 0,
+            "failures": (stats.get('failures', 0) or 0) + (stats.get('errors', 0) or 0),
+        }
+        
+        if self.buckets and self.buckets[-1]["count"] < self.bucket_size:
+            bucket = self.buckets[-1]
+            bucket["end"] = timestamp
+            bucket["count"] += 1
+            for key, value in values.items():
+                low, high, total = bucket[key]
+                bucket[key] = [min(low, value), max(high, value), total + value]
+        else:
+            bucket = {"start": timestamp, "end": timestamp, "count": 1}
+            bucket.update({key: [value, value, value] for key, value in values.items()})
+            self.buckets.append(bucket)
+        
+        if len(self.buckets) > self.max_points:
+            pairs = zip(self.buckets[0::2], self.buckets[1::2])
+            merged = [self._merge(a, b) for a, b in pairs]
+            if len(self.buckets) % 2:
+                merged.append(self.buckets[-1])
+            self.buckets = merged
+            self.bucket_size *= 2
+        self.runs += 1
+    
+    def update_from_history(self, history):
+        """
+        Ajoute les executions de RunHistory posterieures a la derniere deja agregee
+        
+        Returns:
+            int: Nombre d'executions ajoutees
+        """
+        if self.source != os.path.abspath(history.db_path):
+            # Autre base d'historique: les agregats ne correspondent plus
+            self.bucket_size, self.runs, self.last_run_id, self.buckets = 1, 0, 0, []
+            self.source = os.path.abspath(history.db_path)
+        
+        added = 0
+        for run_id, created_at, success_rate, duration, failures, errors in history.conn.execute(
+                "SELECT id, created_at, success_rate, time, failures, errors FROM runs WHERE id > ? ORDER BY id",
+                (self.last_run_id,)):
+            self.append({"success_rate": success_rate, "time": duration, "failures": failures, "errors": errors},
+                        timestamp=created_at)
+            self.last_run_id = run_id
+            added += 1
+        return added
+    
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = {"bucket_size": self.bucket_size, "runs": self.runs, "last_run_id": self.last_run_id,
+                "source": self.source, "buckets": self.buckets}
+        _atomic_write(self.path, lambda f: json.dump(data, f, separators=(",", ":")))
+    
+    def series(self, key):
+        """
+        Retourne (debut, fin, min, max, moyenne) par tranche pour une serie
+        """
+        return [(b["start"], b["end"], b[key][0], b[key][1], b[key][2] / b["count"]) for b in self.buckets]
+
+def _render_trend_chart(points, unit, width=1000, height=220, margin=40):
+    """
+    Graphique SVG en ligne: bande min/max et courbe de la moyenne par tranche
+    """
+    if not points:
+        return '<p>Aucune execution enregistree.</p>'
+    
+    low = min(p[2] for p in points)
+    high = max(p[3] for p in points)
+    span = (high - low) or 1.0
+    step = (width - 2 * margin) / max(len(points) - 1, 1)
+    
+    def x(i):
+        return f"{margin + i * step:.1f}"
+    
+    def y(value):
+        return f"{height - margin - (value - low) / span * (height - 2 * margin):.1f}"
+    
+    band = [f"{x(i)},{y(p[3])}" for i, p in enumerate(points)]
+    band += [f"{x(i)},{y(p[2])}" for i, p in reversed(list(enumerate(points)))]
+    line = [f"{x(i)},{y(p[4])}" for i, p in enumerate(points)]
+    first = datetime.fromtimestamp(points[0][0]).strftime('%d/%m/%Y')
+    last = datetime.fromtimestamp(points[-1][1]).strftime('%d/%m/%Y')
+    return f"""<svg class="chart" viewBox="0 0 {width} {height}" xmlns="http://www.w3.org/2000/svg">
+            <polygon class="chart-band" points="{' '.join(band)}"/>
+            <polyline class="chart-line" points="{' '.join(line)}"/>
+            <text class="chart-label" x="{margin}" y="{margin - 10}">{high:.1f}{unit}</text>
+            <text class="chart-label" x="{margin}" y="{height - margin + 15}">{low:.1f}{unit}</text>
+            <text class="chart-label" x="{margin}" y="{height - 5}">{first}</text>
+            <text class="chart-label" x="{width - margin}" y="{height - 5}" text-anchor="end">{last}</text>
+        </svg>"""
+
+def generate_trend_report(history=None, output_path="reports/trend_report.html", aggregates_path=None,
+                          max_points=DEFAULT_TREND_POINTS):
+    """
+    Genere un tableau de bord HTML des tendances (taux de reussite, duree, echecs)
+    
+    Les series sont lues dans un fichier d'agregats (trends.json a cote du
+    rapport par defaut), mis a jour uniquement avec les executions de
+    l'historique qui n'y figurent pas encore.
+    
+    Args:
+        history: RunHistory source des executions (optionnel)
+        output_path: Chemin du fichier de sortie
+        aggregates_path: Fichier des agregats (par defaut <repertoire du rapport>/trends.json)
+        max_points: Nombre maximal de points par serie
+    
+    Returns:
+        str: Chemin du fichier genere
+    """
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    trends = TrendAggregates(aggregates_path or os.path.join(os.path.dirname(output_path), "trends.json"), max_points)
+    if history is not None and trends.update_from_history(history):
+        trends.save()
+    
+    now = datetime.now()
+    sections = []
+    for key, label, unit in TREND_SERIES:
+        sections.append(f"""
+        <h2>{label}</h2>
+        {_render_trend_chart(trends.series(key), unit)}
+""")
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(content)
+    content = (_HTML_HEAD.format(title=f"Tendances des Tests - {now.strftime('%Y-%m-%d')}",
+                                 heading="Tendances des Tests", date=now.strftime('%d/%m/%Y %H:%M:%S'))
+               + f"""        <p><strong>Executions:</strong> {trends.runs} ({trends.bucket_size} par point)</p>
+"""
+               + "".join(sections) + _HTML_FOOT)
+    _atomic_write(output_path, lambda f: f.write(content))
     
     print(f"Rapport genere: {output_path}")
     return output_path
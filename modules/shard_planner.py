@@ -0,0 +1,104 @@
+import heapq
+from collections.abc import Mapping
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .case_table import STATUS_CODES, TestCaseTable
+from .history import case_key
+
+def durations_from_stats(stats_list) -> Dict[str, float]:
+    """
+    Duree moyenne par test (classname.name) sur une ou plusieurs executions analysees
+
+    Les tests ignores ne sont pas comptes: leur duree quasi nulle sous-estimerait
+    leur cout reel. Un test present plusieurs fois dans une execution compte
+    pour la somme de ses durees, comme dans RunHistory.
+
+    Args:
+        stats_list: Resultat de analyze_report ou liste de resultats
+
+    Returns:
+        Dict[str, float]: Duree moyenne en secondes par test
+    """
+    if isinstance(stats_list, Mapping):
+        stats_list = [stats_list]
+
+    totals, runs = {}, {}
+    for stats in stats_list:
+        run = {}
+        test_cases = stats.get("test_cases", [])
+        if isinstance(test_cases, TestCaseTable):
+            classnames = test_cases.classnames
+            skipped = STATUS_CODES["skipped"]
+            for name, classname_id, time, status in zip(test_cases.names, test_cases.classname_ids,
+                                                        test_cases.times, test_cases.statuses):
+                if status != skipped:
+                    key = f"{classnames[classname_id]}.{name}" if classnames[classname_id] else name
+                    run[key] = run.get(key, 0.0) + time
+        else:
+            for case in test_cases:
+                if case["status"] != "skipped":
+                    key = case_key(case)
+                    run[key] = run.get(key, 0.0) + case["time"]
+
+        for key, time in run.items():
+            totals[key] = totals.get(key, 0.0) + time
+            runs[key] = runs.get(key, 0) + 1
+
+    return {key: total / runs[key] for key, total in totals.items()}
+
+def plan_shards(durations: Mapping, shard_count: int, tests: Optional[Iterable[str]] = None,
+                default_duration: Optional[float] = None) -> Dict:
+    """
+    Repartit les tests en shards de durees equilibrees (heuristique LPT)
+
+    Les tests sont affectes du plus long au plus court au shard le moins charge,
+    ce qui garantit un temps total au plus 4/3 de l'optimum. Un test sans
+    historique recoit la duree mediane des tests connus (ou default_duration).
+
+    Args:
+        durations (Mapping): Duree historique par test (voir durations_from_stats, RunHistory.mean_durations)
+        shard_count (int): Nombre de shards
+        tests (Iterable[str], optional): Tests a planifier (par defaut ceux de durations)
+        default_duration (float, optional): Estimation pour les tests sans historique
+
+    Returns:
+        Dict: Shards (tests et duree estimee), temps total estime et desequilibre
+    """
+    if shard_count < 1:
+        return {"error": "Le nombre de shards doit etre superieur ou egal a 1"}
+
+    tests = list(durations) if tests is None else list(dict.fromkeys(tests))
+    if default_duration is None:
+        default_duration = float(np.median(np.fromiter(durations.values(), dtype=np.float64))) if durations else 1.0
+
+    weights = np.fromiter((durations.get(test, -1.0) for test in tests), dtype=np.float64, count=len(tests))
+    unseen = weights < 0
+    weights[unseen] = default_duration
+
+    # Tri stable: a duree egale, l'ordre d'entree est conserve et le plan est deterministe
+    order = np.argsort(-weights, kind='stable').tolist()
+    weight_list = weights.tolist()
+    heap = [(0.0, shard) for shard in range(shard_count)]
+    assignment: List[List[str]] = [[] for _ in range(shard_count)]
+    for index in order:
+        load, shard = heap[0]
+        assignment[shard].append(tests[index])
+        heapq.heapreplace(heap, (load + weight_list[index], shard))
+
+    loads = [0.0] * shard_count
+    for load, shard in heap:
+        loads[shard] = load
+    makespan = max(loads)
+    mean = sum(loads) / shard_count
+
+    return {
+        "shard_count": shard_count,
+        "shards": [{"index": shard, "tests": assignment[shard], "estimated_time": loads[shard]}
+                   for shard in range(shard_count)],
+        "estimated_time": makespan,
+        "imbalance": makespan / mean if mean > 0 else 1.0,
+        "unseen_tests": int(unseen.sum()),
+        "default_duration": default_duration
+    }
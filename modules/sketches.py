@@ -0,0 +1,234 @@
+import heapq
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Erreur relative maximale des quantiles estimes (1%)
+DEFAULT_RELATIVE_ACCURACY = 0.01
+# Nombre de tests les plus lents conserves
+DEFAULT_TOP_N = 100
+# Durees (secondes) en dessous desquelles une valeur est comptee comme nulle
+_MIN_INDEXABLE = 1e-6
+# Cle des valeurs nulles dans les lots (add_batch)
+_ZERO_KEY = np.iinfo(np.int64).min
+
+class QuantileSketch:
+    """
+    Esquisse de quantiles a compartiments logarithmiques (type DDSketch)
+
+    Chaque valeur est comptee dans le compartiment ceil(log_gamma(v)): tout
+    quantile est restitue avec une erreur relative <= relative_accuracy, avec
+    une memoire proportionnelle au logarithme de l'etendue des valeurs. Deux
+    esquisses de meme precision se fusionnent exactement en sommant leurs
+    compartiments.
+    """
+    __slots__ = ("relative_accuracy", "_gamma", "_log_gamma", "bins", "zero_count", "count", "sum_ns", "min", "max")
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        # Somme en nanosecondes entieres: la fusion reste exacte et associative (comme merge_stats)
+        self.sum_ns = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.sum_ns += round(value * 1e9)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value < _MIN_INDEXABLE:
+            self.zero_count += 1
+        else:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[key] = self.bins.get(key, 0) + 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Impossible de fusionner des esquisses de precisions differentes")
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum_ns += other.sum_ns
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Valeur au quantile q (0 <= q <= 1), a relative_accuracy pres
+        """
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return max(self.min, 0.0)
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if rank < seen:
+                # Milieu (au sens relatif) du compartiment ]gamma^(k-1), gamma^k]
+                value = 2 * self._gamma ** key / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+class TopN:
+    """
+    Les N plus grandes valeurs rencontrees (tas borne), fusionnable exactement
+    """
+    __slots__ = ("size", "_heap")
+
+    def __init__(self, size: int = DEFAULT_TOP_N):
+        self.size = size
+        self._heap: List[Tuple[float, tuple]] = []
+
+    def add(self, value: float, item: tuple) -> None:
+        entry = (value, item)
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def merge(self, other: "TopN") -> None:
+        for value, item in other._heap:
+            self.add(value, item)
+
+    def items(self) -> List[Tuple[float, tuple]]:
+        return sorted(self._heap, reverse=True)
+
+def _describe(sketch: QuantileSketch) -> Dict:
+    return {
+        "count": sketch.count,
+        "mean": sketch.sum_ns / sketch.count / 1e9,
+        "p50": sketch.quantile(0.50),
+        "p90": sketch.quantile(0.90),
+        "p99": sketch.quantile(0.99),
+        "max": sketch.max
+    }
+
+class DurationStats:
+    """
+    Percentiles de duree par classname et tests les plus lents d'une execution
+
+    Alimente pendant le parsing, cas par cas ou par lots (memoire independante
+    du nombre de cas), et fusionnable exactement entre tranches ou rapports
+    paralleles.
+    """
+    __slots__ = ("relative_accuracy", "by_classname", "slowest")
+
+    def __init__(self, top_n: int = DEFAULT_TOP_N, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.by_classname: Dict[str, QuantileSketch] = {}
+        self.slowest = TopN(top_n)
+
+    def add(self, classname: str, name: str, time: float) -> None:
+        sketch = self.by_classname.get(classname)
+        if sketch is None:
+            sketch = self.by_classname[classname] = QuantileSketch(self.relative_accuracy)
+        sketch.add(time)
+        # Test rapide avant de construire l'entree: la plupart des cas ne rentrent pas dans le tas
+        heap = self.slowest._heap
+        if len(heap) < self.slowest.size or time >= heap[0][0]:
+            self.slowest.add(time, (classname, name))
+
+    def add_batch(self, classnames: Sequence[str], class_ids: np.ndarray, times: np.ndarray,
+                  names: Sequence[str], rows: np.ndarray) -> None:
+        """
+        Ajoute un lot de cas en une passe NumPy (equivalent a add() cas par cas)
+
+        Args:
+            classnames: Classnames indexes par class_ids
+            class_ids (np.ndarray): Classname de chaque cas
+            times (np.ndarray): Duree de chaque cas
+            names: Noms des tests, indexes par rows
+            rows (np.ndarray): Indice de chaque cas dans names
+        """
+        if len(times) == 0:
+            return
+
+        zero = times < _MIN_INDEXABLE
+        keys = np.ceil(np.log(np.where(zero, 1.0, times)) / math.log(
+            (1 + self.relative_accuracy) / (1 - self.relative_accuracy))).astype(np.int64)
+        keys[zero] = _ZERO_KEY
+
+        # Tri par (classname, compartiment): chaque plage contigue est un compartiment a incrementer
+        order = np.lexsort((keys, class_ids))
+        ids, keys, ordered = class_ids[order], keys[order], times[order]
+        new_class = np.empty(len(ids), dtype=bool)
+        new_class[0] = True
+        new_class[1:] = ids[1:] != ids[:-1]
+        new_bin = new_class.copy()
+        new_bin[1:] |= keys[1:] != keys[:-1]
+        class_starts = np.flatnonzero(new_class)
+        bin_starts = np.flatnonzero(new_bin)
+
+        sketches = {}
+        for cid, count, total, low, high in zip(
+                ids[class_starts].tolist(), np.diff(np.append(class_starts, len(ids))).tolist(),
+                np.add.reduceat(np.rint(ordered * 1e9).astype(np.int64), class_starts).tolist(), np.minimum.reduceat(ordered, class_starts).tolist(),
+                np.maximum.reduceat(ordered, class_starts).tolist()):
+            classname = classnames[cid]
+            sketch = self.by_classname.get(classname)
+            if sketch is None:
+                sketch = self.by_classname[classname] = QuantileSketch(self.relative_accuracy)
+            sketch.count += count
+            sketch.sum_ns += total
+            sketch.min = min(sketch.min, low)
+            sketch.max = max(sketch.max, high)
+            sketches[cid] = sketch
+
+        for cid, key, count in zip(ids[bin_starts].tolist(), keys[bin_starts].tolist(),
+                                   np.diff(np.append(bin_starts, len(ids))).tolist()):
+            sketch = sketches[cid]
+            if key == _ZERO_KEY:
+                sketch.zero_count += count
+            else:
+                sketch.bins[key] = sketch.bins.get(key, 0) + count
+
+        size = self.slowest.size
+        if len(times) > size:
+            candidates = np.argpartition(times, len(times) - size)[len(times) - size:]
+        else:
+            candidates = np.arange(len(times))
+        heap = self.slowest._heap
+        for index, time, cid in zip(rows[candidates].tolist(), times[candidates].tolist(),
+                                    class_ids[candidates].tolist()):
+            if len(heap) < size or time >= heap[0][0]:
+                self.slowest.add(time, (classnames[cid], names[index]))
+
+    def merge(self, other: "DurationStats") -> None:
+        for classname, sketch in other.by_classname.items():
+            mine = self.by_classname.get(classname)
+            if mine is None:
+                mine = self.by_classname[classname] = QuantileSketch(self.relative_accuracy)
+            mine.merge(sketch)
+        self.slowest.merge(other.slowest)
+
+    def overall(self) -> QuantileSketch:
+        total = QuantileSketch(self.relative_accuracy)
+        for sketch in self.by_classname.values():
+            total.merge(sketch)
+        return total
+
+    def summary(self, limit: Optional[int] = None) -> Dict:
+        """
+        Percentiles globaux, par classname (p99 decroissant, `limit` premiers) et
+        tests les plus lents, en secondes
+        """
+        by_classname = [dict(_describe(sketch), classname=classname)
+                        for classname, sketch in self.by_classname.items()]
+        by_classname.sort(key=lambda row: (-row["p99"], row["classname"]))
+        overall = self.overall()
+        return {
+            "overall": _describe(overall) if overall.count else {"count": 0},
+            "by_classname": by_classname[:limit] if limit else by_classname,
+            "slowest": [{"classname": classname, "name": name, "time": time}
+                        for time, (classname, name) in self.slowest.items()]
+        }
@@ -1,17 +1,56 @@
+import json
 import os
 import sys
+import threading
+from contextlib import contextmanager
 from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 def print_header(title):
     print("\n" + "="*60)
     print(f"  {title}")
     print("="*60)
 
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Base des serveurs CI/Jira simules: HTTP/1.1 (keep-alive), sans journal
+    """
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, *args):
+        pass
+    
+    def send_body(self, data, status=200, headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def send_json(self, body, status=200, headers=()):
+        self.send_body(json.dumps(body).encode(), status, headers)
+
+@contextmanager
+def stand_in_server(handler):
+    """
+    Serveur HTTP local servant `handler`; renvoie son URL et l'arrete en sortie de bloc, meme en cas d'erreur
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    # Les connexions abandonnees par le client (reprise de telechargement) ne sont pas des erreurs du test
+    server.handle_error = lambda *args: None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
 def test_imports():
     print_header("Test 1: Verification des imports")
     try:
         from modules.generator import generate_selenium_test, generate_appium_test
-        from modules.analyzer import parse_junit_xml, detect_anomalies
+        from modules.analyzer import analyze_junit_xml, detect_anomalies
         from modules.reporter import generate_html_report, generate_text_report
         from modules.ci_cd_connector import JenkinsConnector, GitLabConnector
         from modules.jira_connector import JiraConnector
@@ -167,6 +206,1186 @@ def test_connectors():
         print(f"❌ Erreur lors du test des connecteurs: {e}")
         return False
 
+def test_junit_parsing():
+    print_header("Test 6: Parsing JUnit (complet, flux, decoupe et table colonne)")
+    try:
+        import tempfile
+        from modules.analyzer import analyze_junit_xml, merge_stats
+        
+        print("\n🧾 Analyse d'un rapport JUnit imbrique...")
+        xml = """<testsuites tests="3" failures="1" errors="0" skipped="1" time="2.5">
+    <testsuite name="outer"><testsuite name="inner">
+        <testcase name="ok" classname="pkg.A" time="1.0"/>
+        <testcase name="ko" classname="pkg.A" time="0.5"><failure message="boom" type="AssertionError"/></testcase>
+    </testsuite></testsuite>
+    <testsuite name="other"><testcase name="skip" classname="pkg.B" time="1.0"><skipped/></testcase></testsuite>
+</testsuites>"""
+        with tempfile.NamedTemporaryFile('w', suffix='.xml', delete=False) as f:
+            f.write(xml)
+        
+        full = analyze_junit_xml(f.name)
+        streamed = analyze_junit_xml(f.name, streaming=True)
+        sharded = analyze_junit_xml(f.name, workers=2)
+        os.remove(f.name)
+        
+        print("\n🧾 Decoupe d'un rapport avec espace de noms et entite DOCTYPE...")
+        variants = {
+            "namespace": """<?xml version="1.0"?>
+<testsuites xmlns:x="urn:x" tests="2">
+    <testsuite name="a"><testcase name="one" classname="pkg.A" x:owner="qa" time="0.1"/></testsuite>
+    <testsuite name="b"><testcase name="two" classname="pkg.B" x:owner="dev" time="0.2"><failure message="x"/></testcase></testsuite>
+</testsuites>""",
+            "doctype": """<?xml version="1.0"?>
+<!DOCTYPE testsuites [<!ENTITY pkg "com.example"><!ENTITY msg "expected &gt; 1">]>
+<!-- genere par le runner -->
+<testsuites name="&pkg;" tests="2">
+    <testsuite name="a"><testcase name="one" classname="&pkg;.A" time="0.1"/></testsuite>
+    <testsuite name="b"><testcase name="two" classname="&pkg;.B" time="0.2"><failure message="&msg;"/></testcase></testsuite>
+</testsuites>""",
+        }
+        variants_ok = True
+        for label, content in variants.items():
+            with tempfile.NamedTemporaryFile('w', suffix='.xml', delete=False) as f:
+                f.write(content)
+            serial = analyze_junit_xml(f.name)
+            split = analyze_junit_xml(f.name, workers=2)
+            os.remove(f.name)
+            if "error" in serial or serial != split or len(serial["test_cases"]) != 2:
+                print(f"❌ Decoupe differente du parsing complet ({label}): {split.get('error')}")
+                variants_ok = False
+        
+        cases = streamed["test_cases"]
+        expected_failure = {"name": "ko", "classname": "pkg.A", "time": 0.5, "status": "failed",
+                            "failure_message": "boom", "failure_type": "AssertionError"}
+        merged = merge_stats([full, streamed])
+        
+        if (variants_ok and full == streamed == sharded and len(cases) == 3 and cases[1] == expected_failure
+                and merged["total_tests"] == 6 and len(merged["test_cases"]) == 6):
+            print(f"✅ Parsing coherent: {len(cases)} cas, taux {streamed['success_rate']:.1f}%")
+            return True
+        else:
+            print("❌ Resultats differents entre parsing complet et en flux")
+            return False
+    except Exception as e:
+        print(f"❌ Erreur lors du parsing JUnit: {e}")
+        return False
+
+def test_artifact_stream():
+    print_header("Test 7: Analyse d'un artifact en flux (zip, zip en flux, tar.gz, .gz; JSON non Newman ignores)")
+    try:
+        import gzip
+        import io
+        import tarfile
+        import zipfile
+        from modules.analyzer import analyze_artifact_stream
+        
+        class ForwardOnly(io.RawIOBase):
+            """
+            Flux lisible une seule fois, sans seek ni tell, comme un corps de reponse HTTP
+            """
+            def __init__(self, data):
+                self._data = io.BytesIO(data)
+            
+            def readable(self):
+                return True
+            
+            def readinto(self, buffer):
+                chunk = self._data.read(min(len(buffer), 8192))
+                buffer[:len(chunk)] = chunk
+                return len(chunk)
+        
+        class Sink(io.RawIOBase):
+            """
+            Destination non positionnable: zipfile y ecrit des descripteurs de donnees
+            """
+            def __init__(self):
+                self.data = bytearray()
+            
+            def writable(self):
+                return True
+            
+            def write(self, chunk):
+                self.data += chunk
+                return len(chunk)
+        
+        xml = """<testsuite tests="2" failures="1"><testcase name="ok" classname="pkg.A" time="0.1"/>
+    <testcase name="ko" classname="pkg.A" time="0.2"><failure message="boom"/></testcase></testsuite>"""
+        # Rapport de plusieurs blocs compresses: le flux deflate deborde sur le descripteur
+        large = ('<testsuite tests="20000">' + "".join(f'<testcase name="t{i}" classname="pkg.Large" time="0.001"/>'
+                                                       for i in range(20000)) + "</testsuite>")
+        members = {"results/junit.xml": xml, "results/list.json": "[1, 2]",
+                   "package.json": '{"name": "app", "version": "1.0.0"}', "results/large.xml": large}
+        
+        print("\n📦 Archive avec un rapport JUnit, un JSON tableau et un package.json...")
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            for name in list(members)[:3]:
+                archive.writestr(name, members[name])
+        buffer.seek(0)
+        stats = analyze_artifact_stream(buffer, "artifacts.zip")
+        
+        print("🌊 Zip ecrit en flux (descripteurs de donnees), tar.gz et rapport .gz lus sans retour arriere...")
+        sink = Sink()
+        with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as archive:
+            for name, content in members.items():
+                archive.writestr(name, content)
+        streamed_zip = bytes(sink.data)
+        has_descriptors = bool(int.from_bytes(streamed_zip[6:8], "little") & 0x8)
+        
+        tar_buffer = io.BytesIO()
+        with tarfile.open(fileobj=tar_buffer, mode="w:gz") as archive:
+            for name, content in members.items():
+                data = content.encode()
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+        
+        zip_stats = analyze_artifact_stream(ForwardOnly(streamed_zip), "artifacts.zip")
+        tar_stats = analyze_artifact_stream(ForwardOnly(tar_buffer.getvalue()), "artifacts.tar.gz")
+        gz_stats = analyze_artifact_stream(ForwardOnly(gzip.compress(large.encode())), "large.xml.gz")
+        
+        if ("error" not in stats and stats["reports"] == 1 and stats["total_tests"] == 2
+                and len(stats.get("shard_errors", [])) == 2 and has_descriptors
+                and all("error" not in s and s["reports"] == 2 and s["total_tests"] == 20002 and s["failures"] == 1
+                        and len(s.get("shard_errors", [])) == 2 for s in (zip_stats, tar_stats))
+                and gz_stats.get("total_tests") == 20000):
+            print(f"✅ 1 rapport analyse, {len(stats['shard_errors'])} fichiers JSON ecartes; "
+                  f"zip en flux, tar.gz et .gz: {zip_stats['total_tests']} tests")
+            return True
+        else:
+            print(f"❌ Resultat inattendu: zip={stats.get('reports')}/{stats.get('shard_errors', stats.get('error'))}, "
+                  f"zip en flux={zip_stats.get('total_tests', zip_stats.get('error'))}, "
+                  f"tar.gz={tar_stats.get('total_tests', tar_stats.get('error'))}, "
+                  f".gz={gz_stats.get('total_tests', gz_stats.get('error'))}")
+            return False
+    except Exception as e:
+        print(f"❌ Erreur lors de l'analyse de l'artifact: {e}")
+        return False
+
+def test_async_connectors():
+    print_header("Test 8: Connecteurs CI asynchrones (serveur local)")
+    try:
+        import asyncio
+        import time
+        from modules.ci_cd_async import AsyncJenkinsConnector, AsyncGitLabConnector, create_session, fetch_statuses
+        
+        class StandIn(StandInHandler):
+            def do_GET(self):
+                if "/job/" in self.path:
+                    self.send_json({"building": False, "result": "SUCCESS", "duration": 42})
+                else:
+                    self.send_json({"status": "running", "ref": "main", "duration": None})
+        
+        async def sweep(base_url):
+            # Options par defaut: pas de limite de debit, seule la concurrence borne la vague
+            async with create_session() as session:
+                jenkins = AsyncJenkinsConnector(base_url, "test", "token", session=session)
+                gitlab = AsyncGitLabConnector(base_url, "token", session=session)
+                start = time.perf_counter()
+                results = await fetch_statuses(jenkins, [("job", i) for i in range(150)],
+                                               gitlab, [("project", i) for i in range(150)])
+                return results, time.perf_counter() - start
+        
+        async def limited(base_url):
+            async with AsyncJenkinsConnector(base_url, "test", "token", rate_limit=20) as jenkins:
+                start = time.perf_counter()
+                await jenkins.get_build_statuses([("job", i) for i in range(30)])
+                return time.perf_counter() - start
+        
+        print("\n📡 Interrogation de 150 builds et 150 pipelines en parallele...")
+        with stand_in_server(StandIn) as base_url:
+            results, elapsed = asyncio.run(sweep(base_url))
+            # 20 requetes en rafale puis 10 a 20/s: au moins 0.5s
+            limited_elapsed = asyncio.run(limited(base_url))
+        
+        statuses = list(results["builds"].values()) + list(results["pipelines"].values())
+        if (len(statuses) == 300 and all(s["status"] == "success" for s in statuses) and elapsed < 5
+                and limited_elapsed >= 0.45):
+            print(f"✅ {len(statuses)} statuts recuperes en {elapsed:.2f}s, debit limite respecte ({limited_elapsed:.2f}s)")
+            return True
+        else:
+            print(f"❌ Statuts manquants, en erreur ou trop lents ({elapsed:.2f}s, limite {limited_elapsed:.2f}s)")
+            return False
+    except Exception as e:
+        print(f"❌ Erreur lors du test des connecteurs asynchrones: {e}")
+        return False
+
+def test_report_directory():
+    print_header("Test 9: Analyse d'un repertoire de rapports (fichiers non reconnus ecartes)")
+    try:
+        import tempfile
+        from modules.analyzer import analyze_reports, merge_stats
+        
+        print("\n📂 Repertoire avec un rapport JUnit, un JSON tableau et un package.json...")
+        xml = """<testsuite tests="2" failures="1"><testcase name="ok" classname="pkg.A" time="0.1"/>
+    <testcase name="ko" classname="pkg.A" time="0.2"><failure message="boom"/></testcase></testsuite>"""
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "junit.xml"), "w") as f:
+                f.write(xml)
+            with open(os.path.join(directory, "list.json"), "w") as f:
+                f.write("[1, 2]")
+            with open(os.path.join(directory, "package.json"), "w") as f:
+                f.write('{"name": "app", "version": "1.0.0"}')
+            sequential = analyze_reports(directory, max_workers=1)
+            parallel = analyze_reports(directory, max_workers=2)
+        
+        merged = merge_stats([[1, 2], {"name": "app"}, {"error": "x"}])
+        
+        if (all("error" not in stats and stats["reports"] == 1 and stats["total_tests"] == 2
+                and len(stats.get("shard_errors", [])) == 2 for stats in (sequential, parallel))
+                and merged["reports"] == 0 and len(merged["shard_errors"]) == 3):
+            print(f"✅ 1 rapport analyse, {len(sequential['shard_errors'])} fichiers ecartes")
+            return True
+        else:
+            print(f"❌ Resultat inattendu: reports={sequential.get('reports')}, "
+                  f"erreurs={sequential.get('shard_errors', sequential.get('error'))}")
+            return False
+    except Exception as e:
+        print(f"❌ Erreur lors de l'analyse du repertoire: {e}")
+        return False
+
+def test_failure_clusters():
+    print_header("Test 10: Regroupement des echecs (table colonne et cache)")
+    try:
+        import tempfile
+        from modules import analyzer
+        from modules.case_table import TestCaseTable
+        from modules.clustering import cluster_failures
+        from modules.report_cache import ReportCache
+        
+        print("\n🧩 Regroupement de messages ne differant que par des nombres...")
+        cases = [{"name": f"t{i}", "classname": "pkg.A", "time": 0.1, "status": "passed"} for i in range(200)]
+        cases += [{"name": f"f{i}", "classname": "pkg.B", "time": 0.1, "status": "failed",
+                   "failure_message": f"timeout after {i} ms", "failure_type": "AssertionError"} for i in range(5)]
+        cases.append({"name": "e", "classname": "", "time": 0.1, "status": "error", "error_message": "DB down"})
+        from_table = cluster_failures(TestCaseTable(cases))
+        clusters_ok = (from_table == cluster_failures(cases) and [c["count"] for c in from_table] == [5, 1]
+                       and from_table[0]["message"] == "timeout after <N> ms" and from_table[1]["examples"][0]["test"] == "e")
+        
+        print("🗄️  Clusters servis par le cache sans nouveau regroupement...")
+        xml = """<testsuite><testcase name="a" classname="pkg.A" time="0.1"><failure message="boom 1"/></testcase>
+    <testcase name="b" classname="pkg.A" time="0.1"><failure message="boom 2"/></testcase></testsuite>"""
+        calls = []
+        original_cache, original_cluster = analyzer._report_cache, analyzer.cluster_failures
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "junit.xml")
+            with open(path, "w") as f:
+                f.write(xml)
+            try:
+                analyzer._report_cache = ReportCache(os.path.join(directory, "cache"))
+                first = analyzer.analyze_report(path, use_cache=True)
+                analyzer.cluster_failures = lambda test_cases: calls.append(1) or []
+                second = analyzer.analyze_report(path, use_cache=True)
+                analyzer._report_cache.close()
+            finally:
+                analyzer._report_cache, analyzer.cluster_failures = original_cache, original_cluster
+        
+        if clusters_ok and not calls and second["failure_clusters"] == first["failure_clusters"] \
+                and first["failure_clusters"][0]["count"] == 2:
+            print(f"✅ {len(from_table)} clusters, aucun regroupement sur le cache")
+            return True
+        else:
+            print(f"❌ Clusters inattendus: {from_table}, regroupements sur le cache: {len(calls)}")
+            return False
+    except Exception as e:
+        print(f"❌ Erreur lors du regroupement des echecs: {e}")
+        return False
+
+def test_run_history_durations():
+    print_header("Test 11: Historique des durees (stockage creux et retention)")
+    try:
+        import tempfile
+        from modules.history import RunHistory
+        
+        def run(count, slow=1.0):
+            return {"test_cases": [{"name": f"t{i}", "classname": "pkg.A", "status": "passed",
+                                    "time": slow if i == 0 else 1.0} for i in range(count)]}
+        
+        print("\n🕒 8 executions de 100 tests puis une execution partielle de 3 tests...")
+        with tempfile.TemporaryDirectory() as directory:
+            history = RunHistory(os.path.join(directory, "history.sqlite"), duration_runs=6)
+            for _ in range(7):
+                history.append_run(run(100))
+            history.append_run(run(100, slow=10.0))
+            regressions = history.duration_regressions()
+            history.append_run(run(3))
+            sizes = history.conn.execute("SELECT length(durations), length(test_ids) FROM run_durations "
+                                         "ORDER BY run_id").fetchall()
+            means = history.mean_durations()
+            history.close()
+        
+        if ([r["test_key"] for r in regressions] == ["pkg.A.t0"] and len(sizes) == 6
+                and sizes[-1] == (12, 12) and sizes[0] == (400, 400)
+                and len(means) == 100 and means["pkg.A.t1"] == 1.0):
+            print(f"✅ Regression detectee, {len(sizes)} executions conservees, execution partielle en 24 octets")
+            return True
+        else:
+            print(f"❌ Historique inattendu: regressions={regressions}, tailles={sizes}")
+            return False
+    except Exception as e:
+        print(f"❌ Erreur lors du test de l'historique des durees: {e}")
+        return False
+
+def test_run_history_index():
+    print_header("Test 12: Historique des executions (index de flakiness depuis la table colonne)")
+    try:
+        import tempfile
+        from modules.case_table import TestCaseTable
+        from modules.history import RunHistory
+        
+        def run(flaky, newly):
+            return [{"name": "flaky", "classname": "pkg.A", "time": 0.1, "status": flaky},
+                    {"name": "newly", "classname": "pkg.A", "time": 0.2, "status": newly},
+                    # Doublon: le test est en echec si une occurrence echoue
+                    {"name": "newly", "classname": "pkg.A", "time": 0.3, "status": "passed"},
+                    {"name": "ignored", "classname": "", "time": 0.0, "status": "skipped"}]
+        
+        print("\n📈 3 executions enregistrees depuis une TestCaseTable et une liste de dictionnaires...")
+        runs = [run("passed", "passed"), run("failed", "passed"), run("passed", "error")]
+        indexes = []
+        with tempfile.TemporaryDirectory() as directory:
+            for label, wrap in (("table", TestCaseTable), ("list", list)):
+                history = RunHistory(os.path.join(directory, f"{label}.sqlite"))
+                for cases in runs:
+                    history.append_run({"test_cases": wrap(cases)})
+                indexes.append((history.flaky_tests(min_score=0.75, min_runs=3), history.newly_failing(),
+                                history.mean_durations()))
+                history.close()
+        
+        flaky, newly, means = indexes[0]
+        if (indexes[0] == indexes[1] and [t["test_key"] for t in flaky] == ["pkg.A.flaky"]
+                and flaky[0]["transitions"] == 2 and flaky[0]["flakiness"] == 1.0
+                and [t["test_key"] for t in newly] == ["pkg.A.newly"] and newly[0]["last_passed_run_id"] == 2
+                and set(means) == {"pkg.A.flaky", "pkg.A.newly"} and abs(means["pkg.A.newly"] - 0.5) < 1e-6):
+            print("✅ Index identique depuis la table et la liste, test instable et nouvel echec detectes")
+            return True
+        else:
+            print(f"❌ Index inattendu: {indexes}")
+            return False
+    except Exception as e:
+        print(f"❌ Erreur lors du test de l'historique des executions: {e}")
+        return False
+
+def test_junit_summary():
+    print_header("Test 13: Resume JUnit (compteurs coherents, caracteres interdits)")
+    try:
+        import tempfile
+        import xml.etree.ElementTree as ET
+        from modules.case_table import TestCaseTable
+        from modules.reporter import render_reports
+        
+        cases = [{"name": "ok", "classname": "pkg.A", "time": 1.0, "status": "passed"},
+                 {"name": "ko\x01", "classname": "pkg.A", "time": 0.5, "status": "failed",
+                  "failure_message": "octet \x00 nul <b>", "failure_type": "AssertionError\x1f"},
+                 {"name": "err", "classname": "pkg.B", "time": 0.25, "status": "error", "error_message": "boom\x0b"}]
+        stats = {"test_cases": TestCaseTable(cases), "total_tests": 3, "failures": 1, "errors": 1, "skipped": 0,
+                 "time": 1.75, "success_rate": 33.3}
+        
+        print("\n🧾 Resume JUnit d'une execution avec caracteres de controle dans les messages...")
+        with tempfile.TemporaryDirectory() as directory:
+            paths = render_reports(stats, output_dir=directory, formats=("junit",))
+            root = ET.parse(paths["junit"]).getroot()
+        
+        written = root.findall("testcase")
+        properties = {p.get("name"): p.get("value") for p in root.iter("property")}
+        failure = written[0].find("failure") if written else None
+        if (int(root.get("tests")) == len(written) == 2 and int(root.get("failures")) == 1
+                and int(root.get("errors")) == len(root.findall("testcase/error")) == 1
+                and properties.get("total_tests") == "3" and failure is not None
+                and failure.get("message") == "octet  nul <b>" and written[0].get("name") == "ko"):
+            print(f"✅ {len(written)} cas ecrits pour tests={root.get('tests')}, totaux en proprietes")
+            return True
+        else:
+            print(f"❌ Resume incoherent: {root.attrib}, {len(written)} cas")
+            return False
+    except Exception as e:
+        print(f"❌ Erreur lors du resume JUnit: {e}")
+        return False
+
+def test_jira_bulk():
+    print_header("Test 14: Creation de tickets Jira en lots (echec partiel, 429)")
+    try:
+        from modules.jira_connector import JiraConnector
+        
+        posts = []
+        
+        class StandIn(StandInHandler):
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                posts.append(self.path)
+                if len(posts) == 1:
+                    # Premier appel refuse pour limite de debit: le lot doit etre renvoye
+                    self.send_json({}, 429, [("Retry-After", "0")])
+                    return
+                summaries = [update["fields"]["summary"] for update in payload["issueUpdates"]]
+                issues = [{"key": f"QA-{summary}", "id": summary, "self": f"/issue/{summary}"}
+                          for summary in summaries if summary != "bad"]
+                errors = [{"failedElementNumber": index, "status": 400,
+                           "elementErrors": {"errors": {"summary": "invalide"}}}
+                          for index, summary in enumerate(summaries) if summary == "bad"]
+                self.send_json({"issues": issues, "errors": errors}, 400 if errors else 201)
+        
+        print("\n🎫 5 tickets en lots de 2, dont un refuse par Jira...")
+        summaries = ["s0", "s1", "bad", "s3", "s4"]
+        with stand_in_server(StandIn) as base_url:
+            jira = JiraConnector(base_url, "qa@example.com", "token")
+            result = jira.create_issues_bulk([{"project_key": "QA", "summary": summary, "description": "d"}
+                                              for summary in summaries], batch_size=2, workers=1)
+        
+        keys = [r.get("issue_key") for r in result["results"]]
+        if (keys == ["QA-s0", "QA-s1", None, "QA-s3", "QA-s4"] and result["created"] == 4 and result["failed"] == 1
+                and result["results"][2]["message"] == "summary: invalide" and len(posts) == 4
+                and set(posts) == {"/rest/api/3/issue/bulk"}):
+            print(f"✅ {result['message']}, refus associe au bon ticket, lot renvoye apres 429")
+            return True
+        else:
+            print(f"❌ Resultat inattendu: {result}, {len(posts)} appels")
+            return False
+    except Exception as e:
+        print(f"❌ Erreur lors de la creation de tickets en lots: {e}")
+        return False
+
+def test_report_cache():
+    print_header("Test 15: Cache disque des rapports (hash du contenu, mtime/taille, LRU)")
+    try:
+        import tempfile
+        from modules.report_cache import ReportCache
+        
+        def write(path, content):
+            with open(path, "w") as f:
+                f.write(content)
+        
+        print("\n🗄️  Entrees par contenu, fichiers inchanges non re-hashes, eviction LRU...")
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ReportCache(os.path.join(directory, "cache"), max_bytes=2500)
+            paths = [os.path.join(directory, f"r{i}.xml") for i in range(4)]
+            for i, path in enumerate(paths[:3]):
+                write(path, f"<testsuite>{i}</testsuite>")
+            write(paths[3], "<testsuite>0</testsuite>")
+            entries = [{"total_tests": i, "padding": "x" * 1000} for i in range(3)]
+            
+            cache.put(paths[0], "1", entries[0])
+            same_content = cache.get(paths[3], "1")
+            other_version = cache.get(paths[0], "2")
+            
+            # Meme taille et meme mtime: le hash memorise est reutilise sans relire le fichier
+            st = os.stat(paths[0])
+            write(paths[0], "<testsuite>9</testsuite>")
+            os.utime(paths[0], ns=(st.st_atime_ns, st.st_mtime_ns))
+            unchanged = cache.get(paths[0], "1")
+            write(paths[0], "<testsuite>10</testsuite>")
+            changed = cache.get(paths[0], "1")
+            
+            write(paths[0], "<testsuite>0</testsuite>")
+            cache.put(paths[0], "1", entries[0])
+            cache.put(paths[1], "1", entries[1])
+            cache.get(paths[0], "1")
+            cache.put(paths[2], "1", entries[2])
+            kept = [cache.get(path, "1") is not None for path in paths[:3]]
+            cache.close()
+        
+        if (same_content == entries[0] and other_version is None and unchanged == entries[0]
+                and changed is None and kept == [True, False, True]):
+            print("✅ Cache par contenu et version, eviction de l'entree la moins recemment utilisee")
+            return True
+        else:
+            print(f"❌ Cache inattendu: contenu={same_content is not None}, version={other_version}, "
+                  f"inchange={unchanged is not None}, modifie={changed}, conserves={kept}")
+            return False
+    except Exception as e:
+        print(f"❌ Erreur lors du test du cache de rapports: {e}")
+        return False
+
+def test_html_pages():
+    print_header("Test 16: Rapport HTML pagine (cas en echec et tests les plus lents)")
+    try:
+        import re
+        import tempfile
+        from modules.case_table import TestCaseTable
+        from modules.reporter import generate_html_report
+        
+        cases = [{"name": f"ok{i}", "classname": "pkg.A", "time": 0.01, "status": "passed"} for i in range(30)]
+        cases += [{"name": f"ko{i}", "classname": "pkg.B", "time": 0.1, "status": "failed",
+                   "failure_message": f"<echec {i}>"} for i in range(25)]
+        cases.append({"name": "slowest", "classname": "pkg.C", "time": 99.0, "status": "passed"})
+        stats = {"test_cases": TestCaseTable(cases), "total_tests": 56, "failures": 25, "errors": 0, "skipped": 0,
+                 "time": 101.8}
+        
+        print("\n📄 25 echecs sur des pages de 10 lignes...")
+        with tempfile.TemporaryDirectory() as directory:
+            generate_html_report(stats, os.path.join(directory, "report.html"), page_size=10)
+            files = sorted(os.listdir(directory))
+            pages = [open(os.path.join(directory, name), encoding="utf-8").read()
+                     for name in ("report.html", "report_p2.html", "report_p3.html") if name in files]
+        
+        failing = [re.findall(r"<td>(ko\d+)</td>", page) for page in pages[1:]]
+        if (files == ["report.html", "report_p2.html", "report_p3.html"] and len(pages) == 3
+                and failing == [[f"ko{i}" for i in range(10, 20)], [f"ko{i}" for i in range(20, 25)]]
+                and 'href="report_p3.html"' in pages[1] and 'href="report_p2.html"' in pages[2]
+                and "<td>slowest</td>" in pages[0] and "&lt;echec 0&gt;" in pages[0]):
+            print(f"✅ {len(pages)} pages liees, echecs repartis par 10, test le plus lent en premiere page")
+            return True
+        else:
+            print(f"❌ Pages inattendues: {files}, echecs par page {[len(f) for f in failing]}")
+            return False
+    except Exception as e:
+        print(f"❌ Erreur lors du rapport HTML pagine: {e}")
+        return False
+
+def test_trend_dashboard():
+    print_header("Test 17: Tableau de bord de tendances (agregats sous-echantillonnes)")
+    try:
+        import tempfile
+        from modules.history import RunHistory
+        from modules.reporter import TrendAggregates, generate_trend_report
+        
+        print("\n📉 1000 executions agregees sur 8 tranches au plus...")
+        with tempfile.TemporaryDirectory() as directory:
+            trends = TrendAggregates(os.path.join(directory, "trends.json"), max_points=8)
+            for i in range(1000):
+                trends.append({"success_rate": i % 100, "time": 10.0, "failures": 1, "errors": 1}, timestamp=i)
+            series = trends.series("success_rate")
+            buckets_ok = (len(trends.buckets) <= 8 and trends.runs == 1000 and series[0][0] == 0
+                          and series[-1][1] == 999 and min(p[2] for p in series) == 0
+                          and max(p[3] for p in series) == 99 and trends.series("failures")[0][4] == 2)
+            
+            print("📈 Regeneration apres de nouvelles executions: seules les nouvelles sont lues...")
+            history = RunHistory(os.path.join(directory, "history.sqlite"))
+            for rate in (90.0, 95.0, 100.0):
+                history.append_run({"test_cases": [], "success_rate": rate, "time": 1.0})
+            path = generate_trend_report(history, os.path.join(directory, "trend.html"))
+            first = TrendAggregates(os.path.join(directory, "trends.json"))
+            for rate in (80.0, 85.0):
+                history.append_run({"test_cases": [], "success_rate": rate, "time": 2.0})
+            added = TrendAggregates(os.path.join(directory, "trends.json")).update_from_history(history)
+            generate_trend_report(history, path)
+            second = TrendAggregates(os.path.join(directory, "trends.json"))
+            history.close()
+            with open(path, encoding="utf-8") as f:
+                charts = f.read().count("<svg")
+        
+        if (buckets_ok and first.runs == 3 and added == 2 and second.runs == 5 and second.last_run_id == 5
+                and [p[4] for p in second.series("success_rate")] == [90.0, 95.0, 100.0, 80.0, 85.0] and charts == 3):
+            print(f"✅ {len(trends.buckets)} tranches pour 1000 executions, {added} executions ajoutees a la regeneration")
+            return True
+        else:
+            print(f"❌ Agregats inattendus: tranches={len(trends.buckets)}, executions={first.runs}/{second.runs}")
+            return False
+    except Exception as e:
+        print(f"❌ Erreur lors du tableau de bord de tendances: {e}")
+        return False
+
+def test_incremental_report():
+    print_header("Test 18: Regeneration incrementale du rapport HTML")
+    try:
+        import tempfile
+        from modules.case_table import TestCaseTable
+        from modules.reporter import generate_html_report
+        
+        def make_stats(message):
+            cases = [{"name": f"ko{i}", "classname": "pkg.B", "time": 0.1, "status": "failed",
+                      "failure_message": message if i == 22 else f"echec {i}"} for i in range(25)]
+            return {"test_cases": TestCaseTable(cases), "total_tests": 25, "failures": 25, "errors": 0,
+                    "skipped": 0, "time": 2.5}
+        
+        print("\n♻️  Trois generations: initiale, identique, puis un echec modifie en page 3...")
+        print("📏 Puis une quatrieme avec des pages de 20 cas: la page 3 et son fragment disparaissent...")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "report.html")
+            pages = [path, os.path.join(directory, "report_p2.html"), os.path.join(directory, "report_p3.html")]
+            cards = os.path.join(directory, "report_fragments", "cards.html")
+            
+            def inodes():
+                # Chaque ecriture est atomique (renommage): un fichier reecrit change d'inode
+                return [os.stat(page).st_ino for page in pages]
+            
+            generate_html_report(make_stats("echec 22"), path, page_size=10, incremental=True)
+            initial = inodes()
+            # Le fragment en cache est reutilise tel quel tant que son empreinte ne change pas
+            with open(cards, "a", encoding="utf-8") as f:
+                f.write("<!-- fragment en cache -->")
+            generate_html_report(make_stats("echec 22"), path, page_size=10, incremental=True)
+            unchanged = inodes()
+            generate_html_report(make_stats("nouveau message"), path, page_size=10, incremental=True)
+            changed = inodes()
+            with open(path, encoding="utf-8") as f:
+                first_page = f.read()
+            with open(pages[2], encoding="utf-8") as f:
+                last_page = f.read()
+            # Changement de page_size: le manifeste est ecarte mais les pages en trop sont supprimees
+            generate_html_report(make_stats("nouveau message"), path, page_size=20, incremental=True)
+            stale = [os.path.exists(pages[2]),
+                     os.path.exists(os.path.join(directory, "report_fragments", "failures_p3.html"))]
+            resized = [os.path.exists(pages[0]), os.path.exists(pages[1])]
+        
+        if (unchanged[1:] == initial[1:] and changed[1] == initial[1] and changed[2] != initial[2]
+                and "<!-- fragment en cache -->" in first_page and "nouveau message" in last_page
+                and stale == [False, False] and resized == [True, True]):
+            print("✅ Pages inchangees conservees, fragment reutilise, seule la page modifiee est reecrite")
+            return True
+        else:
+            print(f"❌ Regeneration inattendue: {initial} -> {unchanged} -> {changed}, page 3 et fragment restants {stale}")
+            return False
+    except Exception as e:
+        print(f"❌ Erreur lors de la regeneration incrementale: {e}")
+        return False
+
+def test_shard_planner():
+    print_header("Test 19: Planification de shards par duree")
+    try:
+        import time
+        from modules.case_table import TestCaseTable
+        from modules.shard_planner import durations_from_stats, plan_shards
+        
+        print("\n⚖️  Durees historiques de deux executions, doublons et tests ignores...")
+        runs = [{"test_cases": TestCaseTable([
+                    {"name": "a", "classname": "pkg", "time": 8.0, "status": "passed"},
+                    {"name": "b", "classname": "pkg", "time": 3.5, "status": "failed"},
+                    {"name": "b", "classname": "pkg", "time": 3.5, "status": "passed"},
+                    {"name": "c", "classname": "pkg", "time": 6.0, "status": "passed"},
+                    {"name": "skip", "classname": "pkg", "time": 0.0, "status": "skipped"}])},
+                {"test_cases": [{"name": "d", "classname": "pkg", "time": 5.0, "status": "passed"},
+                                {"name": "e", "classname": "pkg", "time": 4.0, "status": "passed"}]}]
+        durations = durations_from_stats(runs)
+        plan = plan_shards(durations, 2, tests=list(durations) + ["pkg.new"])
+        assigned = sorted(test for shard in plan["shards"] for test in shard["tests"])
+        
+        print("⏱️  200 000 tests sur 50 shards...")
+        many = {f"t{i}": float(i % 997) + 0.5 for i in range(200000)}
+        start = time.perf_counter()
+        large = plan_shards(many, 50)
+        elapsed = time.perf_counter() - start
+        
+        # LPT: a(8) b(7) c(6) new(mediane 6) d(5) e(4) -> [a, new, e] 18 et [b, c, d] 18
+        if (durations == {"pkg.a": 8.0, "pkg.b": 7.0, "pkg.c": 6.0, "pkg.d": 5.0, "pkg.e": 4.0}
+                and [shard["tests"] for shard in plan["shards"]] == [["pkg.a", "pkg.new", "pkg.e"],
+                                                                    ["pkg.b", "pkg.c", "pkg.d"]]
+                and plan["unseen_tests"] == 1 and plan["estimated_time"] == 18.0
+                and assigned == sorted(list(durations) + ["pkg.new"])
+                and sum(len(shard["tests"]) for shard in large["shards"]) == 200000
+                and large["imbalance"] < 1.01 and elapsed < 5):
+            print(f"✅ Plan equilibre (desequilibre {large['imbalance']:.4f}), 200k tests en {elapsed:.2f}s")
+            return True
+        else:
+            print(f"❌ Plan inattendu: {durations}, {plan['shards']}, {elapsed:.2f}s")
+            return False
+    except Exception as e:
+        print(f"❌ Erreur lors de la planification de shards: {e}")
+        return False
+
+def test_duration_sketches():
+    print_header("Test 20: Percentiles de duree et tests les plus lents (esquisses fusionnables)")
+    try:
+        import tempfile
+        from modules.analyzer import analyze_report
+        from modules.case_table import TestCaseTable
+        from modules.sketches import QuantileSketch
+        
+        print("\n📐 Quantiles a 1% pres et fusion exacte de deux esquisses...")
+        values = [i / 100 for i in range(1, 1001)]
+        whole, first, second = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for value in values:
+            whole.add(value)
+            (first if value <= 5 else second).add(value)
+        first.merge(second)
+        quantiles_ok = (abs(whole.quantile(0.5) - 5.0) <= 0.05 * 1.01 and abs(whole.quantile(0.99) - 9.9) <= 0.099 * 1.01
+                        and first.bins == whole.bins and first.count == whole.count and first.sum_ns == whole.sum_ns)
+        
+        print("🐢 Tests les plus lents par table et dans le resume d'analyse...")
+        cases = [{"name": f"t{i}", "classname": f"pkg.C{i % 3}", "time": i / 1000, "status": "passed"} for i in range(3000)]
+        cases.append({"name": "ignored", "classname": "pkg.C0", "time": 1000.0, "status": "skipped"})
+        summary = TestCaseTable(cases).durations.summary()
+        slowest = [row["name"] for row in summary["slowest"][:3]]
+        
+        xml = "<testsuite>" + "".join(f'<testcase name="t{i}" classname="pkg.A" time="{i}"/>' for i in range(1, 101)) + "</testsuite>"
+        with tempfile.NamedTemporaryFile("w", suffix=".xml", delete=False) as f:
+            f.write(xml)
+        stats = analyze_report(f.name)
+        os.remove(f.name)
+        
+        if (quantiles_ok and slowest == ["t2999", "t2998", "t2997"] and summary["overall"]["count"] == 3000
+                and [row["count"] for row in summary["by_classname"]] == [1000, 1000, 1000]
+                and stats["durations"]["slowest"][0]["name"] == "t100"
+                and abs(stats["durations"]["overall"]["p90"] - 90) <= 0.9 and "p99" in stats["summary"]):
+            print(f"✅ p50 {whole.quantile(0.5):.3f}s, p99 {whole.quantile(0.99):.3f}s, fusion exacte")
+            return True
+        else:
+            print(f"❌ Percentiles inattendus: {summary['overall']}, plus lents {slowest}")
+            return False
+    except Exception as e:
+        print(f"❌ Erreur lors du test des esquisses de duree: {e}")
+        return False
+
+def test_connector_session():
+    print_header("Test 21: Session HTTP partagee, reessais et metriques des connecteurs")
+    try:
+        from modules.ci_cd_connector import JenkinsConnector
+        
+        seen = {"paths": set(), "ports": set(), "posts": 0}
+        
+        class StandIn(StandInHandler):
+            def do_GET(self):
+                seen["ports"].add(self.client_address[1])
+                # Premier appel de chaque build: passerelle en surcharge
+                if self.path not in seen["paths"]:
+                    seen["paths"].add(self.path)
+                    return self.send_json({}, 502)
+                self.send_json({"building": False, "result": "SUCCESS", "duration": 42})
+            
+            def do_POST(self):
+                seen["posts"] += 1
+                self.send_json({}, 502)
+        
+        print("\n🔁 10 statuts de build, chacun precede d'un 502...")
+        with stand_in_server(StandIn) as base_url, JenkinsConnector(base_url, "test", "token",
+                                                                    backoff_factor=0.01) as jenkins:
+            statuses = [jenkins.get_build_status("job", i) for i in range(10)]
+            get_metrics = jenkins.get_metrics()
+            jenkins.reset_metrics()
+            # Un POST n'est pas reessaye sur un statut d'erreur
+            triggered = jenkins.trigger_build("job")
+            post_metrics = jenkins.get_metrics()
+        
+        if (all(s["status"] == "success" and s["result"] == "SUCCESS" for s in statuses)
+                and get_metrics["requests"] == 10 and get_metrics["retries"] == 10 and get_metrics["errors"] == 0
+                and get_metrics["status_codes"] == {"200": 10} and "p95_ms" in get_metrics
+                and len(seen["ports"]) == 1 and triggered["status"] == "error" and seen["posts"] == 1
+                and post_metrics["requests"] == 1 and post_metrics["errors"] == 1 and post_metrics["retries"] == 0):
+            print(f"✅ 10 reessais sur une seule connexion, p95 {get_metrics['p95_ms']:.1f}ms, POST non reessaye")
+            return True
+        else:
+            print(f"❌ Metriques inattendues: {get_metrics}, {post_metrics}, connexions {len(seen['ports'])}")
+            return False
+    except Exception as e:
+        print(f"❌ Erreur lors du test de la session HTTP: {e}")
+        return False
+
+def test_download_resume():
+    print_header("Test 22: Reprise d'un telechargement (Range) et Content-Range incoherent")
+    try:
+        import hashlib
+        import tempfile
+        from modules.http_client import BaseConnector
+        
+        payload = os.urandom(3 * 1024 * 1024)
+        ranges = []
+        
+        class StandIn(StandInHandler):
+            def do_GET(self):
+                requested = self.headers.get("Range")
+                ranges.append((self.path, requested))
+                start = int(requested[len("bytes="):-1]) if requested else 0
+                if requested and self.path == "/misaligned":
+                    # Serveur qui annonce une partie mais renvoie le fichier depuis le debut
+                    start = 0
+                if requested:
+                    # La partie mal alignee est abandonnee: le client ferme la connexion en cours d'envoi
+                    self.send_body(payload[start:], 206, [("Content-Range", f"bytes {start}-{len(payload) - 1}/{len(payload)}")])
+                else:
+                    self.send_body(payload)
+        
+        checksum = "sha256:" + hashlib.sha256(payload).hexdigest()
+        
+        print("\n⏯️ Reprise depuis un .part de 1 Mo, puis serveur renvoyant une partie mal alignee...")
+        results, contents = {}, {}
+        with stand_in_server(StandIn) as base_url, tempfile.TemporaryDirectory() as directory, \
+                BaseConnector() as connector:
+            for path in ("/aligned", "/misaligned"):
+                output = os.path.join(directory, path[1:] + ".bin")
+                with open(output + ".part", "wb") as f:
+                    f.write(payload[:1024 * 1024])
+                results[path] = connector._download(base_url + path, output, checksum=checksum)
+                if results[path]["status"] == "success":
+                    with open(output, "rb") as f:
+                        contents[path] = f.read()
+        
+        if (all(result["status"] == "success" for result in results.values())
+                and list(contents.values()) == [payload, payload]
+                and ranges == [("/aligned", "bytes=1048576-"), ("/misaligned", "bytes=1048576-"), ("/misaligned", None)]):
+            print("✅ Reprise a 1 Mo puis redemarrage depuis zero, empreintes verifiees")
+            return True
+        else:
+            print(f"❌ Telechargements inattendus: {results}, requetes {ranges}")
+            return False
+    except Exception as e:
+        print(f"❌ Erreur lors du test de reprise de telechargement: {e}")
+        return False
+
+def test_build_history():
+    print_header("Test 23: Historique des builds Jenkins (filtre tree et pages par plage)")
+    try:
+        import re
+        from urllib.parse import urlparse, parse_qs
+        from modules.ci_cd_connector import JenkinsConnector
+        
+        trees = []
+        # Builds 250 (en cours) a 1, du plus recent au plus ancien
+        builds = [{"number": n, "result": None if n == 250 else "SUCCESS", "duration": n * 1000,
+                   "timestamp": n * 60000, "building": n == 250, "actions": [{"large": "x" * 100}]}
+                  for n in range(250, 0, -1)]
+        
+        class StandIn(StandInHandler):
+            def do_GET(self):
+                tree = parse_qs(urlparse(self.path).query)["tree"][0]
+                trees.append(tree)
+                fields, start, end = re.fullmatch(r"allBuilds\[(.*)\]\{(\d+),(\d+)\}", tree).groups()
+                page = [{field: build[field] for field in fields.split(",")} for build in builds[int(start):int(end)]]
+                self.send_json({"allBuilds": page})
+        
+        print("\n📜 Historique complet, limite a 120 builds et reprise apres le build 230...")
+        with stand_in_server(StandIn) as base_url, JenkinsConnector(base_url, "test", "token") as jenkins:
+            history = list(jenkins.iter_build_history("job", page_size=100))
+            full_trees, trees[:] = list(trees), []
+            limited = list(jenkins.iter_build_history("job", limit=120, page_size=100))
+            limited_trees, trees[:] = list(trees), []
+            recent = list(jenkins.iter_build_history("job", since_number=230, page_size=100))
+        
+        fields = "number,result,duration,timestamp,building"
+        if ([build["number"] for build in history] == list(range(250, 0, -1))
+                and history[0] == {"number": 250, "result": None, "duration": 250000, "timestamp": 15000000, "building": True}
+                and full_trees == [f"allBuilds[{fields}]{{0,100}}", f"allBuilds[{fields}]{{100,200}}",
+                                   f"allBuilds[{fields}]{{200,300}}"]
+                and len(limited) == 120 and limited_trees == [f"allBuilds[{fields}]{{0,100}}", f"allBuilds[{fields}]{{100,120}}"]
+                and [build["number"] for build in recent] == list(range(250, 230, -1)) and len(trees) == 1):
+            print(f"✅ {len(history)} builds en {len(full_trees)} requetes filtrees, limite et reprise respectees")
+            return True
+        else:
+            print(f"❌ Historique inattendu: {len(history)} builds, requetes {full_trees} / {limited_trees} / {trees}")
+            return False
+    except Exception as e:
+        print(f"❌ Erreur lors du test de l'historique des builds: {e}")
+        return False
+
+def test_gitlab_jobs():
+    print_header("Test 24: Jobs GitLab pagines (pages en parallele, bridges et pipelines enfants)")
+    try:
+        import time
+        from urllib.parse import urlparse, parse_qs
+        from modules.ci_cd_connector import GitLabConnector
+        
+        jobs = {("1", "10"): [{"id": i, "name": f"job{i}", "status": "success", "stage": "test"} for i in range(250)],
+                ("2", "20"): [{"id": 1000 + i, "name": f"child{i}", "status": "failed", "stage": "e2e"} for i in range(150)]}
+        bridges = {("1", "10"): [{"id": 999, "name": "trigger", "status": "success", "stage": "deploy",
+                                  "downstream_pipeline": {"id": 20, "project_id": 2}}],
+                   ("2", "20"): []}
+        state = {"active": 0, "peak": 0, "paths": []}
+        lock = threading.Lock()
+        
+        class StandIn(StandInHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                parts = url.path.split("/")
+                key, kind = (parts[4], parts[6]), parts[7]
+                page, per_page = int(query["page"][0]), int(query["per_page"][0])
+                with lock:
+                    state["paths"].append(url.path)
+                    state["active"] += 1
+                    state["peak"] = max(state["peak"], state["active"])
+                time.sleep(0.05)
+                items = (jobs if kind == "jobs" else bridges)[key]
+                pages = max(1, -(-len(items) // per_page))
+                headers = [("X-Next-Page", str(page + 1) if page < pages else "")]
+                # Le pipeline enfant n'annonce pas X-Total-Pages: X-Next-Page est suivi
+                if key == ("1", "10"):
+                    headers.append(("X-Total-Pages", str(pages)))
+                self.send_json(items[(page - 1) * per_page:page * per_page], headers=headers)
+                with lock:
+                    state["active"] -= 1
+        
+        print("\n🧩 Pipeline de 250 jobs (3 pages) declenchant un pipeline enfant de 150 jobs...")
+        with stand_in_server(StandIn) as base_url, GitLabConnector(base_url, "token") as gitlab:
+            listed = list(gitlab.iter_jobs("1", 10, per_page=100))
+            peak, state["paths"][:] = state["peak"], []
+            flat = gitlab.get_jobs("1", 10)
+            flat_paths = list(state["paths"])
+        
+        kinds = [(job["kind"], job["pipeline_id"]) for job in listed]
+        if (kinds == [("job", 10)] * 250 + [("bridge", 10)] + [("job", 20)] * 150
+                and [job["id"] for job in listed if job["pipeline_id"] == 20] == list(range(1000, 1150))
+                and listed[250]["name"] == "trigger" and peak >= 3
+                and flat["status"] == "success" and [job["id"] for job in flat["jobs"]] == list(range(250))
+                and not any(path.endswith("/bridges") for path in flat_paths)):
+            print(f"✅ {len(listed)} jobs et bridges, jusqu'a {peak} requetes simultanees")
+            return True
+        else:
+            print(f"❌ Jobs inattendus: {len(listed)} elements, {peak} requetes simultanees, {flat.get('message')}")
+            return False
+    except Exception as e:
+        print(f"❌ Erreur lors du test des jobs GitLab: {e}")
+        return False
+
+def test_build_watcher():
+    print_header("Test 25: Surveillance de builds (polling adaptatif, callbacks et iteration)")
+    try:
+        import asyncio
+        import time
+        from modules.build_watcher import BuildWatcher, estimate_build_duration
+        from modules.ci_cd_async import AsyncJenkinsConnector, AsyncGitLabConnector, create_session
+        from modules.ci_cd_connector import JenkinsConnector
+        
+        # Nombre de polls avant la fin de chaque cible
+        finish_after = {"/job/job/1/api/json": 3, "/job/job/2/api/json": 1, "/job/job/3/api/json": 1,
+                        "/api/v4/projects/p/pipelines/10": 2}
+        polls = {}
+        
+        class StandIn(StandInHandler):
+            def do_GET(self):
+                polls.setdefault(self.path, []).append(time.monotonic())
+                done = len(polls[self.path]) >= finish_after.get(self.path, 0)
+                if self.path.startswith("/job/job/api/json"):
+                    body = {"allBuilds": [{"number": 4, "building": True, "duration": 0},
+                                          {"number": 3, "building": False, "duration": 1000},
+                                          {"number": 2, "building": False, "duration": 3000},
+                                          {"number": 1, "building": False, "duration": 2000}]}
+                elif self.path.startswith("/job/"):
+                    body = {"building": not done, "result": "SUCCESS" if done else None, "duration": 42}
+                elif self.path.endswith("/10"):
+                    body = {"status": "success" if done else "running", "ref": "main", "duration": 7}
+                else:
+                    return self.send_body(b"", 404)
+                self.send_json(body)
+        
+        callbacks = []
+        
+        async def on_pipeline(key, status):
+            callbacks.append((key, status["pipeline_status"]))
+        
+        async def watch(base_url):
+            async with create_session() as session:
+                watcher = BuildWatcher(AsyncJenkinsConnector(base_url, "test", "token", session=session),
+                                       AsyncGitLabConnector(base_url, "token", session=session),
+                                       min_interval=0.05, max_interval=0.5, max_errors=3)
+                start = time.monotonic()
+                watcher.watch_build("job", 1, callback=lambda key, status: callbacks.append((key, status["result"])))
+                watcher.watch_build("job", 2)
+                # Fin attendue dans 0.6s: pas de poll avant la moitie du temps restant
+                watcher.watch_build("job", 3, expected_duration=0.6)
+                watcher.watch_pipeline("p", 10, callback=on_pipeline)
+                watcher.watch_pipeline("p", 99)
+                events = {key: status async for key, status in watcher}
+                return events, watcher.get_metrics(), start
+        
+        print("\n⏱️ 3 builds Jenkins et 2 pipelines GitLab (dont un introuvable)...")
+        with stand_in_server(StandIn) as base_url:
+            with JenkinsConnector(base_url, "test", "token") as jenkins:
+                expected = estimate_build_duration(jenkins, "job")
+            events, metrics, start = asyncio.run(watch(base_url))
+        
+        first_poll_job3 = polls["/job/job/3/api/json"][0] - start
+        if (expected == 2.0 and set(events) == {("jenkins", "job", 1), ("jenkins", "job", 2), ("jenkins", "job", 3),
+                                                  ("gitlab", "p", 10), ("gitlab", "p", 99)}
+                and events[("jenkins", "job", 1)]["result"] == "SUCCESS" and events[("gitlab", "p", 99)]["status"] == "error"
+                and sorted(callbacks) == [(("gitlab", "p", 10), "success"), (("jenkins", "job", 1), "SUCCESS")]
+                and len(polls["/job/job/1/api/json"]) == 3 and len(polls["/api/v4/projects/p/pipelines/99"]) == 3
+                and len(polls["/job/job/3/api/json"]) == 1 and first_poll_job3 >= 0.25
+                and metrics["completed"] == 5 and metrics["watching"] == 0):
+            print(f"✅ 5 fins livrees, premier poll du build attendu a {first_poll_job3:.2f}s, {metrics['polls']} polls")
+            return True
+        else:
+            print(f"❌ Surveillance inattendue: {events}, {callbacks}, {metrics}, duree estimee {expected}")
+            return False
+    except Exception as e:
+        print(f"❌ Erreur lors du test de surveillance des builds: {e}")
+        return False
+
+def test_concurrent_renders():
+    print_header("Test 26: Rendus de rapports concurrents (statistiques propres a chaque appel)")
+    try:
+        import json
+        import tempfile
+        from concurrent.futures import ThreadPoolExecutor
+        from modules.case_table import TestCaseTable
+        from modules.reporter import render_reports
+        
+        def run(count):
+            cases = [{"name": f"t{i}", "classname": "pkg.A", "time": 0.01, "status": "passed"} for i in range(count)]
+            return {"test_cases": TestCaseTable(cases), "total_tests": count, "failures": 0, "errors": 0,
+                    "skipped": 0, "time": count * 0.01, "success_rate": 100.0}
+        
+        print("\n🔀 12 rendus simultanes (JSON seul, puis JSON et texte) de 3 et 3000 tests...")
+        totals = []
+        with tempfile.TemporaryDirectory() as directory:
+            def render(index):
+                count = 3000 if index % 2 else 3
+                formats = ("json",) if index < 6 else ("json", "text")
+                paths = render_reports(run(count), output_dir=os.path.join(directory, str(index)), formats=formats)
+                with open(paths["json"]) as f:
+                    return count, json.load(f)["total_tests"]
+            
+            with ThreadPoolExecutor(max_workers=6) as pool:
+                totals = list(pool.map(render, range(12)))
+        
+        if len(totals) == 12 and all(expected == written for expected, written in totals):
+            print("✅ Chaque resume JSON porte les totaux de son propre appel")
+            return True
+        else:
+            print(f"❌ Totaux croises entre rendus: {totals}")
+            return False
+    except Exception as e:
+        print(f"❌ Erreur lors du test des rendus concurrents: {e}")
+        return False
+
+def test_report_permissions():
+    print_header("Test 27: Droits des rapports ecrits atomiquement")
+    try:
+        import stat
+        import tempfile
+        from modules.case_table import TestCaseTable
+        from modules.reporter import generate_html_report, render_reports
+        
+        cases = [{"name": f"t{i}", "classname": "pkg.A", "time": 0.01, "status": "failed", "failure_message": "boom"}
+                 for i in range(30)]
+        stats = {"test_cases": TestCaseTable(cases), "total_tests": 30, "failures": 30, "errors": 0,
+                 "skipped": 0, "time": 0.3, "success_rate": 0.0}
+        umask = os.umask(0)
+        os.umask(umask)
+        
+        print(f"\n🔐 Rapports de tous formats, pages HTML et manifeste sous umask {umask:03o}...")
+        with tempfile.TemporaryDirectory() as directory:
+            render_reports(stats, output_dir=directory)
+            generate_html_report(stats, os.path.join(directory, "paged.html"), page_size=10, incremental=True)
+            modes = {name: stat.S_IMODE(os.stat(os.path.join(directory, name)).st_mode)
+                     for name in os.listdir(directory) if os.path.isfile(os.path.join(directory, name))}
+            # Un rapport existant garde ses droits quand il est regenere
+            os.chmod(os.path.join(directory, "test_report.json"), 0o640)
+            render_reports(stats, output_dir=directory, formats=("json",))
+            kept = stat.S_IMODE(os.stat(os.path.join(directory, "test_report.json")).st_mode)
+        
+        if len(modes) >= 7 and set(modes.values()) == {0o666 & ~umask} and kept == 0o640:
+            print(f"✅ {len(modes)} fichiers en {0o666 & ~umask:04o}, droits d'un rapport existant conserves")
+            return True
+        else:
+            print(f"❌ Droits inattendus: {({name: oct(mode) for name, mode in modes.items()})}, existant {oct(kept)}")
+            return False
+    except Exception as e:
+        print(f"❌ Erreur lors du test des droits des rapports: {e}")
+        return False
+
+def test_status_cache():
+    print_header("Test 28: Cache disque des statuts CI (terminaux, TTL + ETag, persistance, identifiants)")
+    try:
+        import base64
+        import tempfile
+        import time
+        from modules.ci_cd_connector import GitLabConnector, JenkinsConnector, StatusCache
+        
+        requests_seen = []
+        allowed = "Basic " + base64.b64encode(b"qa:token").decode()
+        
+        class StandIn(StandInHandler):
+            def do_GET(self):
+                requests_seen.append((self.path, self.headers.get("If-None-Match")))
+                if self.path.startswith("/job/"):
+                    # Seuls les identifiants qa:token voient le build
+                    if self.headers.get("Authorization") != allowed:
+                        return self.send_body(b"", 404)
+                    return self.send_json({"building": False, "result": "SUCCESS", "duration": 42})
+                if self.headers.get("If-None-Match") == '"v1"':
+                    return self.send_body(b"", 304, [("ETag", '"v1"')])
+                self.send_json({"status": "running", "ref": "main", "duration": None}, headers=[("ETag", '"v1"')])
+        
+        print("\n🗄️ Build termine, pipeline en cours (TTL 0.2s) puis nouvelle instance du cache...")
+        with tempfile.TemporaryDirectory() as directory, stand_in_server(StandIn) as base_url:
+            cache = StatusCache(directory, ttl=0.2)
+            with JenkinsConnector(base_url, "qa", "token", cache=cache) as jenkins:
+                terminal = [jenkins.get_build_status("job", 1) for _ in range(3)]
+            terminal_requests = len(requests_seen)
+            with GitLabConnector(base_url, "token", cache=cache) as gitlab:
+                gitlab.get_pipeline_status("p", 10)
+                fresh = gitlab.get_pipeline_status("p", 10)
+                time.sleep(0.25)
+                revalidated = gitlab.get_pipeline_status("p", 10)
+            stats = cache.get_stats()
+            cache.close()
+            
+            reopened = StatusCache(directory, ttl=0.2)
+            before = len(requests_seen)
+            with JenkinsConnector(base_url, "qa", "token", cache=reopened) as jenkins:
+                persisted = jenkins.get_build_status("job", 1)
+            persisted_requests = len(requests_seen) - before
+            # Un autre jeton ne recoit pas la reponse obtenue avec qa:token
+            with JenkinsConnector(base_url, "qa", "other", cache=reopened) as intruder:
+                foreign = intruder.get_build_status("job", 1)
+            reopened.close()
+        
+        pipeline_requests = requests_seen[terminal_requests:terminal_requests + 2]
+        if (all(t["status"] == "success" and t["result"] == "SUCCESS" for t in terminal) and terminal_requests == 1
+                and fresh["pipeline_status"] == "running" and revalidated["pipeline_status"] == "running"
+                and pipeline_requests == [("/api/v4/projects/p/pipelines/10", None),
+                                          ("/api/v4/projects/p/pipelines/10", '"v1"')]
+                and stats == {"hits": 3, "revalidated": 1, "misses": 2}
+                and persisted["result"] == "SUCCESS" and persisted_requests == 0 and foreign["status"] == "error"):
+            print("✅ 1 requete pour 3 statuts termines, revalidation 304 apres TTL, cache persistant et cloisonne")
+            return True
+        else:
+            print(f"❌ Cache inattendu: {stats}, requetes {requests_seen}, autre jeton {foreign}")
+            return False
+    except Exception as e:
+        print(f"❌ Erreur lors du test du cache des statuts: {e}")
+        return False
+
+def test_newman_streaming():
+    print_header("Test 29: Export Newman en flux (ijson) identique a la lecture complete")
+    try:
+        import tempfile
+        from modules.analyzer import analyze_json_report
+        
+        def execution(name, response_time, assertions=(), request_error=None):
+            item = {"item": {"name": name}, "assertions": list(assertions)}
+            if request_error is None:
+                item["response"] = {"code": 200, "responseTime": response_time}
+            else:
+                item["requestError"] = {"message": request_error, "code": "ECONNREFUSED"}
+            return item
+        
+        export = {
+            "collection": {"info": {"name": "API Boutique"}},
+            "run": {
+                "stats": {"tests": {"total": 5, "failed": 1, "pending": 1}, "assertions": {"total": 5, "failed": 1},
+                          "requests": {"total": 5, "failed": 1}},
+                "timings": {"started": 1700000000000, "completed": 1700000001500},
+                "executions": [
+                    execution("Liste", 120, [{"assertion": "Status 200"}]),
+                    execution("Panier", 340.5, [{"assertion": "Status 200"},
+                                                {"assertion": "Total correct",
+                                                 "error": {"name": "AssertionError", "message": "expected 3 to equal 4"}}]),
+                    execution("Paiement", 0, request_error="connect ECONNREFUSED 127.0.0.1:443"),
+                    execution("Export", 80, [{"assertion": "Desactive", "skipped": True}]),
+                    execution("Profil", 95, [{"assertion": "Status 200"}]),
+                ],
+                "failures": [{"error": {"message": "expected 3 to equal 4"}}]
+            }
+        }
+        
+        print("\n🌊 Export Newman avec requete en erreur, assertion en echec et assertion ignoree...")
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump(export, f)
+        try:
+            full = analyze_json_report(f.name)
+            streamed = analyze_json_report(f.name, streaming=True)
+        finally:
+            os.remove(f.name)
+        
+        def rows(stats):
+            return [dict(row) for row in stats["test_cases"]]
+        
+        statuses = [row["status"] for row in rows(streamed)]
+        if ("error" not in streamed and rows(streamed) == rows(full)
+                and {k: v for k, v in streamed.items() if k != "test_cases"} == {k: v for k, v in full.items() if k != "test_cases"}
+                and statuses == ["passed", "failed", "error", "skipped", "passed"]
+                and rows(streamed)[1]["failure_message"] == "Total correct: expected 3 to equal 4"
+                and rows(streamed)[2]["error_message"] == "connect ECONNREFUSED 127.0.0.1:443"
+                and streamed["time"] == 1.5 and streamed["request_timing"]["count"] == 4):
+            print(f"✅ {len(statuses)} executions identiques en flux et en lecture complete")
+            return True
+        else:
+            print(f"❌ Resultats divergents: flux {rows(streamed)} / complet {rows(full)}")
+            return False
+    except Exception as e:
+        print(f"❌ Erreur lors du test de l'export Newman en flux: {e}")
+        return False
+
 def run_all_tests():
     print("\n" + "#"*60)
     print("#  AGENT MCP QA - SUITE DE TESTS")
@@ -180,6 +1399,30 @@ def run_all_tests():
     results['analyzer'] = test_analyzer()
     results['reporter'] = test_reporter()
     results['connectors'] = test_connectors()
+    results['junit_parsing'] = test_junit_parsing()
+    results['artifact_stream'] = test_artifact_stream()
+    results['async_connectors'] = test_async_connectors()
+    results['report_directory'] = test_report_directory()
+    results['failure_clusters'] = test_failure_clusters()
+    results['run_history_durations'] = test_run_history_durations()
+    results['run_history_index'] = test_run_history_index()
+    results['junit_summary'] = test_junit_summary()
+    results['jira_bulk'] = test_jira_bulk()
+    results['report_cache'] = test_report_cache()
+    results['html_pages'] = test_html_pages()
+    results['trend_dashboard'] = test_trend_dashboard()
+    results['incremental_report'] = test_incremental_report()
+    results['shard_planner'] = test_shard_planner()
+    results['duration_sketches'] = test_duration_sketches()
+    results['connector_session'] = test_connector_session()
+    results['download_resume'] = test_download_resume()
+    results['build_history'] = test_build_history()
+    results['gitlab_jobs'] = test_gitlab_jobs()
+    results['build_watcher'] = test_build_watcher()
+    results['concurrent_renders'] = test_concurrent_renders()
+    results['report_permissions'] = test_report_permissions()
+    results['status_cache'] = test_status_cache()
+    results['newman_streaming'] = test_newman_streaming()
     
   
     print_header("RESUME DES TESTS")